@@ -0,0 +1,31 @@
+"""Add krx_symbols table
+
+Revision ID: ks001
+Revises: ps001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'ks001'
+down_revision = 'ps001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'krx_symbols' not in inspector.get_table_names():
+        op.create_table(
+            'krx_symbols',
+            sa.Column('ticker', sa.String(20), primary_key=True),
+            sa.Column('market', sa.String(20), nullable=False),
+            sa.Column('yahoo_symbol', sa.String(30), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('krx_symbols')
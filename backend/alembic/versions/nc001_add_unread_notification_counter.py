@@ -0,0 +1,48 @@
+"""Add users.unread_notification_count and partial unread index
+
+Revision ID: nc001
+Revises: no001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'nc001'
+down_revision = 'no001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    columns = [c['name'] for c in inspector.get_columns('users')]
+    if 'unread_notification_count' not in columns:
+        op.add_column(
+            'users',
+            sa.Column('unread_notification_count', sa.Integer(), nullable=False, server_default='0')
+        )
+
+    # 기존 알림 기준으로 카운터 채우기
+    op.execute("""
+        UPDATE users SET unread_notification_count = (
+            SELECT COUNT(*) FROM notifications
+            WHERE notifications.user_id = users.id AND notifications.is_read = false
+        )
+    """)
+
+    indexes = [i['name'] for i in inspector.get_indexes('notifications')]
+    if 'ix_notifications_user_unread' not in indexes:
+        op.create_index(
+            'ix_notifications_user_unread',
+            'notifications',
+            ['user_id'],
+            postgresql_where=sa.text('is_read = false')
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_column('users', 'unread_notification_count')
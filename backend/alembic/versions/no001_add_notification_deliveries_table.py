@@ -0,0 +1,46 @@
+"""Add notification_deliveries outbox table
+
+Revision ID: no001
+Revises: pc001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'no001'
+down_revision = 'pc001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'notification_deliveries' not in tables:
+        op.create_table(
+            'notification_deliveries',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('notification_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('channel', sa.String(20), nullable=False),
+            sa.Column('subscription_id', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['subscription_id'], ['push_subscriptions.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_notification_deliveries_id', 'notification_deliveries', ['id'])
+        op.create_index('ix_notification_deliveries_notification_id', 'notification_deliveries', ['notification_id'])
+        op.create_index('ix_notification_deliveries_due', 'notification_deliveries', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('notification_deliveries')
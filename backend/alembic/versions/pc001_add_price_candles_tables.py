@@ -0,0 +1,52 @@
+"""Add price_candles and candle_series tables
+
+Revision ID: pc001
+Revises: ks001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'pc001'
+down_revision = 'ks001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'price_candles' not in tables:
+        op.create_table(
+            'price_candles',
+            sa.Column('symbol', sa.String(30), nullable=False),
+            sa.Column('interval', sa.String(10), nullable=False),
+            sa.Column('time', sa.BigInteger(), nullable=False),
+            sa.Column('open', sa.Float(), nullable=False),
+            sa.Column('high', sa.Float(), nullable=False),
+            sa.Column('low', sa.Float(), nullable=False),
+            sa.Column('close', sa.Float(), nullable=False),
+            sa.Column('volume', sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint('symbol', 'interval', 'time', name='pk_price_candles'),
+        )
+
+    if 'candle_series' not in tables:
+        op.create_table(
+            'candle_series',
+            sa.Column('symbol', sa.String(30), nullable=False),
+            sa.Column('interval', sa.String(10), nullable=False),
+            sa.Column('name', sa.String(200), nullable=True),
+            sa.Column('first_time', sa.BigInteger(), nullable=True),
+            sa.Column('last_time', sa.BigInteger(), nullable=True),
+            sa.Column('history_complete', sa.Boolean(), nullable=True, server_default='false'),
+            sa.Column('fetched_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('symbol', 'interval', name='pk_candle_series'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('candle_series')
+    op.drop_table('price_candles')
@@ -0,0 +1,100 @@
+"""Add user_performance and ticker_performance rollup tables
+
+Revision ID: pr001
+Revises: nc001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'pr001'
+down_revision = 'nc001'
+branch_labels = None
+depends_on = None
+
+
+def _rollup_columns():
+    return [
+        sa.Column('closed_trades', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('winning_trades', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('losing_trades', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('realized_pl', sa.Numeric(20, 2), nullable=False, server_default='0'),
+        sa.Column('total_volume', sa.Numeric(20, 2), nullable=False, server_default='0'),
+        sa.Column('profit_rate_sum', sa.Numeric(20, 4), nullable=False, server_default='0'),
+        sa.Column('profit_rate_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('holding_hours_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('executions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('execution_pl', sa.Numeric(20, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+# 종료 포지션 + 익절/손절 체결 기록을 한 번에 집계 ({key}: 그룹 키, {labels}: 종목명/시장)
+BACKFILL_SQL = """
+    INSERT INTO {table} ({key_name}{label_names}, closed_trades, winning_trades, losing_trades, realized_pl,
+                         total_volume, profit_rate_sum, profit_rate_count, holding_hours_sum,
+                         executions, execution_pl)
+    SELECT k{label_aggs}, SUM(closed_trades), SUM(winning_trades), SUM(losing_trades), SUM(realized_pl),
+           SUM(total_volume), SUM(profit_rate_sum), SUM(profit_rate_count), SUM(holding_hours_sum),
+           SUM(executions), SUM(execution_pl)
+    FROM (
+        SELECT {key} AS k{labels}, 1 AS closed_trades,
+               CASE WHEN p.profit_loss > 0 THEN 1 ELSE 0 END AS winning_trades,
+               CASE WHEN p.profit_loss < 0 THEN 1 ELSE 0 END AS losing_trades,
+               COALESCE(p.profit_loss, 0) AS realized_pl,
+               COALESCE(p.total_buy_amount, 0) AS total_volume,
+               COALESCE(p.profit_rate, 0) AS profit_rate_sum,
+               CASE WHEN p.profit_rate IS NOT NULL THEN 1 ELSE 0 END AS profit_rate_count,
+               COALESCE(p.holding_period_hours, 0) AS holding_hours_sum,
+               0 AS executions, 0 AS execution_pl
+        FROM positions p
+        WHERE p.status = 'closed'
+        UNION ALL
+        SELECT {key} AS k{labels}, 0, 0, 0, 0, 0, 0, 0, 0, 1, tp.profit_loss
+        FROM trading_plans tp
+        JOIN positions p ON p.id = tp.position_id
+        WHERE tp.record_type = 'execution'
+          AND tp.plan_type IN ('take_profit', 'stop_loss')
+          AND tp.profit_loss IS NOT NULL
+    ) s
+    GROUP BY k
+"""
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'user_performance' not in tables:
+        op.create_table(
+            'user_performance',
+            sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+            *_rollup_columns(),
+            sa.PrimaryKeyConstraint('user_id'),
+        )
+        op.execute(BACKFILL_SQL.format(
+            table='user_performance', key_name='user_id', key='COALESCE(p.opened_by, 0)',
+            label_names='', labels='', label_aggs=''
+        ))
+
+    if 'ticker_performance' not in tables:
+        op.create_table(
+            'ticker_performance',
+            sa.Column('ticker', sa.String(20), nullable=False),
+            sa.Column('ticker_name', sa.String(100), nullable=True),
+            sa.Column('market', sa.String(20), nullable=True),
+            *_rollup_columns(),
+            sa.PrimaryKeyConstraint('ticker'),
+        )
+        op.execute(BACKFILL_SQL.format(
+            table='ticker_performance', key_name='ticker', key='p.ticker',
+            label_names=', ticker_name, market', labels=', p.ticker_name AS ticker_name, p.market AS market',
+            label_aggs=', MAX(ticker_name), MAX(market)'
+        ))
+
+
+def downgrade() -> None:
+    op.drop_table('ticker_performance')
+    op.drop_table('user_performance')
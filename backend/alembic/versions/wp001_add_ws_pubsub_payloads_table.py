@@ -0,0 +1,35 @@
+"""Add ws_pubsub_payloads table for oversized NOTIFY envelopes
+
+Revision ID: wp001
+Revises: pr001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = 'wp001'
+down_revision = 'pr001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'ws_pubsub_payloads' not in tables:
+        op.create_table(
+            'ws_pubsub_payloads',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('channel', sa.String(100), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_ws_pubsub_payloads_created_at', 'ws_pubsub_payloads', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('ws_pubsub_payloads')
@@ -11,6 +11,7 @@ from app.models.attendance import Attendance
 from app.models.team_column import TeamColumn
 from app.dependencies import get_current_user, get_manager, get_writer_user
 from app.models.user import User
+from app.services.stats_service import StatsService
 from app.utils.constants import KST
 
 
@@ -147,62 +148,11 @@ async def get_my_attendance_stats(
     current_user: User = Depends(get_current_user)
 ):
     """내 출석률 통계 (한국 시간 기준)"""
-    today = get_kst_today()
-
-    # 전체 출석률 (가입 후)
-    total_records = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id
-    ).count()
-
-    total_present = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.status.in_(['present', 'recovered'])
-    ).count()
-
-    # 이번 주 출석률
-    week_start = today - timedelta(days=today.weekday())
-    week_records = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.date >= week_start,
-        Attendance.date <= today
-    ).count()
-
-    week_present = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.date >= week_start,
-        Attendance.date <= today,
-        Attendance.status.in_(['present', 'recovered'])
-    ).count()
-
-    # 이번 달 출석률
-    month_start = date(today.year, today.month, 1)
-    month_records = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.date >= month_start,
-        Attendance.date <= today
-    ).count()
-
-    month_present = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.date >= month_start,
-        Attendance.date <= today,
-        Attendance.status.in_(['present', 'recovered'])
-    ).count()
-
-    # 연속 출석 일수
-    streak = 0
-    current_date = today
-    while True:
-        att = db.query(Attendance).filter(
-            Attendance.user_id == current_user.id,
-            Attendance.date == current_date,
-            Attendance.status.in_(['present', 'recovered'])
-        ).first()
-        if att:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            break
+    summary = StatsService(db).get_attendance_summary(current_user.id, get_kst_today())
+    total_records, total_present = summary["all_total"], summary["all_present"]
+    week_records, week_present = summary["week_total"], summary["week_present"]
+    month_records, month_present = summary["month_total"], summary["month_present"]
+    streak = summary["streak"]
 
     return APIResponse(
         success=True,
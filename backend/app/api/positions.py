@@ -12,6 +12,7 @@ from app.schemas.user import UserBrief
 from app.schemas.common import APIResponse
 from app.services.position_service import PositionService
 from app.services.audit_service import AuditService
+from app.services.performance_service import PerformanceService
 from app.services.notification_service import NotificationService
 from app.dependencies import get_current_user, get_manager_or_admin, get_manager, get_writer_user
 from app.models.user import User
@@ -582,7 +583,10 @@ async def delete_position(
         AuditLog.entity_id == position_id
     ).delete()
 
-    # 5. 포지션 삭제
+    # 5. 성과 롤업에서 이 포지션의 기여분 제거 (체결 기록이 CASCADE로 지워지기 전에)
+    PerformanceService(db).remove_position(position)
+
+    # 6. 포지션 삭제
     db.delete(position)
     db.commit()
 
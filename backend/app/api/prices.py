@@ -9,7 +9,7 @@ from app.schemas.common import APIResponse
 from app.services.price_service import price_service
 from app.services.stock_search_service import stock_search_service
 from app.services.position_service import PositionService
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_manager
 from app.models.user import User
 
 router = APIRouter()
@@ -20,10 +20,25 @@ async def search_stocks(
     q: str = Query(..., min_length=1, description="검색어 (종목명 또는 티커)"),
     market: Optional[str] = Query(None, description="KOSPI, KOSDAQ, NASDAQ, NYSE, CRYPTO"),
     limit: int = Query(20, ge=1, le=50),
+    client_id: Optional[str] = Query(None, max_length=64, description="검색 입력창(탭)별 ID - 같은 ID의 이전 검색을 취소"),
     current_user: User = Depends(get_current_user)
 ):
-    """종목 검색 (종목명 또는 티커로 검색)"""
-    results = await stock_search_service.search_stocks(q, market, limit)
+    """종목 검색 (종목명 또는 티커로 검색)
+
+    client_id가 있으면 같은 입력창의 새 검색이 오면 진행 중인 이전 검색은 취소되고 superseded=true로 응답
+    (다른 탭/입력창의 검색에는 영향 없음). client_id가 없으면 취소하지 않음
+    """
+    if client_id:
+        results = await stock_search_service.search_stocks_for_client(
+            (current_user.id, client_id), q, market, limit
+        )
+    else:
+        results = await stock_search_service.search_stocks(q, market, limit)
+    if results is None:
+        return APIResponse(
+            success=True,
+            data={"query": q, "results": [], "count": 0, "superseded": True}
+        )
 
     return APIResponse(
         success=True,
@@ -81,6 +96,17 @@ async def lookup_ticker(
     )
 
 
+@router.get("/cache-stats", response_model=APIResponse)
+async def get_cache_stats(
+    current_user: User = Depends(get_manager)
+):
+    """시세 캐시 적중/미스/합침 카운터 (팀장 전용)"""
+    return APIResponse(
+        success=True,
+        data=price_service.get_cache_stats()
+    )
+
+
 @router.get("/candles", response_model=APIResponse)
 async def get_candles(
     ticker: str,
@@ -88,14 +114,17 @@ async def get_candles(
     timeframe: str = Query("1d", description="1d, 1w, 1M, 1h 등"),
     limit: int = Query(200, ge=1, le=500),
     before: Optional[int] = Query(None, description="이 타임스탬프 이전의 데이터 조회 (Unix timestamp)"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="rows: 캔들별 객체, columnar: 필드별 배열"),
     current_user: User = Depends(get_current_user)
 ):
     """캔들(OHLCV) 데이터 조회
 
     - limit 기본값: 200
     - before: 이 타임스탬프 이전의 과거 데이터를 조회 (lazy loading용)
+    - format=columnar: candles를 {time: [...], open: [...], high: [...], low: [...], close: [...], volume: [...]}로 반환
     """
-    result = await price_service.get_candles(ticker, market, timeframe, limit, before)
+    columnar = format == "columnar"
+    result = await price_service.get_candles(ticker, market, timeframe, limit, before, columnar=columnar)
 
     if result is None:
         return APIResponse(
@@ -103,6 +132,8 @@ async def get_candles(
             message="차트 데이터를 조회할 수 없습니다"
         )
 
+    result["format"] = format
+
     return APIResponse(
         success=True,
         data=result
@@ -8,10 +8,8 @@ from app.database import get_db
 from app.schemas.common import APIResponse
 from app.services.stats_service import StatsService
 from app.services.price_service import PriceService
-from app.services.asset_service import create_daily_snapshot
+from app.services.asset_service import create_daily_snapshot_async
 from app.models.position import Position, PositionStatus
-from app.models.attendance import Attendance
-from app.models.request import Request
 from app.models.asset_snapshot import AssetSnapshot
 from app.dependencies import get_current_user, get_manager
 from app.models.user import User
@@ -187,7 +185,6 @@ async def create_snapshot_manually(
     current_user: User = Depends(get_manager)
 ):
     """수동으로 오늘의 자산 스냅샷 생성 (팀장 전용)"""
-    from app.services.asset_service import create_daily_snapshot_async
     snapshot = await create_daily_snapshot_async(db)
     return APIResponse(
         success=True,
@@ -234,9 +231,31 @@ async def get_team_ranking(
             print(f"Team ranking price fetch error: {e}")
             price_data = {}
 
-    # 이번 주 시작일 (월요일)
     today = datetime.now(KST).date()
-    week_start = today - timedelta(days=today.weekday())
+
+    # 포지션/출석 집계 (팀원 수와 무관하게 고정 쿼리 수)
+    stats_service = StatsService(db)
+    position_stats, open_links = stats_service.get_ranking_position_stats()
+    attendance_stats = stats_service.get_attendance_rates(today)
+
+    # 열린 포지션 미실현 손익을 실시간 시세로 한 번에 합산
+    open_by_id = {p.id: p for p in open_positions}
+    unrealized = {}
+    for user_id, position_id in open_links:
+        pos = open_by_id.get(position_id)
+        if pos is None:
+            continue
+        avg_price = float(pos.average_buy_price) if pos.average_buy_price else 0
+        quantity = float(pos.total_quantity) if pos.total_quantity else 0
+        current_price = price_data.get(pos.id, {}).get('current_price', avg_price)
+        if current_price and avg_price and quantity:
+            entry = unrealized.setdefault(user_id, [0.0, 0.0, 0])
+            entry[0] += (float(current_price) - avg_price) * quantity
+            entry[1] += avg_price * quantity
+            entry[2] += 1
+
+    # 역할 정렬 우선순위
+    role_priority = {'manager': 0, 'admin': 1, 'member': 2}
 
     # 전체 평균 주간 출석률 계산용
     total_week_rate = 0
@@ -244,53 +263,15 @@ async def get_team_ranking(
 
     result = []
     for user in users:
-        # 해당 유저가 관련된 포지션 ID 조회 (요청자 또는 개설자)
-        position_ids_query = db.query(Position.id).join(
-            Request, Position.id == Request.position_id, isouter=True
-        ).filter(
-            (Position.opened_by == user.id) | (Request.requester_id == user.id)
-        ).distinct().all()
-
-        position_ids = [p[0] for p in position_ids_query]
-        user_positions = db.query(Position).filter(Position.id.in_(position_ids)).all() if position_ids else []
+        ps = position_stats.get(user.id, {})
+        open_profit, open_investment, open_counted = unrealized.get(user.id, (0.0, 0.0, 0))
 
         # 수익률/수익금 계산
-        total_profit = 0
-        total_investment = 0
-        position_count = 0
-        open_positions = 0
-        closed_positions = 0
-        winning_trades = 0
-        losing_trades = 0
-
-        for pos in user_positions:
-            avg_price = float(pos.average_buy_price) if pos.average_buy_price else 0
-            quantity = float(pos.total_quantity) if pos.total_quantity else 0
-
-            # 포지션 평가액 계산
-            if pos.status == PositionStatus.OPEN.value:
-                open_positions += 1
-                # 열린 포지션: 실시간 시세 사용
-                current_price = price_data.get(pos.id, {}).get('current_price', avg_price)
-                if current_price and avg_price and quantity:
-                    unrealized = (float(current_price) - avg_price) * quantity
-                    investment = avg_price * quantity
-                    total_profit += unrealized
-                    total_investment += investment
-                    position_count += 1
-            else:
-                closed_positions += 1
-                # 종료된 포지션: 확정 수익 사용
-                if pos.profit_loss is not None:
-                    total_profit += float(pos.profit_loss)
-                    if avg_price and quantity:
-                        total_investment += avg_price * quantity
-                    position_count += 1
-                    # 승/패 계산
-                    if pos.profit_loss > 0:
-                        winning_trades += 1
-                    elif pos.profit_loss < 0:
-                        losing_trades += 1
+        total_profit = float(ps.get("closed_profit", 0)) + open_profit
+        total_investment = float(ps.get("closed_investment", 0)) + open_investment
+        position_count = ps.get("closed_counted", 0) + open_counted
+        winning_trades = ps.get("winning_trades", 0)
+        losing_trades = ps.get("losing_trades", 0)
 
         # 평균 수익률 계산
         avg_profit_rate = (total_profit / total_investment * 100) if total_investment > 0 else 0
@@ -299,43 +280,20 @@ async def get_team_ranking(
         total_trades = winning_trades + losing_trades
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
 
-        # 주간 출석률 계산
-        week_attendances = db.query(Attendance).filter(
-            Attendance.user_id == user.id,
-            Attendance.date >= week_start,
-            Attendance.date <= today
-        ).all()
-
-        week_total = len(week_attendances)
-        week_present = len([a for a in week_attendances if a.status in ['present', 'recovered']])
+        # 출석률 (주간 / 이번달 / 전체)
+        att = attendance_stats.get(user.id, {})
+        week_total = att.get("week_total", 0)
+        week_present = att.get("week_present", 0)
         week_rate = (week_present / week_total * 100) if week_total > 0 else 0
-
-        # 이번달 출석률 계산
-        month_start = today.replace(day=1)
-        month_attendances = db.query(Attendance).filter(
-            Attendance.user_id == user.id,
-            Attendance.date >= month_start,
-            Attendance.date <= today
-        ).all()
-        month_total = len(month_attendances)
-        month_present = len([a for a in month_attendances if a.status in ['present', 'recovered']])
-        month_rate = (month_present / month_total * 100) if month_total > 0 else 0
-
-        # 전체 출석률 계산
-        all_attendances = db.query(Attendance).filter(
-            Attendance.user_id == user.id
-        ).all()
-        all_total = len(all_attendances)
-        all_present = len([a for a in all_attendances if a.status in ['present', 'recovered']])
-        total_rate = (all_present / all_total * 100) if all_total > 0 else 0
+        month_total = att.get("month_total", 0)
+        month_rate = (att.get("month_present", 0) / month_total * 100) if month_total > 0 else 0
+        all_total = att.get("all_total", 0)
+        total_rate = (att.get("all_present", 0) / all_total * 100) if all_total > 0 else 0
 
         if week_total > 0:
             total_week_rate += week_rate
             user_count += 1
 
-        # 역할 정렬 우선순위
-        role_priority = {'manager': 0, 'admin': 1, 'member': 2}
-
         result.append({
             "id": user.id,
             "username": user.username,
@@ -349,8 +307,8 @@ async def get_team_ranking(
             "win_rate": round(win_rate, 1),
             "winning_trades": winning_trades,
             "losing_trades": losing_trades,
-            "open_positions": open_positions,
-            "closed_positions": closed_positions,
+            "open_positions": ps.get("open_positions", 0),
+            "closed_positions": ps.get("closed_positions", 0),
             "week_attendance_rate": round(week_rate, 1),
             "month_attendance_rate": round(month_rate, 1),
             "total_attendance_rate": round(total_rate, 1),
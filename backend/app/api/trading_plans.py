@@ -16,6 +16,7 @@ from app.schemas.user import UserBrief
 from app.schemas.common import APIResponse
 from app.dependencies import get_current_user, get_writer_user
 from app.services.audit_service import AuditService
+from app.services.performance_service import PerformanceService
 
 router = APIRouter()
 
@@ -358,6 +359,7 @@ async def create_execution_record(
         if profit_loss is not None:
             current_realized = float(position.realized_profit_loss) if position.realized_profit_loss else 0
             position.realized_profit_loss = current_realized + profit_loss
+            PerformanceService(db).add_execution(position, profit_loss)
 
         # 전량 매도 시 포지션 종료 처리 (선택사항)
         if remaining_qty <= 0:
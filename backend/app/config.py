@@ -48,6 +48,70 @@ class Settings(BaseSettings):
     vapid_private_key: str = ""
     vapid_claims_email: str = "mailto:fund@messenger.app"
 
+    # 시세 캐시 (초 단위 TTL)
+    quote_cache_max_size: int = 2048
+    quote_cache_crypto_ttl: int = 10
+    quote_cache_open_ttl: int = 60
+    quote_cache_closed_ttl: int = 600
+    quote_cache_stale_ttl: int = 3600
+
+    # 외부 API HTTP 클라이언트 (공용 커넥션 풀)
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_per_host_limit: int = 8
+    http_retries: int = 2
+    http_backoff_base: float = 0.5
+    http_backoff_max: float = 5.0
+
+    # 실시간 시세 푸시 (구독 종목 폴링 주기, 초)
+    price_stream_tick: float = 1.0
+    price_stream_crypto_interval: int = 5
+    price_stream_open_interval: int = 15
+    price_stream_closed_interval: int = 300
+
+    # Binance 실시간 시세 스트림
+    binance_stream_enabled: bool = True
+    binance_ws_url: str = "wss://stream.binance.com:9443"
+    binance_stream_max_age: int = 30
+    binance_stream_resync_interval: int = 10
+    binance_stream_reconnect_max: float = 30.0
+
+    # 종목 목록 스냅샷 저장 위치 (비어 있으면 backend/data)
+    listing_data_dir: str = ""
+    korean_listing_refresh_hours: int = 24
+    us_listing_refresh_hours: int = 168
+    us_search_cache_ttl: int = 3600
+    search_result_cache_ttl: int = 300
+    search_degraded_cache_ttl: int = 10  # yfinance Search 실패/타임아웃으로 일부만 찾은 결과
+
+    # WebSocket 전송 큐 (연결별)
+    ws_send_queue_size: int = 256
+    ws_slow_client_policy: str = "drop_oldest"  # drop_oldest | disconnect
+
+    # 알림 전송 outbox (백그라운드 dispatcher)
+    notification_dispatch_workers: int = 4
+    notification_dispatch_interval: float = 2.0  # 초 (wake 신호가 없을 때 폴링 주기)
+    notification_dispatch_batch: int = 100
+    notification_lease_seconds: int = 60
+    notification_max_attempts: int = 6
+    notification_retry_base: int = 30  # 초, 재시도마다 2배
+    notification_retry_max: int = 3600
+    notification_outbox_retention_days: int = 7
+    push_timeout: float = 10.0
+
+    # WebSocket DB 작업 (전용 스레드 풀 + 채팅 메시지 배치 저장)
+    ws_db_workers: int = 4
+    ws_chat_batch_window: float = 0.02  # 초
+    ws_chat_batch_max: int = 100
+
+    # WebSocket 워커 간 전달 (memory | postgres | redis)
+    ws_pubsub_backend: str = "memory"
+    ws_pubsub_channel: str = "fund_ws"
+    ws_pubsub_payload_retention_seconds: int = 300  # NOTIFY 한도 초과 envelope 본문 보관 기간
+    redis_url: str = "redis://localhost:6379/0"
+
     # Environment
     environment: str = "development"
 
@@ -8,9 +8,15 @@ from app.database import get_db, engine, Base
 from app.api import api_router
 from app.websocket import manager
 from app.websocket.handlers import handle_websocket_message
+from app.websocket.chat_writer import chat_writer
 from app.utils.security import decode_token
 from app.services.scheduler import init_scheduler, shutdown_scheduler
 from app.services.stock_search_service import stock_search_service
+from app.services.krx_symbol_registry import krx_symbol_registry
+from app.services.http_client import http_client
+from app.services.price_stream import price_stream
+from app.services.binance_stream import binance_stream
+from app.services.notification_dispatcher import notification_dispatcher
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -58,24 +64,20 @@ async def websocket_endpoint(
     user_id = int(payload.get("sub"))
 
     # Connect
-    await manager.connect(websocket, user_id)
+    connection = await manager.connect(websocket, user_id)
 
     try:
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
 
-            # Get DB session for this message
-            db = next(get_db())
-            try:
-                await handle_websocket_message(websocket, message, user_id, manager, db)
-            finally:
-                db.close()
+            # DB 작업은 handler 내부에서 전용 스레드 풀로 넘김 (프레임마다 세션을 열지 않음)
+            await handle_websocket_message(connection, message, manager)
 
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id)
+        manager.disconnect(connection)
     except Exception as e:
-        manager.disconnect(websocket, user_id)
+        manager.disconnect(connection)
 
 
 # Startup event (시드 계정 생성 제거됨 - 첫 가입자가 자동으로 팀장이 됨)
@@ -184,6 +186,10 @@ def _ensure_vapid_keys():
 
 @app.on_event("startup")
 async def startup_event():
+    # 외부 API 공용 HTTP 클라이언트 (커넥션 풀)
+    await http_client.start()
+    # WebSocket 워커 간 pub/sub 버스
+    await manager.start_bus()
     init_scheduler()
     # VAPID 키 확인/생성
     _ensure_vapid_keys()
@@ -192,19 +198,37 @@ async def startup_event():
     Base.metadata.create_all(bind=engine)
     # 뉴스데스크 시드 데이터 임포트
     _seed_newsdesk_data()
-    # 한국 종목 목록 미리 로드 (첫 검색 시 지연 방지)
-    print("한국 종목 목록 로드 시작...")
+    # 한국 종목 Yahoo 심볼(.KS/.KQ) 매핑 로드
+    krx_symbol_registry.load()
+    # 한국 종목 목록: 디스크 스냅샷으로 즉시 로드, KRX 갱신은 백그라운드
     try:
         await stock_search_service.load_korean_stocks()
-        print(f"한국 종목 목록 로드 완료 (총 {len(stock_search_service._korean_stocks_list)}개)")
+        print(f"한국 종목 목록 스냅샷 로드 (총 {len(stock_search_service._korean_stocks_list)}개)")
     except Exception as e:
         print(f"한국 종목 목록 로드 실패: {e}")
+    # 미국 종목 디렉터리 (NASDAQ/NYSE/AMEX)
+    try:
+        await stock_search_service.load_us_stocks()
+    except Exception as e:
+        print(f"미국 종목 디렉터리 로드 실패: {e}")
+    # 구독 종목 실시간 시세 푸시
+    price_stream.start()
+    # Binance 실시간 시세 수신 (암호화폐)
+    binance_stream.start()
+    # 알림 전송 outbox dispatcher (WebSocket / Web Push)
+    notification_dispatcher.start()
     print("Fund Team Messenger API started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await price_stream.stop()
+    await binance_stream.stop()
+    await chat_writer.stop()
+    await notification_dispatcher.stop()
     shutdown_scheduler()
+    await http_client.close()
+    await manager.stop_bus()
     print("Fund Team Messenger API shutdown")
 
 
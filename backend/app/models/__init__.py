@@ -8,6 +8,7 @@ from app.models.verification import EmailVerification
 from app.models.team_settings import TeamSettings
 from app.models.audit_log import AuditLog
 from app.models.notification import Notification
+from app.models.notification_delivery import NotificationDelivery
 from app.models.decision_note import DecisionNote
 from app.models.team_column import TeamColumn
 from app.models.attendance import Attendance
@@ -15,5 +16,9 @@ from app.models.trading_plan import TradingPlan
 from app.models.newsdesk import NewsDesk, RawNews
 from app.models.asset_snapshot import AssetSnapshot
 from app.models.comment import Comment
+from app.models.krx_symbol import KrxSymbol
+from app.models.price_candle import PriceCandle, CandleSeries
+from app.models.performance_rollup import UserPerformance, TickerPerformance
+from app.models.ws_pubsub_payload import WsPubSubPayload
 
-__all__ = ["User", "Position", "Request", "Discussion", "Message", "PriceAlert", "EmailVerification", "TeamSettings", "AuditLog", "Notification", "DecisionNote", "TeamColumn", "Attendance", "TradingPlan", "NewsDesk", "RawNews", "AssetSnapshot", "Comment"]
+__all__ = ["User", "Position", "Request", "Discussion", "Message", "PriceAlert", "EmailVerification", "TeamSettings", "AuditLog", "Notification", "NotificationDelivery", "DecisionNote", "TeamColumn", "Attendance", "TradingPlan", "NewsDesk", "RawNews", "AssetSnapshot", "Comment", "KrxSymbol", "PriceCandle", "CandleSeries", "UserPerformance", "TickerPerformance", "WsPubSubPayload"]
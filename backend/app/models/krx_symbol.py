@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+
+
+class KrxSymbol(Base):
+    """한국 종목 Yahoo Finance 심볼 매핑 (.KS / .KQ 확정값)"""
+    __tablename__ = "krx_symbols"
+
+    ticker = Column(String(20), primary_key=True)  # 005930
+    market = Column(String(20), nullable=False)  # KOSPI, KOSDAQ
+    yahoo_symbol = Column(String(30), nullable=False)  # 005930.KS
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -25,3 +25,13 @@ class Notification(Base):
 
     # Relationships
     user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        # 읽지 않은 알림만 담는 부분 인덱스 (카운터 재계산/unread_only 조회용)
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0")
+        ),
+    )
@@ -0,0 +1,42 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+import enum
+
+from app.database import Base
+
+
+class DeliveryChannel(str, enum.Enum):
+    WEBSOCKET = "websocket"
+    PUSH = "push"
+
+
+class DeliveryStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # 재시도 한도 초과
+
+
+class NotificationDelivery(Base):
+    """알림 전송 outbox (알림 생성과 같은 트랜잭션에서 기록, 전송은 NotificationDispatcher)"""
+    __tablename__ = "notification_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+
+    channel = Column(String(20), nullable=False)
+    # Push 채널: 기기(구독)별 1행, 구독이 삭제되면 함께 삭제
+    subscription_id = Column(Integer, ForeignKey("push_subscriptions.id", ondelete="CASCADE"), nullable=True)
+
+    status = Column(String(20), nullable=False, default=DeliveryStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    # 다음 시도 시각 (처리 중인 행은 임대 만료 시각)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_notification_deliveries_due", "status", "next_attempt_at"),
+    )
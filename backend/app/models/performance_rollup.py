@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+# opened_by가 없는 포지션을 모으는 user_id (PK라 NULL 불가)
+NO_OPENER = 0
+
+
+class UserPerformance(Base):
+    """사용자(포지션 개설자)별 누적 매매 성과 - 포지션 종료/체결 기록 시 증분 갱신"""
+    __tablename__ = "user_performance"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)  # positions.opened_by (없으면 0)
+
+    # 종료된 포지션
+    closed_trades = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+    realized_pl = Column(Numeric(20, 2), nullable=False, default=0)
+    total_volume = Column(Numeric(20, 2), nullable=False, default=0)  # 종료 포지션 매수금액 합
+    profit_rate_sum = Column(Numeric(20, 4), nullable=False, default=0)
+    profit_rate_count = Column(Integer, nullable=False, default=0)  # profit_rate가 있는 종료 포지션 수
+    holding_hours_sum = Column(Integer, nullable=False, default=0)
+
+    # 진행 중 익절/손절 체결
+    executions = Column(Integer, nullable=False, default=0)
+    execution_pl = Column(Numeric(20, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class TickerPerformance(Base):
+    """종목별 누적 매매 성과 - 포지션 종료/체결 기록 시 증분 갱신"""
+    __tablename__ = "ticker_performance"
+
+    ticker = Column(String(20), primary_key=True)
+    ticker_name = Column(String(100))  # 마지막으로 반영된 포지션 기준
+    market = Column(String(20))
+
+    closed_trades = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+    realized_pl = Column(Numeric(20, 2), nullable=False, default=0)
+    total_volume = Column(Numeric(20, 2), nullable=False, default=0)
+    profit_rate_sum = Column(Numeric(20, 4), nullable=False, default=0)
+    profit_rate_count = Column(Integer, nullable=False, default=0)
+    holding_hours_sum = Column(Integer, nullable=False, default=0)
+
+    executions = Column(Integer, nullable=False, default=0)
+    execution_pl = Column(Numeric(20, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, Float, Boolean, DateTime, PrimaryKeyConstraint
+
+from app.database import Base
+
+
+class PriceCandle(Base):
+    """로컬 캔들(OHLCV) 저장소 - (symbol, interval, time) 단위"""
+    __tablename__ = "price_candles"
+
+    symbol = Column(String(30), nullable=False)  # Yahoo 심볼 (AAPL, 005930.KS)
+    interval = Column(String(10), nullable=False)  # 1d, 1wk, 1mo, 1h
+    time = Column(BigInteger, nullable=False)  # Unix timestamp (초)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('symbol', 'interval', 'time', name='pk_price_candles'),
+    )
+
+
+class CandleSeries(Base):
+    """캔들 시리즈 메타데이터 - 로컬에 보유한 구간과 마지막 갱신 시각"""
+    __tablename__ = "candle_series"
+
+    symbol = Column(String(30), nullable=False)
+    interval = Column(String(10), nullable=False)
+    name = Column(String(200))  # 종목명 (최초 1회 조회)
+    first_time = Column(BigInteger)  # 보유한 가장 오래된 캔들
+    last_time = Column(BigInteger)  # 보유한 가장 최근 캔들
+    history_complete = Column(Boolean, default=False)  # 과거 구간을 끝까지 받았는지
+    fetched_at = Column(DateTime, default=datetime.utcnow)  # 최근 구간 마지막 갱신
+
+    __table_args__ = (
+        PrimaryKeyConstraint('symbol', 'interval', name='pk_candle_series'),
+    )
@@ -29,6 +29,9 @@ class User(Base):
     # 출석 방패 (칼럼 검증 시 미출석이 없으면 적립, 미출석 발생 시 자동 소모)
     attendance_shields = Column(Integer, default=0, nullable=False, server_default=text('0'))
 
+    # 읽지 않은 알림 수 (NotificationService가 생성/읽음/삭제 시 증감)
+    unread_notification_count = Column(Integer, default=0, nullable=False, server_default=text('0'))
+
     # Relationships
     requests = relationship("Request", back_populates="requester", foreign_keys="Request.requester_id")
     approved_requests = relationship("Request", back_populates="approver", foreign_keys="Request.approved_by")
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from app.database import Base
+
+
+class WsPubSubPayload(Base):
+    """NOTIFY 한도를 넘는 WebSocket pub/sub envelope 본문 (NOTIFY에는 id만 실어 보냄)"""
+    __tablename__ = "ws_pubsub_payloads"
+
+    id = Column(Integer, primary_key=True)
+    channel = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)
+    # 보관 기간(ws_pubsub_payload_retention_seconds)이 지나면 다음 발행 때 삭제
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
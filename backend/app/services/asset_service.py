@@ -3,9 +3,11 @@
 """
 import asyncio
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
 
 from app.models.asset_snapshot import AssetSnapshot
@@ -18,28 +20,59 @@ logger = logging.getLogger(__name__)
 
 
 async def create_daily_snapshot_async(db: Session) -> AssetSnapshot:
-    """일별 자산 스냅샷 생성 (KST 기준, async)"""
+    """일별 자산 스냅샷 생성 (KST 기준, async)
+
+    DB 조회/저장은 스레드 풀에서, 시세는 한 번에 일괄 조회하므로 이벤트 루프를 막지 않는다.
+    """
     today = datetime.now(KST).date()
+    loop = asyncio.get_running_loop()
+
+    existing, open_positions = await loop.run_in_executor(None, _load_snapshot_inputs, db, today)
+    if existing:
+        return existing
+
+    # 현재가 일괄 조회 (시장별 묶음, 같은 종목은 1회)
+    price_service = PriceService()
+    try:
+        prices = await price_service.get_prices(
+            list({(p.ticker, (p.market or "").upper()) for p in open_positions})
+        )
+    except Exception as e:
+        logger.warning(f"Failed to get prices for snapshot: {e}")
+        prices = {}
+
+    return await loop.run_in_executor(None, _save_snapshot, db, today, open_positions, prices)
 
-    # 이미 오늘 스냅샷이 있으면 반환
+
+def _load_snapshot_inputs(db: Session, today: date) -> Tuple[Optional[AssetSnapshot], list]:
+    """오늘 스냅샷(있으면)과 열린 포지션 (필요한 컬럼만)"""
     existing = db.query(AssetSnapshot).filter(
         AssetSnapshot.snapshot_date == today
     ).first()
     if existing:
-        return existing
+        return existing, []
+
+    open_positions = db.query(
+        Position.id,
+        Position.ticker,
+        Position.ticker_name,
+        Position.market,
+        Position.total_quantity,
+        Position.average_buy_price,
+        Position.total_buy_amount,
+    ).filter(
+        Position.status == 'open'
+    ).order_by(Position.id).all()
+    return None, open_positions
+
 
+def _save_snapshot(db: Session, today: date, open_positions: list, prices: Dict) -> AssetSnapshot:
+    """평가금액 계산 후 스냅샷 저장 (한 트랜잭션)"""
     # 팀 설정에서 초기 자본 가져오기
     settings = db.query(TeamSettings).first()
     initial_krw = Decimal(str(settings.initial_capital_krw or 0)) if settings else Decimal("0")
     initial_usd = Decimal(str(settings.initial_capital_usd or 0)) if settings else Decimal("0")
 
-    # 열린 포지션 조회
-    open_positions = db.query(Position).filter(
-        Position.status == 'open'
-    ).all()
-
-    # 시세 서비스로 현재가 조회
-    price_service = PriceService()
     krw_eval = Decimal("0")
     usd_eval = Decimal("0")
     usdt_eval = Decimal("0")
@@ -54,12 +87,7 @@ async def create_daily_snapshot_async(db: Session) -> AssetSnapshot:
         avg_price = Decimal(str(p.average_buy_price or 0))
         buy_amount = Decimal(str(p.total_buy_amount or 0))
 
-        # 현재가 조회
-        try:
-            current_price = await price_service.get_price(p.ticker, market)
-        except Exception as e:
-            logger.warning(f"Failed to get price for {p.ticker} ({market}): {e}")
-            current_price = None
+        current_price = prices.get((p.ticker, market))
 
         if current_price is None:
             # 시세 조회 실패 시 매입가로 대체
@@ -136,7 +164,12 @@ async def create_daily_snapshot_async(db: Session) -> AssetSnapshot:
         position_details=position_details,
     )
     db.add(snapshot)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # 수동 생성과 스케줄러가 동시에 만든 경우 먼저 저장된 스냅샷 사용
+        db.rollback()
+        return db.query(AssetSnapshot).filter(AssetSnapshot.snapshot_date == today).one()
     db.refresh(snapshot)
 
     logger.info(
@@ -146,15 +179,6 @@ async def create_daily_snapshot_async(db: Session) -> AssetSnapshot:
     return snapshot
 
 
-def create_daily_snapshot(db: Session) -> AssetSnapshot:
-    """동기 래퍼 (스케줄러 호환)"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(create_daily_snapshot_async(db))
-    finally:
-        loop.close()
-
-
 def get_asset_history(db: Session, days: int = 30) -> list[AssetSnapshot]:
     """자산 히스토리 조회"""
     return db.query(AssetSnapshot).order_by(
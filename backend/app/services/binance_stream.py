@@ -0,0 +1,196 @@
+"""
+Binance 실시간 시세 수신 (WebSocket combined stream)
+- WebSocket 구독 중인 암호화폐 + 열린 암호화폐 포지션 종목의 <symbol>@miniTicker 구독
+- 수신한 최근 체결가를 메모리 테이블에 보관 → PriceService.get_crypto_price가 네트워크 없이 조회
+- 구독 종목이 바뀌면 연결을 유지한 채 SUBSCRIBE / UNSUBSCRIBE 요청
+- 연결이 끊기면 지수 백오프로 재연결
+- 접속 주소는 settings.binance_ws_url (테스트 시 로컬 WebSocket 서버로 교체 가능)
+"""
+import asyncio
+import json
+import time
+from decimal import Decimal
+from typing import Dict, Optional, Set, Tuple
+
+import websockets
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.position import Position, PositionStatus
+from app.utils.market_hours import CRYPTO_MARKETS, normalize_market
+from app.websocket import manager
+
+
+def to_binance_symbol(ticker: str) -> str:
+    """USDT 페어로 변환 (예: BTC -> BTCUSDT)"""
+    symbol = ticker.upper()
+    if not symbol.endswith("USDT"):
+        symbol = f"{symbol}USDT"
+    return symbol
+
+
+class BinanceStream:
+    """miniTicker 스트림 소비자 + 최근가 테이블"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        # 최근 체결가: {symbol: (price, received_at monotonic)}
+        self._prices: Dict[str, Tuple[Decimal, float]] = {}
+        # 현재 연결에서 구독 중인 심볼
+        self._symbols: Set[str] = set()
+        self._request_id = 0
+        self.connected = False
+        self.reconnects = 0
+
+    def start(self) -> None:
+        if not settings.binance_stream_enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def get_price(self, ticker: str) -> Optional[Decimal]:
+        """스트림으로 받은 최근가 (없거나 오래되었으면 None)"""
+        entry = self._prices.get(to_binance_symbol(ticker))
+        if entry is None:
+            return None
+        price, received_at = entry
+        if time.monotonic() - received_at > settings.binance_stream_max_age:
+            return None
+        return price
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "connected": self.connected,
+            "symbols": sorted(self._symbols),
+            "prices": len(self._prices),
+            "reconnects": self.reconnects,
+        }
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                symbols = await self._desired_symbols()
+                if not symbols:
+                    await asyncio.sleep(settings.binance_stream_resync_interval)
+                    continue
+                await self._consume(symbols)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Binance 스트림 오류: {e}")
+                if self.connected:
+                    # 연결된 뒤 끊긴 경우 백오프를 처음부터
+                    backoff = 1.0
+                    self.connected = False
+                self.reconnects += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, settings.binance_stream_reconnect_max)
+            finally:
+                self.connected = False
+                self._symbols = set()
+
+    async def _consume(self, symbols: Set[str]) -> None:
+        """연결 1회 수명 동안 메시지 수신. 구독할 종목이 없어지면 정상 종료"""
+        streams = "/".join(self._stream_name(s) for s in sorted(symbols))
+        url = f"{settings.binance_ws_url.rstrip('/')}/stream?streams={streams}"
+
+        async with websockets.connect(url, ping_interval=20, ping_timeout=20) as ws:
+            self.connected = True
+            self._symbols = set(symbols)
+            resync_at = time.monotonic() + settings.binance_stream_resync_interval
+
+            while True:
+                timeout = max(resync_at - time.monotonic(), 0.1)
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    raw = None
+                if raw is not None:
+                    self._handle_message(raw)
+
+                if time.monotonic() >= resync_at:
+                    desired = await self._desired_symbols()
+                    if not desired:
+                        return
+                    await self._update_subscriptions(ws, desired)
+                    resync_at = time.monotonic() + settings.binance_stream_resync_interval
+
+    def _handle_message(self, raw) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        # combined stream: {"stream": "btcusdt@miniTicker", "data": {...}}
+        data = message.get("data", message) if isinstance(message, dict) else None
+        if not isinstance(data, dict) or data.get("e") != "24hrMiniTicker":
+            return
+        try:
+            self._prices[data["s"]] = (Decimal(data["c"]), time.monotonic())
+        except (KeyError, ArithmeticError):
+            pass
+
+    async def _update_subscriptions(self, ws, desired: Set[str]) -> None:
+        added = desired - self._symbols
+        removed = self._symbols - desired
+        if added:
+            await self._send_method(ws, "SUBSCRIBE", added)
+        if removed:
+            await self._send_method(ws, "UNSUBSCRIBE", removed)
+            for symbol in removed:
+                self._prices.pop(symbol, None)
+        self._symbols = set(desired)
+
+    async def _send_method(self, ws, method: str, symbols: Set[str]) -> None:
+        self._request_id += 1
+        await ws.send(json.dumps({
+            "method": method,
+            "params": [self._stream_name(s) for s in sorted(symbols)],
+            "id": self._request_id,
+        }))
+
+    @staticmethod
+    def _stream_name(symbol: str) -> str:
+        return f"{symbol.lower()}@miniTicker"
+
+    async def _desired_symbols(self) -> Set[str]:
+        """WebSocket 구독 종목 + 열린 포지션 중 암호화폐"""
+        symbols = {
+            to_binance_symbol(ticker)
+            for ticker in manager.get_subscribed_tickers()
+            if normalize_market(manager.get_price_market(ticker)) in CRYPTO_MARKETS
+        }
+        loop = asyncio.get_running_loop()
+        tickers = await loop.run_in_executor(None, self._open_position_tickers)
+        symbols.update(to_binance_symbol(ticker) for ticker in tickers)
+        return symbols
+
+    @staticmethod
+    def _open_position_tickers() -> Set[str]:
+        db = SessionLocal()
+        try:
+            rows = db.query(Position.ticker).filter(
+                Position.status == PositionStatus.OPEN.value,
+                Position.market.in_(CRYPTO_MARKETS)
+            ).distinct().all()
+            return {ticker for ticker, in rows}
+        except Exception as e:
+            print(f"암호화폐 포지션 조회 오류: {e}")
+            return set()
+        finally:
+            db.close()
+
+
+# 싱글톤 인스턴스
+binance_stream = BinanceStream()
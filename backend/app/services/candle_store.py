@@ -0,0 +1,155 @@
+"""
+로컬 캔들(OHLCV) 저장소
+- (symbol, interval) 단위로 price_candles 테이블에 저장
+- candle_series에 보유 구간(first_time ~ last_time)과 최근 갱신 시각 기록
+- 차트 스크롤(before=) 요청은 로컬 범위 조회로 처리하고,
+  upstream에서는 없는 최근/과거 구간만 받아서 채운다 (PriceService 담당)
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.price_candle import PriceCandle, CandleSeries
+
+CANDLE_FIELDS = ("time", "open", "high", "low", "close", "volume")
+
+# 최근 구간 재조회 주기 (초)
+CANDLE_REFRESH_SECONDS = {
+    "1h": 300,
+    "1d": 900,
+    "1wk": 3600,
+    "1mo": 3600,
+}
+
+# 과거 구간 채우기가 실패/빈 결과였을 때 다시 시도하기까지 (초)
+BACKFILL_RETRY_SECONDS = 600
+
+
+class CandleStore:
+    """price_candles / candle_series 접근 (동기, executor에서 호출)"""
+
+    def __init__(self):
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # 과거 구간 재시도 가능 시각 (monotonic): {(symbol, interval): retry_at}
+        self._backfill_retry_at: Dict[Tuple[str, str], float] = {}
+
+    def lock(self, symbol: str, interval: str) -> threading.Lock:
+        """같은 시리즈의 동시 upstream 조회/저장 방지"""
+        key = (symbol, interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def backfill_due(self, symbol: str, interval: str) -> bool:
+        """과거 구간 채우기를 시도해도 되는지 (직전 실패 후 대기 중이면 False)"""
+        return self._backfill_retry_at.get((symbol, interval), 0) <= time.monotonic()
+
+    def defer_backfill(self, symbol: str, interval: str) -> None:
+        """과거 구간 채우기 실패 기록 - BACKFILL_RETRY_SECONDS 동안 다시 받지 않음"""
+        self._backfill_retry_at[(symbol, interval)] = time.monotonic() + BACKFILL_RETRY_SECONDS
+
+    def get_series(self, db: Session, symbol: str, interval: str) -> Optional[CandleSeries]:
+        return db.query(CandleSeries).filter(
+            CandleSeries.symbol == symbol,
+            CandleSeries.interval == interval
+        ).first()
+
+    def needs_refresh(self, series: CandleSeries) -> bool:
+        if not series.fetched_at:
+            return True
+        age = (datetime.utcnow() - series.fetched_at).total_seconds()
+        return age >= CANDLE_REFRESH_SECONDS.get(series.interval, 900)
+
+    def save(
+        self,
+        db: Session,
+        symbol: str,
+        interval: str,
+        candles: List[Dict[str, Any]],
+        name: Optional[str] = None,
+        history_complete: Optional[bool] = None,
+        refreshed: bool = True
+    ) -> CandleSeries:
+        """캔들 저장 (같은 구간의 기존 캔들은 교체) 및 시리즈 메타데이터 갱신"""
+        series = self.get_series(db, symbol, interval)
+        if series is None:
+            series = CandleSeries(symbol=symbol, interval=interval, history_complete=False)
+            db.add(series)
+
+        if candles:
+            start, end = candles[0]["time"], candles[-1]["time"]
+            db.query(PriceCandle).filter(
+                PriceCandle.symbol == symbol,
+                PriceCandle.interval == interval,
+                PriceCandle.time >= start,
+                PriceCandle.time <= end
+            ).delete(synchronize_session=False)
+            db.execute(
+                insert(PriceCandle),
+                [{"symbol": symbol, "interval": interval, **c} for c in candles]
+            )
+            series.first_time = start if series.first_time is None else min(series.first_time, start)
+            series.last_time = end if series.last_time is None else max(series.last_time, end)
+
+        if name:
+            series.name = name
+        if history_complete is not None:
+            series.history_complete = history_complete
+        if refreshed:
+            series.fetched_at = datetime.utcnow()
+
+        db.commit()
+        return series
+
+    def query(
+        self,
+        db: Session,
+        symbol: str,
+        interval: str,
+        limit: int,
+        before: Optional[int] = None,
+        columnar: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+        """before 이전 최근 limit개 캔들 (시간 오름차순)
+
+        columnar=True면 캔들별 dict 대신 필드별 배열({time: [...], open: [...], ...})로 반환
+        """
+        q = db.query(
+            PriceCandle.time, PriceCandle.open, PriceCandle.high,
+            PriceCandle.low, PriceCandle.close, PriceCandle.volume
+        ).filter(
+            PriceCandle.symbol == symbol,
+            PriceCandle.interval == interval
+        )
+        if before:
+            q = q.filter(PriceCandle.time < before)
+        rows = q.order_by(PriceCandle.time.desc()).limit(limit).all()
+        rows.reverse()
+
+        if columnar:
+            columns = list(zip(*rows)) if rows else [()] * len(CANDLE_FIELDS)
+            result = {field: list(values) for field, values in zip(CANDLE_FIELDS, columns)}
+            result["volume"] = [v or 0.0 for v in result["volume"]]
+            return result
+
+        return [
+            {
+                "time": row.time,
+                "open": row.open,
+                "high": row.high,
+                "low": row.low,
+                "close": row.close,
+                "volume": row.volume or 0.0
+            }
+            for row in rows
+        ]
+
+
+# 싱글톤 인스턴스
+candle_store = CandleStore()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
@@ -210,6 +210,50 @@ class DiscussionService:
 
         return message
 
+    def create_messages(self, items: List[Tuple[int, MessageCreate, int]]) -> List[Optional[Message]]:
+        """메시지 여러 개를 한 트랜잭션으로 저장 (WebSocket 채팅 배치)
+
+        items: [(discussion_id, message_data, user_id), ...]
+        토론이 없거나 종료된 항목은 None (나머지는 그대로 저장)
+        """
+        discussion_ids = {discussion_id for discussion_id, _, _ in items}
+        discussions = {
+            d.id: d for d in self.db.query(Discussion).filter(Discussion.id.in_(discussion_ids)).all()
+        }
+
+        messages: List[Optional[Message]] = []
+        for discussion_id, message_data, user_id in items:
+            discussion = discussions.get(discussion_id)
+            if not discussion or discussion.status == DiscussionStatus.CLOSED.value:
+                messages.append(None)
+                continue
+
+            msg_type = MessageType.TEXT.value
+            if message_data.message_type == 'chart':
+                msg_type = MessageType.CHART.value
+
+            messages.append(Message(
+                discussion_id=discussion_id,
+                user_id=user_id,
+                content=message_data.content,
+                message_type=msg_type,
+                chart_data=message_data.chart_data,
+                session_number=discussion.session_count or 1
+            ))
+
+        created = [m for m in messages if m is not None]
+        if not created:
+            return messages
+
+        self.db.add_all(created)
+        self.db.flush()
+        ids = [m.id for m in created]
+        self.db.commit()
+        # commit으로 만료된 객체(created_at 포함)를 한 번의 조회로 다시 로드
+        self.db.query(Message).filter(Message.id.in_(ids)).all()
+
+        return messages
+
     def get_discussion_export(self, discussion_id: int) -> dict:
         discussion = self.get_discussion_by_id(discussion_id)
         if not discussion:
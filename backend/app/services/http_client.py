@@ -0,0 +1,114 @@
+"""
+외부 API 공용 HTTP 클라이언트
+- 앱 전체에서 하나의 커넥션 풀(HTTP/2 지원 시 사용)을 공유
+- 호스트별 동시 요청 수 제한
+- 일시적 오류(429, 5xx, 네트워크 오류)는 지수 백오프로 재시도
+- main.startup_event에서 start, shutdown_event에서 close
+"""
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HttpClient:
+    """커넥션 풀 기반 공용 비동기 HTTP 클라이언트"""
+
+    # 호스트별 동시 요청 수 (없으면 settings.http_per_host_limit)
+    HOST_LIMITS: Dict[str, int] = {
+        "api.binance.com": 10,
+        "openapi.naver.com": 5,
+    }
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_semaphores.clear()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """start 전에 호출되면 (스크립트 등) 지연 생성"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+            ),
+        )
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            limit = self.HOST_LIMITS.get(host, settings.http_per_host_limit)
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """요청 (재시도 포함). 재시도 후에도 실패 상태면 마지막 응답을 반환"""
+        retries = settings.http_retries if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore(url):
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+
+            await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.http_backoff_max)
+            except ValueError:
+                pass
+        return min(settings.http_backoff_base * (2 ** attempt), settings.http_backoff_max)
+
+
+# 싱글톤 인스턴스
+http_client = HttpClient()
@@ -0,0 +1,103 @@
+"""
+한국 종목 Yahoo Finance 심볼 레지스트리
+- 종목 목록(PyKRX)에서 시장을 알고 있으므로 .KS(KOSPI) / .KQ(KOSDAQ)를 미리 확정
+- krx_symbols 테이블에 저장하여 재시작 후에도 첫 요청부터 올바른 심볼로 조회
+- 목록에 없는 종목은 .KS → .KQ 순으로 조회 후 성공한 심볼을 기록
+"""
+import threading
+from typing import Dict, List, Optional
+
+from app.database import SessionLocal
+from app.models.krx_symbol import KrxSymbol
+
+MARKET_SUFFIX = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+SUFFIX_MARKET = {suffix: market for market, suffix in MARKET_SUFFIX.items()}
+
+
+class KrxSymbolRegistry:
+    """ticker → Yahoo 심볼 매핑 (메모리 + DB)"""
+
+    def __init__(self):
+        # {ticker: (market, yahoo_symbol)}
+        self._symbols: Dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self) -> None:
+        """DB에 저장된 매핑 로드 (동기)"""
+        db = SessionLocal()
+        try:
+            rows = db.query(KrxSymbol.ticker, KrxSymbol.market, KrxSymbol.yahoo_symbol).all()
+            with self._lock:
+                self._symbols = {ticker: (market, symbol) for ticker, market, symbol in rows}
+                self._loaded = True
+            print(f"KRX 심볼 레지스트리 로드 완료 ({len(rows)}개)")
+        except Exception as e:
+            print(f"KRX 심볼 레지스트리 로드 실패: {e}")
+        finally:
+            db.close()
+
+    def resolve(self, ticker: str) -> Optional[str]:
+        """확정된 Yahoo 심볼 (모르면 None)"""
+        entry = self._symbols.get(ticker)
+        return entry[1] if entry else None
+
+    def get_market(self, ticker: str) -> Optional[str]:
+        entry = self._symbols.get(ticker)
+        return entry[0] if entry else None
+
+    def candidates(self, ticker: str) -> List[str]:
+        """조회 시도할 Yahoo 심볼 순서"""
+        symbol = self.resolve(ticker)
+        if symbol:
+            return [symbol]
+        return [f"{ticker}.KS", f"{ticker}.KQ"]
+
+    def remember(self, ticker: str, yahoo_symbol: str) -> None:
+        """조회에 성공한 심볼 기록 (동기, DB 저장 포함)"""
+        suffix = yahoo_symbol[len(ticker):]
+        market = SUFFIX_MARKET.get(suffix)
+        if not market or self._symbols.get(ticker) == (market, yahoo_symbol):
+            return
+        self._save({ticker: (market, yahoo_symbol)})
+
+    def sync_from_listing(self, stocks: List[Dict[str, str]]) -> int:
+        """종목 목록([{ticker, name, market}, ...])으로 매핑 갱신. 변경된 건수 반환 (동기)"""
+        mapping = {}
+        for stock in stocks:
+            suffix = MARKET_SUFFIX.get(stock.get("market"))
+            if suffix:
+                mapping[stock["ticker"]] = (stock["market"], f"{stock['ticker']}{suffix}")
+
+        changed = {t: v for t, v in mapping.items() if self._symbols.get(t) != v}
+        if changed:
+            self._save(changed)
+        return len(changed)
+
+    def _save(self, entries: Dict[str, tuple[str, str]]) -> None:
+        with self._lock:
+            self._symbols.update(entries)
+
+        db = SessionLocal()
+        try:
+            existing = {
+                row.ticker: row
+                for row in db.query(KrxSymbol).filter(KrxSymbol.ticker.in_(list(entries.keys()))).all()
+            }
+            for ticker, (market, symbol) in entries.items():
+                row = existing.get(ticker)
+                if row:
+                    row.market = market
+                    row.yahoo_symbol = symbol
+                else:
+                    db.add(KrxSymbol(ticker=ticker, market=market, yahoo_symbol=symbol))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"KRX 심볼 레지스트리 저장 실패: {e}")
+        finally:
+            db.close()
+
+
+# 싱글톤 인스턴스
+krx_symbol_registry = KrxSymbolRegistry()
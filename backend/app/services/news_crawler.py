@@ -1,13 +1,14 @@
 # backend/app/services/news_crawler.py
+import asyncio
 import os
 import re
-import requests
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 
 from app.models.newsdesk import RawNews
 from app.config import settings
+from app.services.http_client import http_client
 
 
 class NewsCrawler:
@@ -121,12 +122,12 @@ class NewsCrawler:
         self.naver_client_id = os.getenv("NAVER_CLIENT_ID", "")
         self.naver_client_secret = os.getenv("NAVER_CLIENT_SECRET", "")
 
-    def collect_all(self, target_date: date) -> int:
+    async def collect_all(self, target_date: date) -> int:
         """모든 소스에서 뉴스 수집 (단일 날짜)"""
         total = 0
 
         # 네이버 키워드 검색 (메인)
-        total += self._collect_naver_news(target_date)
+        total += await self._collect_naver_news(target_date)
 
         # 해외 뉴스 (yfinance)
         total += self._collect_yfinance_news(target_date)
@@ -134,7 +135,7 @@ class NewsCrawler:
         print(f"=== Total collected: {total} articles ===")
         return total
 
-    def collect_for_morning_briefing(self, briefing_date: date) -> int:
+    async def collect_for_morning_briefing(self, briefing_date: date) -> int:
         """아침 브리핑용 뉴스 수집 (어제 + 오늘 새벽)
 
         예: 2월 8일 브리핑 = 2월 7일 전체 + 2월 8일 00:00~06:00
@@ -149,19 +150,44 @@ class NewsCrawler:
         print(f"    Today early: {briefing_date}")
 
         # 1. 어제 뉴스 수집
-        total += self._collect_naver_news(yesterday, newsdesk_date=briefing_date)
+        total += await self._collect_naver_news(yesterday, newsdesk_date=briefing_date)
         total += self._collect_yfinance_news(yesterday, newsdesk_date=briefing_date)
 
         # 2. 오늘 새벽 뉴스 수집 (현재 시간까지)
-        total += self._collect_naver_news(briefing_date, newsdesk_date=briefing_date)
+        total += await self._collect_naver_news(briefing_date, newsdesk_date=briefing_date)
         total += self._collect_yfinance_news(briefing_date, newsdesk_date=briefing_date)
 
         print(f"=== Total collected: {total} articles ===")
         return total
 
-    def _collect_naver_news(self, target_date: date, newsdesk_date: date = None) -> int:
+    async def _search_naver(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """네이버 뉴스 검색 API 호출 (공용 HTTP 클라이언트 사용)"""
+        try:
+            response = await http_client.get(
+                "https://openapi.naver.com/v1/search/news.json",
+                headers={
+                    "X-Naver-Client-Id": self.naver_client_id,
+                    "X-Naver-Client-Secret": self.naver_client_secret,
+                },
+                params={
+                    "query": keyword,
+                    "display": 10,  # 키워드당 10개
+                    "sort": "date",
+                },
+            )
+            if response.status_code != 200:
+                return None
+            return response.json()
+        except Exception as e:
+            print(f"Naver crawl error for '{keyword}': {e}")
+        return None
+
+    async def _collect_naver_news(self, target_date: date, newsdesk_date: date = None) -> int:
         """네이버 검색 API로 뉴스 수집
 
+        키워드 검색은 동시에 요청하고 (호스트별 동시 요청 수는 공용 클라이언트가 제한),
+        결과는 카테고리/키워드 순서대로 저장한다.
+
         Args:
             target_date: 수집할 뉴스의 발행일
             newsdesk_date: 뉴스데스크에 저장할 날짜 (기본값: target_date)
@@ -173,70 +199,61 @@ class NewsCrawler:
             print("NAVER API credentials not set")
             return 0
 
+        keywords = [
+            (category, keyword)
+            for category, category_keywords in self.KEYWORDS.items()
+            for keyword in category_keywords
+        ]
+        responses = await asyncio.gather(*[self._search_naver(keyword) for _, keyword in keywords])
+
         collected = 0
         seen_links = set()  # 중복 제거용
+        category_counts: Dict[str, int] = {}
+
+        for (category, keyword), data in zip(keywords, responses):
+            if not data:
+                continue
+            try:
+                for item in data.get("items", []):
+                    link = item.get("link", "")
+
+                    # 이미 수집한 링크면 스킵
+                    if link in seen_links:
+                        continue
 
-        for category, keywords in self.KEYWORDS.items():
-            category_count = 0
-
-            for keyword in keywords:
-                try:
-                    url = "https://openapi.naver.com/v1/search/news.json"
-                    headers = {
-                        "X-Naver-Client-Id": self.naver_client_id,
-                        "X-Naver-Client-Secret": self.naver_client_secret,
-                    }
-                    params = {
-                        "query": keyword,
-                        "display": 10,  # 키워드당 10개
-                        "sort": "date",
-                    }
-
-                    response = requests.get(url, headers=headers, params=params, timeout=10)
-                    if response.status_code != 200:
+                    # target_date 날짜 기사만 수집
+                    pub_date = self._parse_naver_date(item.get("pubDate"))
+                    if pub_date and pub_date.date() != target_date:
                         continue
 
-                    data = response.json()
-                    for item in data.get("items", []):
-                        link = item.get("link", "")
-
-                        # 이미 수집한 링크면 스킵
-                        if link in seen_links:
-                            continue
-
-                        # target_date 날짜 기사만 수집
-                        pub_date = self._parse_naver_date(item.get("pubDate"))
-                        if pub_date and pub_date.date() != target_date:
-                            continue
-
-                        seen_links.add(link)
-
-                        # DB 중복 체크 (같은 뉴스데스크에 같은 링크 있는지)
-                        existing = self.db.query(RawNews).filter(
-                            RawNews.link == link,
-                            RawNews.newsdesk_date == newsdesk_date
-                        ).first()
-
-                        if existing:
-                            continue
-
-                        news = RawNews(
-                            source="naver",
-                            title=self._clean_html(item.get("title", "")),
-                            description=self._clean_html(item.get("description", "")),
-                            link=link,
-                            pub_date=pub_date,
-                            newsdesk_date=newsdesk_date,
-                        )
-                        self.db.add(news)
-                        collected += 1
-                        category_count += 1
-
-                except Exception as e:
-                    print(f"Naver crawl error for '{keyword}': {e}")
-
-            if category_count > 0:
-                print(f"[{category}] {target_date}: {category_count} articles")
+                    seen_links.add(link)
+
+                    # DB 중복 체크 (같은 뉴스데스크에 같은 링크 있는지)
+                    existing = self.db.query(RawNews).filter(
+                        RawNews.link == link,
+                        RawNews.newsdesk_date == newsdesk_date
+                    ).first()
+
+                    if existing:
+                        continue
+
+                    news = RawNews(
+                        source="naver",
+                        title=self._clean_html(item.get("title", "")),
+                        description=self._clean_html(item.get("description", "")),
+                        link=link,
+                        pub_date=pub_date,
+                        newsdesk_date=newsdesk_date,
+                    )
+                    self.db.add(news)
+                    collected += 1
+                    category_counts[category] = category_counts.get(category, 0) + 1
+
+            except Exception as e:
+                print(f"Naver crawl error for '{keyword}': {e}")
+
+        for category, count in category_counts.items():
+            print(f"[{category}] {target_date}: {count} articles")
 
         self.db.commit()
         print(f"=== Naver {target_date}: {collected} articles ===")
@@ -0,0 +1,310 @@
+"""
+알림 전송 dispatcher (notification_deliveries outbox 소비)
+- 요청 처리 코드는 알림 + 전송 행을 같은 트랜잭션으로 INSERT만 하고 wake()로 깨움
+- 백그라운드 루프가 전송할 행을 임대(lease)로 가져와 WebSocket / Web Push로 전송
+- WebSocket / Web Push 행은 채널별 루프에서 따로 처리 (느린 Push가 WebSocket 알림을 막지 않음)
+- Web Push(blocking pywebpush)는 전용 스레드 풀에서 기기별로 병렬 전송하고, 끝나는 대로 결과 기록
+- 실패 시 지수 백오프로 재시도, 한도 초과 시 failed
+- 만료된 Push 구독(404/410)은 삭제 (해당 구독의 전송 행도 함께 삭제)
+- 여러 워커가 동시에 돌아도 FOR UPDATE SKIP LOCKED로 같은 행을 중복 처리하지 않음
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.notification import Notification
+from app.models.notification_delivery import NotificationDelivery, DeliveryChannel, DeliveryStatus
+from app.models.push_subscription import PushSubscription
+from app.services.push_service import PushService
+
+# 전송 결과
+SENT = "sent"
+EXPIRED = "expired"
+RETRY = "retry"
+FAILED = "failed"
+
+
+def push_url(notification: Notification) -> str:
+    """Push 알림 클릭 시 이동할 경로"""
+    if notification.related_type == "position" and notification.related_id:
+        return f"/positions/{notification.related_id}"
+    if notification.related_type == "discussion" and notification.related_id:
+        return f"/discussions/{notification.related_id}"
+    if notification.notification_type == "user_pending_approval":
+        return "/team"
+    return "/notifications"
+
+
+def ws_message(notification: Notification) -> Dict[str, Any]:
+    return {
+        "type": "notification",
+        "data": {
+            "id": notification.id,
+            "notification_type": notification.notification_type,
+            "title": notification.title,
+            "message": notification.message,
+            "related_type": notification.related_type,
+            "related_id": notification.related_id,
+            "is_read": False,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None
+        }
+    }
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.notification_retry_base * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.notification_retry_max))
+
+
+def batch_size(channel: str) -> int:
+    """채널별 한 번에 임대할 행 수
+
+    Push는 1건이 최대 push_timeout 걸리고 전송 스레드 수만큼만 병렬이므로,
+    임대(notification_lease_seconds)가 끝나기 전에 모두 전송/기록할 수 있는 만큼만 가져온다.
+    """
+    if channel == DeliveryChannel.WEBSOCKET.value:
+        return settings.notification_dispatch_batch
+    rounds = max(1, int(settings.notification_lease_seconds // settings.push_timeout) - 1)
+    return max(1, min(settings.notification_dispatch_batch, settings.notification_dispatch_workers * rounds))
+
+
+CHANNELS = (DeliveryChannel.WEBSOCKET.value, DeliveryChannel.PUSH.value)
+
+
+class NotificationDispatcher:
+    """채널별(websocket / push) 독립 루프 - 느린 Push 전송이 WebSocket 알림을 막지 않음
+
+    DB 작업(_claim/_record)과 Push 전송(blocking I/O)은 서로 다른 스레드 풀에서 실행한다.
+    """
+
+    def __init__(self):
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._push_executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Dict[str, asyncio.Event] = {}
+        self.sent = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if any(not task.done() for task in self._tasks):
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = {channel: asyncio.Event() for channel in CHANNELS}
+        self._db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify-db")
+        self._push_executor = ThreadPoolExecutor(
+            max_workers=settings.notification_dispatch_workers,
+            thread_name_prefix="notify-push"
+        )
+        self._tasks = [self._loop.create_task(self._run(channel)) for channel in CHANNELS]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        for executor in (self._push_executor, self._db_executor):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self._push_executor = None
+        self._db_executor = None
+
+    def wake(self) -> None:
+        """새 전송 행이 생겼음을 알림 (동기 API 스레드에서도 호출 가능)"""
+        loop, events = self._loop, list(self._wake.values())
+        if loop is None or not events or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for event in events:
+            if running is loop:
+                event.set()
+            else:
+                loop.call_soon_threadsafe(event.set)
+
+    async def _run(self, channel: str) -> None:
+        event = self._wake[channel]
+        while True:
+            try:
+                # 한 배치를 꽉 채웠으면 남은 행이 있을 수 있으므로 바로 다음 배치
+                if await self.dispatch_once(channel) >= batch_size(channel):
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"알림 전송 dispatcher 오류 ({channel}): {e}")
+            try:
+                await asyncio.wait_for(event.wait(), timeout=settings.notification_dispatch_interval)
+            except asyncio.TimeoutError:
+                pass
+            event.clear()
+
+    async def dispatch_once(self, channel: Optional[str] = None) -> int:
+        """전송할 행을 가져와 전송하고 결과 기록. 처리한 행 수 반환 (channel 생략 시 모든 채널)"""
+        if channel is None:
+            return sum([await self.dispatch_once(c) for c in CHANNELS])
+
+        loop = asyncio.get_running_loop()
+        jobs = await loop.run_in_executor(self._db_executor, self._claim, channel, batch_size(channel))
+        if not jobs:
+            return 0
+        if channel == DeliveryChannel.WEBSOCKET.value:
+            results = await asyncio.gather(*(self._deliver(job) for job in jobs))
+            await loop.run_in_executor(self._db_executor, self._record, results)
+        else:
+            # 끝나는 대로 기록 → 느린 기기가 있어도 나머지 행은 임대 만료 전에 확정
+            await asyncio.gather(*(self._deliver_and_record(job) for job in jobs))
+        return len(jobs)
+
+    async def _deliver_and_record(self, job: Dict[str, Any]) -> None:
+        result = await self._deliver(job)
+        await asyncio.get_running_loop().run_in_executor(self._db_executor, self._record, [result])
+
+    @staticmethod
+    def _claim(channel: str, limit: int) -> List[Dict[str, Any]]:
+        """전송 시점이 된 행을 임대 (attempts 증가 + next_attempt_at을 임대 만료 시각으로)
+
+        처리 중 프로세스가 죽으면 임대가 만료된 뒤 다른 워커가 다시 가져간다.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            rows = db.query(NotificationDelivery, Notification, PushSubscription).join(
+                Notification, Notification.id == NotificationDelivery.notification_id
+            ).outerjoin(
+                PushSubscription, PushSubscription.id == NotificationDelivery.subscription_id
+            ).filter(
+                NotificationDelivery.channel == channel,
+                NotificationDelivery.status == DeliveryStatus.PENDING.value,
+                NotificationDelivery.next_attempt_at <= now
+            ).order_by(
+                NotificationDelivery.id
+            ).limit(
+                limit
+            ).with_for_update(of=NotificationDelivery, skip_locked=True).all()
+
+            lease_until = now + timedelta(seconds=settings.notification_lease_seconds)
+            jobs = []
+            for delivery, notification, subscription in rows:
+                delivery.attempts += 1
+                delivery.next_attempt_at = lease_until
+                job = {
+                    "id": delivery.id,
+                    "channel": delivery.channel,
+                    "user_id": delivery.user_id,
+                    "attempts": delivery.attempts,
+                }
+                if delivery.channel == DeliveryChannel.PUSH.value:
+                    job["subscription_id"] = delivery.subscription_id
+                    job["subscription"] = PushSubscription(
+                        endpoint=subscription.endpoint,
+                        p256dh=subscription.p256dh,
+                        auth=subscription.auth,
+                    ) if subscription else None
+                    job["payload"] = PushService.build_payload(
+                        title=notification.title,
+                        body=notification.message or "",
+                        url=push_url(notification),
+                        notification_type=notification.notification_type,
+                        related_type=notification.related_type,
+                        related_id=notification.related_id,
+                    )
+                else:
+                    job["message"] = ws_message(notification)
+                jobs.append(job)
+
+            db.commit()
+            return jobs
+        finally:
+            db.close()
+
+    async def _deliver(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        try:
+            if job["channel"] == DeliveryChannel.WEBSOCKET.value:
+                from app.websocket import manager
+                await manager.send_personal_message(job["message"], job["user_id"])
+                return job, SENT, None
+
+            if job["subscription"] is None:
+                return job, EXPIRED, None
+            if not settings.vapid_public_key or not settings.vapid_private_key:
+                return job, FAILED, "VAPID 키가 설정되지 않음"
+
+            loop = asyncio.get_running_loop()
+            delivered = await loop.run_in_executor(
+                self._push_executor, PushService.deliver, job["subscription"], job["payload"]
+            )
+            return job, (SENT if delivered else EXPIRED), None
+        except ImportError as e:
+            return job, FAILED, str(e)
+        except Exception as e:
+            print(f"Web Push error for user {job['user_id']}: {e}")
+            return job, RETRY, str(e)[:1000]
+
+    def _record(self, results: List[Tuple[Dict[str, Any], str, Optional[str]]]) -> None:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            by_id = {job["id"]: (job, outcome, error) for job, outcome, error in results}
+            deliveries = db.query(NotificationDelivery).filter(
+                NotificationDelivery.id.in_(by_id.keys())
+            ).all()
+
+            expired_subscriptions = set()
+            for delivery in deliveries:
+                job, outcome, error = by_id[delivery.id]
+                if outcome == SENT:
+                    delivery.status = DeliveryStatus.SENT.value
+                    delivery.sent_at = now
+                    delivery.last_error = None
+                    self.sent += 1
+                elif outcome == EXPIRED:
+                    # 구독의 전송 행은 아래에서 한 번에 삭제
+                    if delivery.subscription_id:
+                        expired_subscriptions.add(delivery.subscription_id)
+                    else:
+                        db.delete(delivery)
+                elif outcome == RETRY and delivery.attempts < settings.notification_max_attempts:
+                    delivery.next_attempt_at = now + retry_delay(delivery.attempts)
+                    delivery.last_error = error
+                else:
+                    delivery.status = DeliveryStatus.FAILED.value
+                    delivery.last_error = error
+                    self.failed += 1
+
+            # 만료된 구독 정리 (남은 전송 행도 함께)
+            if expired_subscriptions:
+                db.query(NotificationDelivery).filter(
+                    NotificationDelivery.subscription_id.in_(expired_subscriptions)
+                ).delete(synchronize_session=False)
+                db.query(PushSubscription).filter(
+                    PushSubscription.id.in_(expired_subscriptions)
+                ).delete(synchronize_session=False)
+
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def purge(db, retention_days: int) -> int:
+        """보관 기간이 지난 완료/실패 전송 행 삭제"""
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        deleted = db.query(NotificationDelivery).filter(
+            NotificationDelivery.status.in_([DeliveryStatus.SENT.value, DeliveryStatus.FAILED.value]),
+            NotificationDelivery.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+# 싱글톤 인스턴스
+notification_dispatcher = NotificationDispatcher()
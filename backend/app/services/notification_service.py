@@ -1,10 +1,14 @@
-import asyncio
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
+from sqlalchemy import case, func, insert
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.notification import Notification
+from app.models.notification_delivery import NotificationDelivery, DeliveryChannel, DeliveryStatus
+from app.models.push_subscription import PushSubscription
 from app.models.user import User, UserRole
+from app.services.notification_dispatcher import notification_dispatcher
 
 
 class NotificationService:
@@ -20,87 +24,98 @@ class NotificationService:
         related_type: Optional[str] = None,
         related_id: Optional[int] = None
     ) -> Notification:
-        notification = Notification(
-            user_id=user_id,
+        return self.create_notifications(
+            [user_id],
             notification_type=notification_type,
             title=title,
             message=message,
             related_type=related_type,
             related_id=related_id
-        )
-        self.db.add(notification)
-        self.db.commit()
-        self.db.refresh(notification)
-
-        # WebSocket으로 실시간 알림 전송
-        self._broadcast_ws(notification)
-
-        # Web Push 알림 전송
-        self._send_web_push(notification)
-
-        return notification
-
-    def _broadcast_ws(self, notification: Notification):
-        """WebSocket으로 알림을 실시간 전송 (best-effort)"""
-        try:
-            from app.websocket import manager
-            message = {
-                "type": "notification",
-                "data": {
-                    "id": notification.id,
-                    "notification_type": notification.notification_type,
-                    "title": notification.title,
-                    "message": notification.message,
-                    "related_type": notification.related_type,
-                    "related_id": notification.related_id,
+        )[0]
+
+    def create_notifications(
+        self,
+        user_ids: Iterable[int],
+        notification_type: str,
+        title: str,
+        message: Optional[str] = None,
+        related_type: Optional[str] = None,
+        related_id: Optional[int] = None
+    ) -> List[Notification]:
+        """여러 사용자에게 같은 알림 생성 (모든 알림 생성 경로의 공통 진입점)
+
+        알림은 multi-row INSERT ... RETURNING 한 번으로 저장하고 (refresh 없음),
+        WebSocket/Web Push 전송 행도 같은 트랜잭션에 일괄 INSERT 한다.
+        실제 전송은 NotificationDispatcher가 수신자 전체를 한 배치로 처리.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+
+        now = datetime.utcnow()
+        notifications = self.db.scalars(
+            insert(Notification).returning(Notification, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": user_id,
+                    "notification_type": notification_type,
+                    "title": title,
+                    "message": message,
+                    "related_type": related_type,
+                    "related_id": related_id,
                     "is_read": False,
-                    "created_at": notification.created_at.isoformat() if notification.created_at else None
+                    "created_at": now
                 }
+                for user_id in user_ids
+            ]
+        ).all()
+
+        # 전송(WebSocket/Web Push)은 같은 트랜잭션에 outbox로만 기록
+        self._enqueue_deliveries(notifications, now)
+        self._add_unread(user_ids, 1)
+        self.db.commit()
+
+        notification_dispatcher.wake()
+        return notifications
+
+    def _enqueue_deliveries(self, notifications: List[Notification], now: datetime):
+        """알림별 전송 행 일괄 INSERT (WebSocket 1행 + Push 구독 기기별 1행). commit은 호출자가"""
+        deliveries = [
+            {
+                "notification_id": n.id,
+                "user_id": n.user_id,
+                "channel": DeliveryChannel.WEBSOCKET.value,
+                "subscription_id": None
             }
-            try:
-                # Python 3.10+: use get_running_loop() for async context
-                loop = asyncio.get_running_loop()
-                loop.create_task(manager.send_personal_message(message, notification.user_id))
-            except RuntimeError:
-                # No running loop - try get_event_loop for backward compatibility
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        loop.create_task(manager.send_personal_message(message, notification.user_id))
-                    else:
-                        # Run synchronously if no running loop
-                        asyncio.run(manager.send_personal_message(message, notification.user_id))
-                except Exception:
-                    pass  # 이벤트 루프 접근 실패 시 무시
-        except Exception as e:
-            print(f"WebSocket broadcast error: {e}")  # 디버깅을 위해 에러 출력
-
-    def _send_web_push(self, notification: Notification):
-        """Web Push로 알림 발송 (best-effort)"""
-        try:
-            from app.services.push_service import PushService
-            push_service = PushService(self.db)
-
-            # URL 결정
-            url = "/notifications"
-            if notification.related_type == "position" and notification.related_id:
-                url = f"/positions/{notification.related_id}"
-            elif notification.related_type == "discussion" and notification.related_id:
-                url = f"/discussions/{notification.related_id}"
-            elif notification.notification_type == "user_pending_approval":
-                url = "/team"
-
-            push_service.send_push(
-                user_id=notification.user_id,
-                title=notification.title,
-                body=notification.message or "",
-                url=url,
-                notification_type=notification.notification_type,
-                related_type=notification.related_type,
-                related_id=notification.related_id,
+            for n in notifications
+        ]
+
+        if settings.vapid_public_key and settings.vapid_private_key:
+            subscriptions: Dict[int, List[int]] = {}
+            for sub_id, user_id in self.db.query(PushSubscription.id, PushSubscription.user_id).filter(
+                PushSubscription.user_id.in_({n.user_id for n in notifications})
+            ).all():
+                subscriptions.setdefault(user_id, []).append(sub_id)
+
+            deliveries.extend(
+                {
+                    "notification_id": n.id,
+                    "user_id": n.user_id,
+                    "channel": DeliveryChannel.PUSH.value,
+                    "subscription_id": sub_id
+                }
+                for n in notifications
+                for sub_id in subscriptions.get(n.user_id, ())
+            )
+
+        for delivery in deliveries:
+            delivery.update(
+                status=DeliveryStatus.PENDING.value,
+                attempts=0,
+                next_attempt_at=now,
+                created_at=now
             )
-        except Exception as e:
-            print(f"Web Push error: {e}")
+        self.db.execute(insert(NotificationDelivery), deliveries)
 
     def create_notification_for_managers(
         self,
@@ -112,37 +127,33 @@ class NotificationService:
         exclude_user_id: Optional[int] = None
     ) -> List[Notification]:
         """모든 매니저와 어드민에게 알림 생성"""
-        managers = self.db.query(User).filter(
+        query = self.db.query(User.id).filter(
             User.role.in_([UserRole.MANAGER.value, UserRole.ADMIN.value]),
             User.is_active == True
-        ).all()
-
-        notifications = []
-        for mgr in managers:
-            if exclude_user_id and mgr.id == exclude_user_id:
-                continue
-            notification = Notification(
-                user_id=mgr.id,
-                notification_type=notification_type,
-                title=title,
-                message=message,
-                related_type=related_type,
-                related_id=related_id
-            )
-            self.db.add(notification)
-            notifications.append(notification)
-
-        self.db.commit()
+        )
+        if exclude_user_id:
+            query = query.filter(User.id != exclude_user_id)
 
-        # WebSocket으로 실시간 알림 전송 (best-effort)
-        for notification in notifications:
-            try:
-                self.db.refresh(notification)
-                self._broadcast_ws(notification)
-            except Exception as e:
-                print(f"Manager notification broadcast error (id={notification.id if hasattr(notification, 'id') else '?'}): {e}")
+        return self.create_notifications(
+            [user_id for user_id, in query.all()],
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            related_type=related_type,
+            related_id=related_id
+        )
 
-        return notifications
+    def _add_unread(self, user_ids: Iterable[int], delta: int):
+        """users.unread_notification_count 증감 (알림 변경과 같은 트랜잭션, commit은 호출자가)"""
+        if not delta:
+            return
+        count = User.unread_notification_count
+        new_value = count + delta if delta > 0 else case((count + delta > 0, count + delta), else_=0)
+        self.db.query(User).filter(User.id.in_(list(user_ids))).update(
+            # 카운터 변경으로 updated_at(onupdate)이 바뀌지 않도록 유지
+            {count: new_value, User.updated_at: User.updated_at},
+            synchronize_session=False
+        )
 
     def get_notifications(
         self,
@@ -153,32 +164,45 @@ class NotificationService:
     ) -> tuple[List[Notification], int, int]:
         """알림 목록 조회. (notifications, total, unread_count) 반환"""
         query = self.db.query(Notification).filter(Notification.user_id == user_id)
+        unread_count = self.get_unread_count(user_id)
 
         if unread_only:
             query = query.filter(Notification.is_read == False)
-
-        total = query.count()
-        unread_count = self.db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.is_read == False
-        ).count()
+            total = unread_count
+        else:
+            total = query.count()
 
         notifications = query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
 
         return notifications, total, unread_count
 
     def get_unread_count(self, user_id: int) -> int:
-        return self.db.query(Notification).filter(
-            Notification.user_id == user_id,
+        """읽지 않은 알림 수 (users 카운터 조회)"""
+        return self.db.query(User.unread_notification_count).filter(User.id == user_id).scalar() or 0
+
+    def recount_unread(self, user_id: Optional[int] = None) -> None:
+        """카운터를 실제 알림 기준으로 재계산 (부분 인덱스 ix_notifications_user_unread 사용)"""
+        unread = self.db.query(func.count(Notification.id)).filter(
+            Notification.user_id == User.id,
             Notification.is_read == False
-        ).count()
+        ).scalar_subquery()
+        query = self.db.query(User)
+        if user_id is not None:
+            query = query.filter(User.id == user_id)
+        query.update(
+            {User.unread_notification_count: unread, User.updated_at: User.updated_at},
+            synchronize_session=False
+        )
+        self.db.commit()
 
     def mark_as_read(self, notification_ids: List[int], user_id: int) -> int:
-        """알림을 읽음으로 표시. 업데이트된 알림 수 반환"""
+        """알림을 읽음으로 표시. 새로 읽음 처리된 알림 수 반환"""
         updated = self.db.query(Notification).filter(
             Notification.id.in_(notification_ids),
-            Notification.user_id == user_id
+            Notification.user_id == user_id,
+            Notification.is_read == False
         ).update({"is_read": True}, synchronize_session=False)
+        self._add_unread([user_id], -updated)
         self.db.commit()
         return updated
 
@@ -188,6 +212,8 @@ class NotificationService:
             Notification.user_id == user_id,
             Notification.is_read == False
         ).update({"is_read": True}, synchronize_session=False)
+        # 0으로 덮어쓰지 않고 처리한 만큼만 차감 (동시에 생성된 알림 보존)
+        self._add_unread([user_id], -updated)
         self.db.commit()
         return updated
 
@@ -199,15 +225,22 @@ class NotificationService:
         ).first()
         if not notification:
             return False
+        if not notification.is_read:
+            self._add_unread([user_id], -1)
         self.db.delete(notification)
         self.db.commit()
         return True
 
     def delete_all_notifications(self, user_id: int) -> int:
         """모든 알림 삭제"""
-        deleted = self.db.query(Notification).filter(
+        unread_deleted = self.db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).delete(synchronize_session=False)
+        deleted = unread_deleted + self.db.query(Notification).filter(
             Notification.user_id == user_id
         ).delete(synchronize_session=False)
+        self._add_unread([user_id], -unread_deleted)
         self.db.commit()
         return deleted
 
@@ -0,0 +1,201 @@
+"""
+매매 성과 롤업 (user_performance / ticker_performance)
+- 포지션 종료, 익절/손절 체결 기록 시 같은 트랜잭션에서 증분 갱신 (ON CONFLICT DO UPDATE)
+- 종료된 포지션의 매수금액/종목명이 수정되거나 포지션이 삭제되면 기존 기여분을 빼고 다시 더함
+- 통계 조회는 원본 포지션을 다시 집계하지 않고 롤업 행만 읽음
+
+백필 / 재계산:
+    python -m app.services.performance_service
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, case, insert
+from sqlalchemy.orm import Session
+
+from app.models.performance_rollup import UserPerformance, TickerPerformance, NO_OPENER
+from app.models.position import Position, PositionStatus
+from app.models.trading_plan import TradingPlan
+
+EXECUTION_PLAN_TYPES = ('take_profit', 'stop_loss')
+
+CLOSED_FIELDS = (
+    "closed_trades", "winning_trades", "losing_trades", "realized_pl", "total_volume",
+    "profit_rate_sum", "profit_rate_count", "holding_hours_sum",
+)
+EXECUTION_FIELDS = ("executions", "execution_pl")
+
+
+def _quantize(value, places: str) -> Decimal:
+    # 커밋 전 계산값을 컬럼 정밀도(Numeric scale)로 맞춰 재계산(rebuild) 결과와 일치시킴
+    return Decimal(value or 0).quantize(Decimal(places), rounding=ROUND_HALF_UP)
+
+
+def _closed_contribution(position: Position, sign: int = 1) -> Dict[str, object]:
+    profit_loss = position.profit_loss
+    return {
+        "closed_trades": sign,
+        "winning_trades": sign if profit_loss is not None and profit_loss > 0 else 0,
+        "losing_trades": sign if profit_loss is not None and profit_loss < 0 else 0,
+        "realized_pl": sign * _quantize(profit_loss, "0.01"),
+        "total_volume": sign * _quantize(position.total_buy_amount, "0.01"),
+        "profit_rate_sum": sign * _quantize(position.profit_rate, "0.0001"),
+        "profit_rate_count": sign if position.profit_rate is not None else 0,
+        "holding_hours_sum": sign * (position.holding_period_hours or 0),
+    }
+
+
+class PerformanceService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Incremental updates (호출한 쪽의 commit에 포함됨)
+    def add_closed_position(self, position: Position):
+        self._apply(position, _closed_contribution(position))
+
+    def remove_closed_position(self, position: Position):
+        self._apply(position, _closed_contribution(position, -1))
+
+    def add_execution(self, position: Position, profit_loss: Optional[float]):
+        """익절/손절 체결 1건의 실현손익 반영"""
+        if profit_loss is None:
+            return
+        self._apply(position, {"executions": 1, "execution_pl": _quantize(str(profit_loss), "0.01")})
+
+    def remove_position(self, position: Position):
+        """포지션 삭제 전 호출 - 종료 기여분과 체결 기여분을 모두 뺌"""
+        deltas: Dict[str, object] = {}
+        if position.status == PositionStatus.CLOSED.value:
+            deltas.update(_closed_contribution(position, -1))
+
+        executions, execution_pl = self.db.query(
+            func.count(TradingPlan.id),
+            func.coalesce(func.sum(TradingPlan.profit_loss), 0)
+        ).filter(
+            TradingPlan.position_id == position.id,
+            TradingPlan.record_type == 'execution',
+            TradingPlan.plan_type.in_(EXECUTION_PLAN_TYPES),
+            TradingPlan.profit_loss.isnot(None)
+        ).one()
+        if executions:
+            deltas.update({"executions": -executions, "execution_pl": -Decimal(execution_pl)})
+
+        if deltas:
+            self._apply(position, deltas, rename=False)
+
+    def _apply(self, position: Position, deltas: Dict[str, object], rename: bool = True):
+        # 반영 중인 포지션의 종목명/시장을 최신 값으로 (빼기만 할 때는 유지)
+        labels = {"ticker_name": position.ticker_name, "market": position.market} if rename else {}
+        self._upsert(UserPerformance, {"user_id": position.opened_by or NO_OPENER}, deltas)
+        self._upsert(TickerPerformance, {"ticker": position.ticker}, deltas, labels)
+
+    def _upsert(self, model, key: Dict[str, object], deltas: Dict[str, object], labels: Optional[Dict[str, object]] = None):
+        labels = labels or {}
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            self._upsert_orm(model, key, deltas, labels)
+            return
+
+        stmt = dialect_insert(model).values(**key, **labels, **deltas)
+        updates = {name: getattr(model, name) + stmt.excluded[name] for name in deltas}
+        updates.update({name: stmt.excluded[name] for name in labels})
+        updates["updated_at"] = func.now()
+        self.db.execute(stmt.on_conflict_do_update(index_elements=list(key), set_=updates))
+
+    def _upsert_orm(self, model, key, deltas, labels):
+        row = self.db.query(model).filter_by(**key).with_for_update().first()
+        if row is None:
+            row = model(**key, **{name: 0 for name in CLOSED_FIELDS + EXECUTION_FIELDS})
+            self.db.add(row)
+        for name, delta in deltas.items():
+            setattr(row, name, getattr(row, name) + delta)
+        for name, value in labels.items():
+            setattr(row, name, value)
+        self.db.flush()
+
+    # Reads
+    def get_user(self, user_id: int) -> Optional[UserPerformance]:
+        return self.db.get(UserPerformance, user_id)
+
+    # Rebuild
+    def rebuild(self) -> Tuple[int, int]:
+        """원본 포지션/체결 기록으로 두 롤업 테이블을 다시 채움 (백필, 불일치 복구용)"""
+        opener = func.coalesce(Position.opened_by, NO_OPENER)
+        user_rows = self._aggregate(opener)
+        ticker_rows = self._aggregate(
+            Position.ticker,
+            func.max(Position.ticker_name).label("ticker_name"),
+            func.max(Position.market).label("market")
+        )
+
+        self.db.query(UserPerformance).delete(synchronize_session=False)
+        self.db.query(TickerPerformance).delete(synchronize_session=False)
+        if user_rows:
+            self.db.execute(insert(UserPerformance), [
+                {"user_id": key, **values} for key, values in user_rows.items()
+            ])
+        if ticker_rows:
+            self.db.execute(insert(TickerPerformance), [
+                {"ticker": key, **values} for key, values in ticker_rows.items()
+            ])
+        self.db.commit()
+        return len(user_rows), len(ticker_rows)
+
+    def _aggregate(self, key_column, *label_columns) -> Dict[object, Dict[str, object]]:
+        def empty():
+            return {name: 0 for name in CLOSED_FIELDS + EXECUTION_FIELDS}
+
+        rows: Dict[object, Dict[str, object]] = {}
+        for row in self.db.query(
+            key_column.label("key"),
+            *label_columns,
+            func.count(Position.id).label("closed_trades"),
+            func.count(case((Position.profit_loss > 0, 1))).label("winning_trades"),
+            func.count(case((Position.profit_loss < 0, 1))).label("losing_trades"),
+            func.coalesce(func.sum(Position.profit_loss), 0).label("realized_pl"),
+            func.coalesce(func.sum(Position.total_buy_amount), 0).label("total_volume"),
+            func.coalesce(func.sum(Position.profit_rate), 0).label("profit_rate_sum"),
+            func.count(Position.profit_rate).label("profit_rate_count"),
+            func.coalesce(func.sum(Position.holding_period_hours), 0).label("holding_hours_sum"),
+        ).filter(
+            Position.status == PositionStatus.CLOSED.value
+        ).group_by(key_column).all():
+            values = rows[row.key] = empty()
+            values.update({name: value for name, value in row._asdict().items() if name != "key"})
+
+        for row in self.db.query(
+            key_column.label("key"),
+            *label_columns,
+            func.count(TradingPlan.id).label("executions"),
+            func.coalesce(func.sum(TradingPlan.profit_loss), 0).label("execution_pl"),
+        ).join(
+            Position, Position.id == TradingPlan.position_id
+        ).filter(
+            TradingPlan.record_type == 'execution',
+            TradingPlan.plan_type.in_(EXECUTION_PLAN_TYPES),
+            TradingPlan.profit_loss.isnot(None)
+        ).group_by(key_column).all():
+            values = rows.get(row.key)
+            if values is None:
+                values = rows[row.key] = empty()
+                values.update({name: getattr(row, name) for name in ("ticker_name", "market") if hasattr(row, name)})
+            values["executions"] = row.executions
+            values["execution_pl"] = row.execution_pl
+
+        return rows
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+    from app.models.push_subscription import PushSubscription  # noqa: F401 (User 관계 매핑용)
+
+    db = SessionLocal()
+    try:
+        users, tickers = PerformanceService(db).rebuild()
+        print(f"성과 롤업 재계산 완료: 사용자 {users}명, 종목 {tickers}개")
+    finally:
+        db.close()
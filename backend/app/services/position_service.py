@@ -9,6 +9,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from app.models.position import Position, PositionStatus
 from app.schemas.position import PositionCreate, PositionUpdate, PositionClose, PositionConfirmInfo
 from app.services.audit_service import AuditService
+from app.services.performance_service import PerformanceService
 from app.utils.converters import convert_targets
 
 
@@ -175,9 +176,17 @@ class PositionService:
         if "stop_loss_targets" in update_dict and update_dict["stop_loss_targets"]:
             update_dict["stop_loss_targets"] = convert_targets(update_dict["stop_loss_targets"])
 
+        # 종료된 포지션의 매수금액/종목명이 바뀌면 성과 롤업도 다시 반영
+        closed = position.status == PositionStatus.CLOSED.value
+        if closed:
+            PerformanceService(self.db).remove_closed_position(position)
+
         for key, value in update_dict.items():
             setattr(position, key, value)
 
+        if closed:
+            PerformanceService(self.db).add_closed_position(position)
+
         self.db.commit()
         self.db.refresh(position)
 
@@ -224,6 +233,9 @@ class PositionService:
             delta = closed - opened
             position.holding_period_hours = int(delta.total_seconds() / 3600)
 
+        # 성과 롤업 증분 갱신 (같은 트랜잭션)
+        PerformanceService(self.db).add_closed_position(position)
+
         self.db.commit()
         self.db.refresh(position)
 
@@ -570,6 +582,10 @@ class PositionService:
                 'new': confirm_data.ticker_name
             }
 
+        closed = position.status == PositionStatus.CLOSED.value
+        if closed:
+            PerformanceService(self.db).remove_closed_position(position)
+
         # 정보 업데이트
         position.average_buy_price = confirm_data.average_buy_price
         position.total_quantity = confirm_data.total_quantity
@@ -592,6 +608,9 @@ class PositionService:
             changes['is_info_confirmed'] = {'old': False, 'new': True}
         position.is_info_confirmed = True
 
+        if closed:
+            PerformanceService(self.db).add_closed_position(position)
+
         self.db.commit()
         self.db.refresh(position)
 
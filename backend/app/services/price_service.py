@@ -6,70 +6,77 @@
 """
 import asyncio
 from decimal import Decimal
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import httpx
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
 import yfinance as yf
 from functools import lru_cache
 
 from app.config import settings
+from app.database import SessionLocal
+from app.services.quote_cache import quote_cache
+from app.services.http_client import http_client
+from app.services.krx_symbol_registry import krx_symbol_registry
+from app.services.candle_store import candle_store
+from app.services.binance_stream import binance_stream, to_binance_symbol
 
 
 class PriceService:
     """통합 시세 조회 서비스"""
 
-    # 캐시 (1분)
-    _cache: Dict[str, tuple[Decimal, datetime]] = {}
-    _cache_duration = timedelta(minutes=1)
+    # 시세 캐시 (모든 인스턴스 공유)
+    _cache = quote_cache
 
     def __init__(self):
         pass
 
     async def get_price(self, ticker: str, market: str) -> Optional[Decimal]:
-        """시세 조회 (통합)"""
-        cache_key = f"{market}:{ticker}"
-
-        # 캐시 확인
-        if cache_key in self._cache:
-            price, cached_at = self._cache[cache_key]
-            if datetime.now() - cached_at < self._cache_duration:
-                return price
-
-        # 시장별 조회
-        price = None
+        """시세 조회 (통합, 캐시 경유)"""
+        return await self._cache.get(
+            market, ticker,
+            lambda: self._fetch_price(ticker, market)
+        )
+
+    async def _fetch_price(self, ticker: str, market: str) -> Optional[Decimal]:
+        """시장별 upstream 시세 조회 (캐시 미경유)"""
         if market in ["KOSPI", "KOSDAQ"]:
-            price = await self.get_korean_price(ticker)
+            return await self.get_korean_price(ticker)
         elif market in ["NASDAQ", "NYSE"]:
-            price = await self.get_us_price(ticker)
+            return await self.get_us_price(ticker)
         elif market == "CRYPTO":
-            price = await self.get_crypto_price(ticker)
-
-        # 캐시 저장
-        if price is not None:
-            self._cache[cache_key] = (price, datetime.now())
+            return await self.get_crypto_price(ticker)
+        return None
 
-        return price
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """시세 캐시 적중/미스/합침 카운터"""
+        return self._cache.stats()
 
     async def get_korean_price(self, ticker: str) -> Optional[Decimal]:
         """한국 주식 시세 (Yahoo Finance 사용)"""
         try:
-            # Yahoo Finance 티커 형식으로 변환
-            yahoo_ticker = f"{ticker}.KS"
-
-            loop = asyncio.get_event_loop()
-            price = await loop.run_in_executor(None, self._fetch_yfinance_price, yahoo_ticker)
-
-            # .KS로 안되면 .KQ로 시도
-            if price is None:
-                yahoo_ticker = f"{ticker}.KQ"
-                price = await loop.run_in_executor(None, self._fetch_yfinance_price, yahoo_ticker)
-
+            _, price = await self._run_korean(self._fetch_yfinance_price, ticker)
             return price
         except Exception as e:
             print(f"한국 주식 시세 조회 오류: {e}")
 
         return None
 
+    async def _run_korean(self, fetch, ticker: str, *args) -> tuple[Optional[str], Any]:
+        """한국 종목을 Yahoo 심볼로 조회 (동기 fetch를 executor에서 실행)
+
+        레지스트리에 확정된 심볼이 있으면 한 번만 조회하고,
+        없으면 .KS → .KQ 순으로 시도한 뒤 성공한 심볼을 기록한다.
+        """
+        loop = asyncio.get_event_loop()
+        for yahoo_ticker in krx_symbol_registry.candidates(ticker):
+            result = await loop.run_in_executor(None, fetch, yahoo_ticker, *args)
+            if result is not None:
+                if krx_symbol_registry.resolve(ticker) is None:
+                    await loop.run_in_executor(None, krx_symbol_registry.remember, ticker, yahoo_ticker)
+                return yahoo_ticker, result
+        return None, None
+
     async def lookup_ticker(self, ticker: str, market: str) -> Optional[Dict[str, Any]]:
         """종목 코드로 종목명과 현재가 조회"""
         if market in ["KOSPI", "KOSDAQ"]:
@@ -83,16 +90,7 @@ class PriceService:
     async def _lookup_korean(self, ticker: str) -> Optional[Dict[str, Any]]:
         """한국 주식 종목명 조회 (Yahoo Finance 사용)"""
         try:
-            # Yahoo Finance 티커 형식으로 변환
-            yahoo_ticker = f"{ticker}.KS"
-
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._fetch_yfinance_info, yahoo_ticker)
-
-            # .KS로 안되면 .KQ로 시도
-            if result is None:
-                yahoo_ticker = f"{ticker}.KQ"
-                result = await loop.run_in_executor(None, self._fetch_yfinance_info, yahoo_ticker)
+            _, result = await self._run_korean(self._fetch_yfinance_info, ticker)
 
             if result:
                 result["ticker"] = ticker  # 원래 티커로 복원
@@ -142,38 +140,37 @@ class PriceService:
             if not symbol.endswith("USDT"):
                 symbol = f"{symbol}USDT"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.binance.com/api/v3/ticker/price",
-                    params={"symbol": symbol}
-                )
+            response = await http_client.get(
+                "https://api.binance.com/api/v3/ticker/price",
+                params={"symbol": symbol}
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    price_str = data.get("price", "0")
-
-                    # 일반적인 암호화폐 이름 매핑
-                    crypto_names = {
-                        "BTC": "비트코인",
-                        "ETH": "이더리움",
-                        "XRP": "리플",
-                        "SOL": "솔라나",
-                        "DOGE": "도지코인",
-                        "ADA": "에이다",
-                        "AVAX": "아발란체",
-                        "MATIC": "폴리곤",
-                        "DOT": "폴카닷",
-                        "LINK": "체인링크"
-                    }
-
-                    base_symbol = ticker.upper().replace("USDT", "")
-                    name = crypto_names.get(base_symbol, base_symbol)
-
-                    return {
-                        "ticker": ticker.upper(),
-                        "name": name,
-                        "price": float(price_str)
-                    }
+            if response.status_code == 200:
+                data = response.json()
+                price_str = data.get("price", "0")
+
+                # 일반적인 암호화폐 이름 매핑
+                crypto_names = {
+                    "BTC": "비트코인",
+                    "ETH": "이더리움",
+                    "XRP": "리플",
+                    "SOL": "솔라나",
+                    "DOGE": "도지코인",
+                    "ADA": "에이다",
+                    "AVAX": "아발란체",
+                    "MATIC": "폴리곤",
+                    "DOT": "폴카닷",
+                    "LINK": "체인링크"
+                }
+
+                base_symbol = ticker.upper().replace("USDT", "")
+                name = crypto_names.get(base_symbol, base_symbol)
+
+                return {
+                    "ticker": ticker.upper(),
+                    "name": name,
+                    "price": float(price_str)
+                }
         except Exception as e:
             print(f"암호화폐 조회 오류: {e}")
         return None
@@ -204,47 +201,218 @@ class PriceService:
         return None
 
     async def get_crypto_price(self, ticker: str) -> Optional[Decimal]:
-        """암호화폐 시세 (Binance)"""
-        try:
-            # USDT 페어로 변환 (예: BTC -> BTCUSDT)
-            symbol = ticker.upper()
-            if not symbol.endswith("USDT"):
-                symbol = f"{symbol}USDT"
+        """암호화폐 시세 (Binance, 실시간 스트림 수신값 우선)"""
+        price = binance_stream.get_price(ticker)
+        if price is not None:
+            return price
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.binance.com/api/v3/ticker/price",
-                    params={"symbol": symbol}
-                )
+        try:
+            symbol = to_binance_symbol(ticker)
+            response = await http_client.get(
+                "https://api.binance.com/api/v3/ticker/price",
+                params={"symbol": symbol}
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    price_str = data.get("price", "0")
-                    return Decimal(price_str)
+            if response.status_code == 200:
+                data = response.json()
+                price_str = data.get("price", "0")
+                return Decimal(price_str)
         except Exception as e:
             print(f"암호화폐 시세 조회 오류: {e}")
 
         return None
 
-    async def get_multiple_prices(self, positions: list) -> Dict[int, Dict[str, Any]]:
-        """여러 포지션의 시세를 한번에 조회"""
-        results = {}
+    async def get_prices(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Decimal]]:
+        """여러 종목 시세 일괄 조회 (캐시 경유)
 
-        tasks = []
-        for pos in positions:
-            tasks.append(self._get_position_price_info(pos))
+        Args:
+            pairs: [(ticker, market), ...]
+
+        Returns:
+            {(ticker, market): price}
+        """
+        if not pairs:
+            return {}
+        cached = await self._cache.get_many(
+            [(market, ticker) for ticker, market in pairs],
+            self._fetch_prices_batch
+        )
+        return {(ticker, market): cached.get((market, ticker)) for ticker, market in pairs}
+
+    async def refresh_prices(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Decimal]]:
+        """여러 종목 시세를 캐시 TTL과 무관하게 새로 조회 (결과는 캐시에도 반영)
+
+        Args:
+            pairs: [(ticker, market), ...]
+
+        Returns:
+            {(ticker, market): price}
+        """
+        if not pairs:
+            return {}
+        fetched = await self._cache.refresh_many(
+            [(market, ticker) for ticker, market in pairs],
+            self._fetch_prices_batch
+        )
+        return {(ticker, market): fetched.get((market, ticker)) for ticker, market in pairs}
+
+    async def _fetch_prices_batch(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Decimal]:
+        """시장별로 묶어서 upstream 일괄 조회 (캐시 미경유)
+
+        - 미국/한국 주식: yfinance 일괄 다운로드
+        - 암호화폐: Binance 전체 시세 1회 조회
+
+        Args:
+            pairs: [(market, ticker), ...]
+        """
+        korean = [t for m, t in pairs if m in ["KOSPI", "KOSDAQ"]]
+        us = [t for m, t in pairs if m in ["NASDAQ", "NYSE"]]
+        crypto = [t for m, t in pairs if m == "CRYPTO"]
 
-        price_infos = await asyncio.gather(*tasks, return_exceptions=True)
+        korean_prices, us_prices, crypto_prices = await asyncio.gather(
+            self._get_korean_prices_batch(korean),
+            self._get_us_prices_batch(us),
+            self._get_crypto_prices_batch(crypto),
+        )
 
-        for pos, info in zip(positions, price_infos):
-            if isinstance(info, Exception):
-                results[pos.id] = {"error": str(info)}
+        results = {}
+        for market, ticker in pairs:
+            if market in ["KOSPI", "KOSDAQ"]:
+                price = korean_prices.get(ticker)
+            elif market in ["NASDAQ", "NYSE"]:
+                price = us_prices.get(ticker)
+            elif market == "CRYPTO":
+                price = crypto_prices.get(ticker)
             else:
-                results[pos.id] = info
+                price = None
+            if price is not None:
+                results[(market, ticker)] = price
+        return results
+
+    async def _get_korean_prices_batch(self, tickers: List[str]) -> Dict[str, Decimal]:
+        """한국 주식 일괄 시세
+
+        레지스트리로 심볼이 확정된 종목은 한 번에 조회하고,
+        미확정 종목만 .KS → .KQ 순으로 일괄 재조회한다.
+        """
+        if not tickers:
+            return {}
+        try:
+            loop = asyncio.get_event_loop()
+            symbols = {t: krx_symbol_registry.resolve(t) for t in tickers}
+            unresolved = [t for t, symbol in symbols.items() if symbol is None]
+
+            first = {t: symbol or f"{t}.KS" for t, symbol in symbols.items()}
+            bulk = await loop.run_in_executor(
+                None, self._fetch_yfinance_prices_bulk, list(first.values())
+            )
+            prices = {t: bulk[symbol] for t, symbol in first.items() if symbol in bulk}
+            found = {t: first[t] for t in unresolved if t in prices}
+
+            remaining = [t for t in unresolved if t not in prices]
+            if remaining:
+                kq = await loop.run_in_executor(
+                    None, self._fetch_yfinance_prices_bulk, [f"{t}.KQ" for t in remaining]
+                )
+                for t in remaining:
+                    if f"{t}.KQ" in kq:
+                        prices[t] = kq[f"{t}.KQ"]
+                        found[t] = f"{t}.KQ"
+
+            for t, symbol in found.items():
+                await loop.run_in_executor(None, krx_symbol_registry.remember, t, symbol)
+            return prices
+        except Exception as e:
+            print(f"한국 주식 일괄 시세 조회 오류: {e}")
+        return {}
+
+    async def _get_us_prices_batch(self, tickers: List[str]) -> Dict[str, Decimal]:
+        """미국 주식 일괄 시세 (Yahoo Finance)"""
+        if not tickers:
+            return {}
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._fetch_yfinance_prices_bulk, tickers)
+        except Exception as e:
+            print(f"미국 주식 일괄 시세 조회 오류: {e}")
+        return {}
+
+    def _fetch_yfinance_prices_bulk(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """Yahoo Finance 일괄 다운로드로 최근 종가(장중에는 현재가) 조회 (동기)"""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        data = yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+            threads=True,
+        )
+        if data is None or data.empty:
+            return {}
+
+        prices = {}
+        if isinstance(data.columns, pd.MultiIndex):
+            available = set(data.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol not in available:
+                    continue
+                closes = data[symbol]["Close"].dropna()
+                if not closes.empty:
+                    prices[symbol] = Decimal(str(float(closes.iloc[-1])))
+        elif len(symbols) == 1:
+            closes = data["Close"].dropna()
+            if not closes.empty:
+                prices[symbols[0]] = Decimal(str(float(closes.iloc[-1])))
+        return prices
+
+    async def _get_crypto_prices_batch(self, tickers: List[str]) -> Dict[str, Decimal]:
+        """암호화폐 일괄 시세 (스트림 수신값 우선, 나머지는 Binance 전체 시세 1회 조회)"""
+        prices = {}
+        for ticker in tickers:
+            price = binance_stream.get_price(ticker)
+            if price is not None:
+                prices[ticker] = price
+        tickers = [t for t in tickers if t not in prices]
+        if not tickers:
+            return prices
+        try:
+            response = await http_client.get(
+                "https://api.binance.com/api/v3/ticker/price",
+                timeout=10.0
+            )
+
+            if response.status_code == 200:
+                all_prices = {item["symbol"]: item["price"] for item in response.json()}
+                for ticker in tickers:
+                    symbol = to_binance_symbol(ticker)
+                    if symbol in all_prices:
+                        prices[ticker] = Decimal(all_prices[symbol])
+        except Exception as e:
+            print(f"암호화폐 일괄 시세 조회 오류: {e}")
+        return prices
+
+    async def get_multiple_prices(self, positions: list) -> Dict[int, Dict[str, Any]]:
+        """여러 포지션의 시세를 한번에 조회 (시장별 일괄 조회)"""
+        try:
+            prices = await self.get_prices([(pos.ticker, pos.market) for pos in positions])
+        except Exception as e:
+            return {pos.id: {"error": str(e)} for pos in positions}
+
+        results = {}
+        for pos in positions:
+            try:
+                results[pos.id] = self.build_position_price_info(pos, prices.get((pos.ticker, pos.market)))
+            except Exception as e:
+                results[pos.id] = {"error": str(e)}
 
         return results
 
-    async def _get_position_price_info(self, position) -> Dict[str, Any]:
+    def build_position_price_info(self, position, current_price: Optional[Decimal]) -> Dict[str, Any]:
         """포지션의 현재가 및 평가 정보
 
         수익률 계산:
@@ -253,8 +421,6 @@ class PriceService:
         - 총 손익 = 실현 손익 + 미실현 손익
         - 수익률 = 총 손익 / 총 매입금액
         """
-        current_price = await self.get_price(position.ticker, position.market)
-
         if current_price is None:
             return {
                 "current_price": None,
@@ -290,7 +456,7 @@ class PriceService:
 
     # ========== 캔들 데이터 API ==========
 
-    async def get_candles(self, ticker: str, market: str, timeframe: str = "1d", limit: int = 100, before: int = None) -> Optional[Dict[str, Any]]:
+    async def get_candles(self, ticker: str, market: str, timeframe: str = "1d", limit: int = 100, before: int = None, columnar: bool = False) -> Optional[Dict[str, Any]]:
         """캔들(OHLCV) 데이터 조회
 
         Args:
@@ -299,140 +465,137 @@ class PriceService:
             timeframe: 타임프레임 (1d, 1w, 1M, 1h)
             limit: 가져올 캔들 수
             before: 이 타임스탬프 이전의 데이터만 조회 (lazy loading용)
+            columnar: True면 candles를 필드별 배열({time: [...], open: [...], ...})로 반환
         """
         if market in ["KOSPI", "KOSDAQ"]:
-            return await self._get_korean_candles(ticker, timeframe, limit, before)
+            return await self._get_korean_candles(ticker, timeframe, limit, before, columnar)
         elif market in ["NASDAQ", "NYSE"]:
-            return await self._get_us_candles(ticker, timeframe, limit, before)
+            return await self._get_us_candles(ticker, timeframe, limit, before, columnar)
         elif market == "CRYPTO":
-            return await self._get_crypto_candles(ticker, timeframe, limit, before)
+            return await self._get_crypto_candles(ticker, timeframe, limit, before, columnar)
         return None
 
-    async def _get_korean_candles(self, ticker: str, timeframe: str, limit: int, before: int = None) -> Optional[Dict[str, Any]]:
+    async def _get_korean_candles(self, ticker: str, timeframe: str, limit: int, before: int = None, columnar: bool = False) -> Optional[Dict[str, Any]]:
         """한국 주식 캔들 데이터 (Yahoo Finance 사용)"""
         try:
-            # Yahoo Finance 티커 형식으로 변환 (KOSPI: .KS, KOSDAQ: .KQ)
-            # 일단 .KS로 시도하고 안되면 .KQ로 시도
-            yahoo_ticker = f"{ticker}.KS"
-
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._fetch_yfinance_candles,
-                yahoo_ticker, timeframe, limit, before
+            # Yahoo Finance 티커 형식 (KOSPI: .KS, KOSDAQ: .KQ) - 레지스트리로 확정
+            yahoo_ticker, result = await self._run_korean(
+                self._fetch_yfinance_candles, ticker, timeframe, limit, before, columnar
             )
 
-            # .KS로 안되면 .KQ로 시도
-            if result is None:
-                yahoo_ticker = f"{ticker}.KQ"
-                result = await loop.run_in_executor(
-                    None,
-                    self._fetch_yfinance_candles,
-                    yahoo_ticker, timeframe, limit, before
-                )
-
             if result:
                 result["ticker"] = ticker  # 원래 티커로 복원
-                result["market"] = "KOSPI"
+                result["market"] = "KOSDAQ" if yahoo_ticker.endswith(".KQ") else "KOSPI"
 
             return result
         except Exception as e:
             print(f"한국 주식 캔들 조회 오류: {e}")
         return None
 
-    async def _get_us_candles(self, ticker: str, timeframe: str, limit: int, before: int = None) -> Optional[Dict[str, Any]]:
+    async def _get_us_candles(self, ticker: str, timeframe: str, limit: int, before: int = None, columnar: bool = False) -> Optional[Dict[str, Any]]:
         """미국 주식 캔들 데이터 (Yahoo Finance)"""
         try:
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
                 None,
                 self._fetch_yfinance_candles,
-                ticker, timeframe, limit, before
+                ticker, timeframe, limit, before, columnar
             )
             return result
         except Exception as e:
             print(f"미국 주식 캔들 조회 오류: {e}")
         return None
 
-    def _fetch_yfinance_candles(self, ticker: str, timeframe: str, limit: int, before: int = None) -> Optional[Dict[str, Any]]:
-        """Yahoo Finance에서 캔들 데이터 조회 (동기)
+    def _yf_candle_params(self, timeframe: str) -> tuple[str, str]:
+        """타임프레임 → (yfinance interval, 최초 조회 기간)"""
+        if timeframe in ["1d", "day"]:
+            return "1d", "1y"
+        elif timeframe in ["1w", "week"]:
+            return "1wk", "5y"
+        elif timeframe in ["1M", "month"]:
+            return "1mo", "max"
+        elif timeframe in ["1h", "hour"]:
+            return "1h", "2mo"
+        return "1d", "1y"
+
+    def _fetch_yfinance_candles(self, ticker: str, timeframe: str, limit: int, before: int = None, columnar: bool = False) -> Optional[Dict[str, Any]]:
+        """캔들 데이터 조회 (로컬 저장소 우선, 동기)
+
+        - 처음 보는 시리즈: 기본 기간만 upstream에서 받아 저장
+        - 최근 구간이 오래됨: 마지막 캔들 이후만 upstream에서 받아 갱신
+        - before 이전 로컬 캔들이 부족함: 과거 구간을 한 번만 받아 채움
+        - 응답은 항상 로컬 범위 조회로 생성
 
         Args:
-            ticker: 종목 코드
+            ticker: Yahoo Finance 심볼
             timeframe: 타임프레임
             limit: 가져올 캔들 수
-            before: 이 타임스탬프 이전의 데이터만 필터링 (lazy loading용)
+            before: 이 타임스탬프 이전의 데이터만 조회 (lazy loading용)
+            columnar: True면 필드별 배열로 반환
         """
+        interval, period = self._yf_candle_params(timeframe)
+        db = SessionLocal()
         try:
-            stock = yf.Ticker(ticker)
-
-            # before가 있으면 더 많은 데이터를 가져와서 필터링
-            # 타임프레임에 따른 기간 설정
-            if timeframe in ["1d", "day"]:
-                # before가 있으면 더 긴 기간 요청
-                if before:
-                    period = "max"
+            with candle_store.lock(ticker, interval):
+                series = candle_store.get_series(db, ticker, interval)
+                stock = yf.Ticker(ticker)
+
+                if series is None:
+                    # 최초 조회 - before가 있으면 전체 기간
+                    full = bool(before) or period == "max"
+                    hist = stock.history(period=self._history_period(interval) if full else period, interval=interval)
+                    if hist.empty:
+                        return None
+
+                    # 종목명 조회 (시리즈 생성 시 1회)
+                    info = stock.info
+                    name = info.get("shortName") or info.get("longName") or ticker if info else ticker
+
+                    series = candle_store.save(
+                        db, ticker, interval, self._frame_to_candles(hist),
+                        name=name, history_complete=full
+                    )
                 else:
-                    period = "1y"
-                interval = "1d"
-            elif timeframe in ["1w", "week"]:
-                period = "max" if before else "5y"
-                interval = "1wk"
-            elif timeframe in ["1M", "month"]:
-                period = "max"
-                interval = "1mo"
-            elif timeframe in ["1h", "hour"]:
-                period = "2mo"
-                interval = "1h"
-            else:
-                period = "2y" if before else "1y"
-                interval = "1d"
-
-            hist = stock.history(period=period, interval=interval)
-
-            if hist.empty:
-                return None
-
-            # 종목명 조회
-            info = stock.info
-            name = info.get("shortName") or info.get("longName") or ticker if info else ticker
-
-            candles = []
-            for idx, row in hist.iterrows():
-                timestamp = int(idx.timestamp())
-
-                # before 필터링: before보다 오래된 데이터만 포함
-                if before and timestamp >= before:
-                    continue
-
-                open_price = float(row["Open"])
-                high_price = float(row["High"])
-                low_price = float(row["Low"])
-                close_price = float(row["Close"])
-
-                # Yahoo Finance 버그: 진행 중인 주/월봉의 Low가 0으로 반환되는 경우 수정
-                if low_price <= 0 or low_price < min(open_price, close_price) * 0.1:
-                    low_price = min(open_price, close_price)
-
-                # High도 비정상적인 경우 수정
-                if high_price <= 0:
-                    high_price = max(open_price, close_price)
-
-                candles.append({
-                    "time": timestamp,
-                    "open": open_price,
-                    "high": high_price,
-                    "low": low_price,
-                    "close": close_price,
-                    "volume": float(row["Volume"])
-                })
-
-            # limit 적용 (가장 최근 데이터 기준)
-            if len(candles) > limit:
-                candles = candles[-limit:]
+                    # upstream 실패(rate limit 등)는 로컬 캔들로 응답하고 다음 요청에서 다시 시도
+                    if candle_store.needs_refresh(series) and series.last_time:
+                        # 최근 구간 갱신 (진행 중인 캔들 포함)
+                        try:
+                            hist = stock.history(
+                                start=datetime.fromtimestamp(series.last_time, tz=timezone.utc),
+                                interval=interval
+                            )
+                        except Exception as e:
+                            print(f"yfinance 캔들 갱신 오류 ({ticker} {interval}): {e}")
+                        else:
+                            series = candle_store.save(db, ticker, interval, self._frame_to_candles(hist))
+
+                    if before and not series.history_complete and candle_store.backfill_due(ticker, interval):
+                        local = candle_store.query(db, ticker, interval, limit, before)
+                        if len(local) < limit:
+                            # 과거 구간 채우기 (시리즈당 1회, 실패/빈 결과면 일정 시간 뒤 재시도)
+                            try:
+                                hist = stock.history(period=self._history_period(interval), interval=interval)
+                            except Exception as e:
+                                print(f"yfinance 과거 캔들 조회 오류 ({ticker} {interval}): {e}")
+                                hist = None
+                            if hist is None or hist.empty:
+                                candle_store.defer_backfill(ticker, interval)
+                            else:
+                                candles = [
+                                    c for c in self._frame_to_candles(hist)
+                                    if series.first_time is None or c["time"] < series.first_time
+                                ]
+                                series = candle_store.save(
+                                    db, ticker, interval, candles,
+                                    history_complete=True, refreshed=False
+                                )
+
+                candles = candle_store.query(db, ticker, interval, limit, before, columnar=columnar)
+                name = series.name or ticker
 
             # 더 이상 데이터가 없는지 표시
-            has_more = len(candles) == limit
+            count = len(candles["time"]) if columnar else len(candles)
+            has_more = count == limit
 
             return {
                 "ticker": ticker,
@@ -442,10 +605,62 @@ class PriceService:
                 "has_more": has_more
             }
         except Exception as e:
+            db.rollback()
             print(f"yfinance 캔들 조회 오류: {e}")
+        finally:
+            db.close()
         return None
 
-    async def _get_crypto_candles(self, ticker: str, timeframe: str, limit: int, before: int = None) -> Optional[Dict[str, Any]]:
+    def _history_period(self, interval: str) -> str:
+        """과거 구간 전체 조회 기간 (yfinance 시간봉은 최근 730일까지만 제공)"""
+        return "730d" if interval == "1h" else "max"
+
+    def _frame_to_columns(self, hist: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """yfinance history DataFrame → 컬럼 배열 (벡터 연산)"""
+        if hist.empty:
+            # yfinance 빈 결과(utils.empty_df)는 DatetimeIndex가 아님
+            return {
+                field: np.empty(0, dtype=np.int64 if field == "time" else np.float64)
+                for field in ("time", "open", "high", "low", "close", "volume")
+            }
+        hist = hist.dropna(subset=["Open", "High", "Low", "Close"])
+
+        index = hist.index if hist.index.tz is not None else hist.index.tz_localize("UTC")
+        times = ((index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        open_ = hist["Open"].to_numpy(dtype=np.float64)
+        high = hist["High"].to_numpy(dtype=np.float64)
+        low = hist["Low"].to_numpy(dtype=np.float64)
+        close = hist["Close"].to_numpy(dtype=np.float64)
+        volume = hist["Volume"].fillna(0).to_numpy(dtype=np.float64)
+
+        body_low = np.minimum(open_, close)
+        body_high = np.maximum(open_, close)
+
+        # Yahoo Finance 버그: 진행 중인 주/월봉의 Low가 0으로 반환되는 경우 수정
+        low = np.where((low <= 0) | (low < body_low * 0.1), body_low, low)
+
+        # High도 비정상적인 경우 수정
+        high = np.where(high <= 0, body_high, high)
+
+        return {
+            "time": times,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+        }
+
+    def _frame_to_candles(self, hist: pd.DataFrame) -> List[Dict[str, Any]]:
+        """yfinance history DataFrame → 캔들 리스트"""
+        columns = self._frame_to_columns(hist)
+        keys = list(columns.keys())
+        return [
+            dict(zip(keys, values))
+            for values in zip(*(columns[k].tolist() for k in keys))
+        ]
+
+    async def _get_crypto_candles(self, ticker: str, timeframe: str, limit: int, before: int = None, columnar: bool = False) -> Optional[Dict[str, Any]]:
         """암호화폐 캔들 데이터 (Binance)"""
         try:
             symbol = ticker.upper()
@@ -470,42 +685,49 @@ class PriceService:
             if before:
                 params["endTime"] = before * 1000
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.binance.com/api/v3/klines",
-                    params=params,
-                    timeout=10.0
-                )
+            response = await http_client.get(
+                "https://api.binance.com/api/v3/klines",
+                params=params,
+                timeout=10.0
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # 암호화폐 이름
-                    crypto_names = {
-                        "BTC": "비트코인", "ETH": "이더리움", "XRP": "리플",
-                        "SOL": "솔라나", "DOGE": "도지코인", "ADA": "에이다"
-                    }
-                    base_symbol = symbol.replace("USDT", "")
-                    name = crypto_names.get(base_symbol, base_symbol)
-
-                    candles = []
-                    for item in data:
-                        candles.append({
-                            "time": int(item[0] / 1000),  # ms -> s
-                            "open": float(item[1]),
-                            "high": float(item[2]),
-                            "low": float(item[3]),
-                            "close": float(item[4]),
-                            "volume": float(item[5])
-                        })
-
-                    return {
-                        "ticker": symbol,
-                        "name": name,
-                        "market": "CRYPTO",
-                        "candles": candles,
-                        "has_more": len(candles) == limit
-                    }
+            if response.status_code == 200:
+                data = response.json()
+
+                # 암호화폐 이름
+                crypto_names = {
+                    "BTC": "비트코인", "ETH": "이더리움", "XRP": "리플",
+                    "SOL": "솔라나", "DOGE": "도지코인", "ADA": "에이다"
+                }
+                base_symbol = symbol.replace("USDT", "")
+                name = crypto_names.get(base_symbol, base_symbol)
+
+                # klines: [open_time(ms), open, high, low, close, volume, ...] - 컬럼 단위 변환
+                klines = np.array([item[:6] for item in data], dtype=np.float64).reshape(-1, 6)
+                columns = {
+                    "time": (klines[:, 0] // 1000).astype(np.int64).tolist(),  # ms -> s
+                    "open": klines[:, 1].tolist(),
+                    "high": klines[:, 2].tolist(),
+                    "low": klines[:, 3].tolist(),
+                    "close": klines[:, 4].tolist(),
+                    "volume": klines[:, 5].tolist(),
+                }
+
+                if columnar:
+                    candles = columns
+                else:
+                    candles = [
+                        dict(zip(columns.keys(), values))
+                        for values in zip(*columns.values())
+                    ]
+
+                return {
+                    "ticker": symbol,
+                    "name": name,
+                    "market": "CRYPTO",
+                    "candles": candles,
+                    "has_more": len(columns["time"]) == limit
+                }
         except Exception as e:
             print(f"암호화폐 캔들 조회 오류: {e}")
         return None
@@ -0,0 +1,151 @@
+"""
+구독 종목 실시간 시세 푸시
+- WebSocket으로 구독 중인 종목(manager.get_subscribed_tickers)만 주기적으로 일괄 조회
+- 직전에 보낸 가격과 달라진 종목만 price_update로 전송
+- 조회 주기는 시장별로 다름 (암호화폐는 짧게, 장 마감 후 주식은 길게)
+- 구독 시 시장을 보내지 않은 종목은 포지션 기록의 시장을 사용 (그래도 모르면 조회하지 않고 건너뜀)
+- main.startup_event에서 start, shutdown_event에서 stop
+"""
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.position import Position
+from app.services.price_service import price_service
+from app.utils.constants import KST
+from app.utils.market_hours import CRYPTO_MARKETS, is_market_open, normalize_market
+from app.websocket import manager
+
+
+class PriceStream:
+    """구독 종목 시세 폴링 → 변경분만 브로드캐스트"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        # 마지막으로 보낸 시세: {ticker: price_update data}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        # 변경 비교용 원래 값: {ticker: price}
+        self._last_values: Dict[str, Decimal] = {}
+        # 다음 조회 시각 (monotonic): {ticker: due}
+        self._next_poll: Dict[str, float] = {}
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def interval_for(self, market: str) -> int:
+        """시장별 조회 주기 (초)"""
+        if market in CRYPTO_MARKETS:
+            return settings.price_stream_crypto_interval
+        if is_market_open(market):
+            return settings.price_stream_open_interval
+        return settings.price_stream_closed_interval
+
+    def last_price(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """마지막으로 보낸 시세 (새 구독자에게 즉시 전달용)"""
+        return self._last.get(ticker)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"실시간 시세 푸시 오류: {e}")
+            await asyncio.sleep(settings.price_stream_tick)
+
+    async def poll_once(self) -> int:
+        """조회 주기가 된 구독 종목을 일괄 조회하고 변경분 전송. 전송한 종목 수 반환"""
+        tickers = manager.get_subscribed_tickers()
+
+        # 구독이 끊긴 종목 정리
+        for ticker in set(self._next_poll) - set(tickers):
+            self._next_poll.pop(ticker, None)
+            self._last.pop(ticker, None)
+            self._last_values.pop(ticker, None)
+
+        now = time.monotonic()
+        markets: Dict[str, Optional[str]] = {}
+        for ticker in tickers:
+            if self._next_poll.get(ticker, 0) > now:
+                continue
+            markets[ticker] = manager.get_price_market(ticker)
+
+        unknown = [ticker for ticker, market in markets.items() if not market]
+        if unknown:
+            loop = asyncio.get_running_loop()
+            found = await loop.run_in_executor(None, self._position_markets, unknown)
+            for ticker in unknown:
+                if ticker in found:
+                    manager.price_markets[ticker] = markets[ticker] = found[ticker]
+
+        due: List[Tuple[str, str]] = []
+        for ticker, market in markets.items():
+            if not market:
+                # 시장을 모르는 종목은 다른 시장 시세로 잘못 보내지 않도록 건너뛰고 나중에 다시 확인
+                self._next_poll[ticker] = now + settings.price_stream_closed_interval
+                continue
+            market = normalize_market(market)
+            self._next_poll[ticker] = now + self.interval_for(market)
+            due.append((ticker, market))
+
+        if not due:
+            return 0
+
+        prices = await price_service.refresh_prices(due)
+
+        sent = 0
+        for (ticker, market), price in prices.items():
+            if price is None:
+                continue
+            if self._last_values.get(ticker) == price:
+                continue
+            last = self._last.get(ticker)
+
+            data = {
+                "ticker": ticker,
+                "market": market,
+                "price": float(price),
+                "previous_price": last["price"] if last else None,
+                "timestamp": datetime.now(KST).isoformat(),
+            }
+            self._last[ticker] = data
+            self._last_values[ticker] = price
+            await manager.broadcast_price_update(ticker, data)
+            sent += 1
+
+        return sent
+
+    @staticmethod
+    def _position_markets(tickers: List[str]) -> Dict[str, str]:
+        """포지션 기록에서 종목별 시장 조회 (가장 최근 포지션 기준)"""
+        db = SessionLocal()
+        try:
+            rows = db.query(Position.ticker, Position.market).filter(
+                Position.ticker.in_(tickers)
+            ).order_by(Position.id.desc()).all()
+        finally:
+            db.close()
+
+        markets: Dict[str, str] = {}
+        for ticker, market in rows:
+            markets.setdefault(ticker, market)
+        return markets
+
+
+# 싱글톤 인스턴스
+price_stream = PriceStream()
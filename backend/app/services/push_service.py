@@ -49,9 +49,8 @@ class PushService:
             PushSubscription.user_id == user_id
         ).all()
 
-    def send_push(
-        self,
-        user_id: int,
+    @staticmethod
+    def build_payload(
         title: str,
         body: str = "",
         url: str = "/",
@@ -59,16 +58,8 @@ class PushService:
         related_type: Optional[str] = None,
         related_id: Optional[int] = None,
         tag: Optional[str] = None,
-    ):
-        """특정 사용자의 모든 기기에 Push 알림 발송"""
-        if not settings.vapid_public_key or not settings.vapid_private_key:
-            return
-
-        subscriptions = self.get_subscriptions(user_id)
-        if not subscriptions:
-            return
-
-        payload = json.dumps({
+    ) -> str:
+        return json.dumps({
             "title": title,
             "body": body,
             "url": url,
@@ -78,40 +69,31 @@ class PushService:
             "tag": tag or f"fm-{notification_type}",
         })
 
-        try:
-            from pywebpush import webpush, WebPushException
-        except ImportError:
-            print("pywebpush not installed, skipping push notification")
-            return
+    @staticmethod
+    def deliver(subscription: PushSubscription, payload: str) -> bool:
+        """기기 1개로 Push 발송 (blocking, NotificationDispatcher 스레드 풀에서 호출)
 
-        expired_endpoints = []
-        for sub in subscriptions:
-            try:
-                webpush(
-                    subscription_info={
-                        "endpoint": sub.endpoint,
-                        "keys": {
-                            "p256dh": sub.p256dh,
-                            "auth": sub.auth,
-                        },
-                    },
-                    data=payload,
-                    vapid_private_key=settings.vapid_private_key,
-                    vapid_claims={"sub": settings.vapid_claims_email},
-                )
-            except WebPushException as e:
-                # 410 Gone or 404 = subscription expired
-                if hasattr(e, 'response') and e.response is not None:
-                    status = e.response.status_code
-                    if status in (404, 410):
-                        expired_endpoints.append(sub.endpoint)
-                print(f"Web Push error for user {user_id}: {e}")
-            except Exception as e:
-                print(f"Web Push unexpected error: {e}")
+        구독이 만료되었으면(404/410) False, 그 외 실패는 예외 (재시도 대상)
+        """
+        from pywebpush import webpush, WebPushException
 
-        # 만료된 구독 정리
-        if expired_endpoints:
-            self.db.query(PushSubscription).filter(
-                PushSubscription.endpoint.in_(expired_endpoints)
-            ).delete(synchronize_session=False)
-            self.db.commit()
+        try:
+            webpush(
+                subscription_info={
+                    "endpoint": subscription.endpoint,
+                    "keys": {
+                        "p256dh": subscription.p256dh,
+                        "auth": subscription.auth,
+                    },
+                },
+                data=payload,
+                vapid_private_key=settings.vapid_private_key,
+                vapid_claims={"sub": settings.vapid_claims_email},
+                timeout=settings.push_timeout,
+            )
+        except WebPushException as e:
+            # 410 Gone or 404 = subscription expired
+            if getattr(e, 'response', None) is not None and e.response.status_code in (404, 410):
+                return False
+            raise
+        return True
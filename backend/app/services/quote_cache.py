@@ -0,0 +1,319 @@
+"""
+시세 캐시 레이어
+- LRU 방식으로 최대 개수 제한
+- 시장별 TTL (암호화폐는 짧게, 장 마감 후 주식은 길게)
+- 같은 종목 동시 조회는 하나의 upstream 호출로 합침 (single-flight)
+- TTL이 지난 값은 즉시 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.utils.market_hours import CRYPTO_MARKETS, is_market_open
+
+Fetcher = Callable[[], Awaitable[Optional[Any]]]
+BatchFetcher = Callable[[List[Tuple[str, str]]], Awaitable[Dict[Tuple[str, str], Any]]]
+
+
+class QuoteCache:
+    """market:ticker 단위 시세 캐시"""
+
+    def __init__(
+        self,
+        max_size: int = settings.quote_cache_max_size,
+        stale_ttl: float = settings.quote_cache_stale_ttl
+    ):
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        # {key: (value, fetched_at)} - 최근 사용한 항목이 뒤쪽
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # 진행 중인 upstream 조회: {key: Future}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+
+    @staticmethod
+    def make_key(market: str, ticker: str) -> str:
+        return f"{market}:{ticker}"
+
+    def ttl_for(self, market: str) -> float:
+        """시장별 캐시 유효 시간 (초)"""
+        if (market or "").upper() in CRYPTO_MARKETS:
+            return settings.quote_cache_crypto_ttl
+        if is_market_open(market):
+            return settings.quote_cache_open_ttl
+        return settings.quote_cache_closed_ttl
+
+    async def get(self, market: str, ticker: str, fetcher: Fetcher) -> Optional[Any]:
+        """캐시 조회. 없거나 너무 오래되었으면 fetcher로 조회"""
+        key = self.make_key(market, ticker)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl_for(market):
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.stale_ttl:
+                # 오래된 값을 먼저 돌려주고 갱신은 백그라운드에서
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, fetcher)
+                return value
+
+        self.misses += 1
+        return await self._load(key, fetcher)
+
+    async def get_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        batch_fetcher: BatchFetcher
+    ) -> Dict[Tuple[str, str], Any]:
+        """여러 종목 캐시 조회. 없는 종목만 모아 batch_fetcher 한 번으로 조회
+
+        Args:
+            pairs: [(market, ticker), ...]
+            batch_fetcher: [(market, ticker), ...]를 받아 {(market, ticker): value}를 반환
+        """
+        results: Dict[Tuple[str, str], Any] = {}
+        stale: List[Tuple[str, str]] = []
+        waiting: Dict[Tuple[str, str], asyncio.Future] = {}
+        missing: List[Tuple[str, str]] = []
+        now = time.monotonic()
+
+        for pair in dict.fromkeys(pairs):
+            market, ticker = pair
+            key = self.make_key(market, ticker)
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl_for(market):
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    results[pair] = value
+                    continue
+                if age < self.stale_ttl:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    results[pair] = value
+                    if key not in self._inflight:
+                        stale.append(pair)
+                    continue
+
+            self.misses += 1
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                waiting[pair] = pending
+            else:
+                missing.append(pair)
+
+        if stale:
+            task = asyncio.get_running_loop().create_task(self._refresh_many(stale, batch_fetcher))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        if missing:
+            results.update(await self._load_many(missing, batch_fetcher))
+
+        await self._collect(waiting, results)
+        return results
+
+    async def refresh_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        batch_fetcher: BatchFetcher
+    ) -> Dict[Tuple[str, str], Any]:
+        """TTL과 무관하게 upstream에서 다시 조회하여 캐시 갱신 (실시간 시세 푸시용)
+
+        이미 조회 중인 종목은 새로 요청하지 않고 그 결과를 기다린다.
+        """
+        results: Dict[Tuple[str, str], Any] = {}
+        waiting: Dict[Tuple[str, str], asyncio.Future] = {}
+        missing: List[Tuple[str, str]] = []
+
+        for pair in dict.fromkeys(pairs):
+            pending = self._inflight.get(self.make_key(*pair))
+            if pending is not None:
+                self.coalesced += 1
+                waiting[pair] = pending
+            else:
+                missing.append(pair)
+
+        if missing:
+            results.update(await self._load_many(missing, batch_fetcher))
+
+        await self._collect(waiting, results)
+        return results
+
+    def peek(self, market: str, ticker: str) -> Optional[Any]:
+        """TTL과 무관하게 마지막 값 반환 (통계 카운트 없음)"""
+        entry = self._entries.get(self.make_key(market, ticker))
+        return entry[0] if entry else None
+
+    def set(self, market: str, ticker: str, value: Any) -> None:
+        """외부에서 조회한 값을 캐시에 저장 (배치 조회 등)"""
+        if value is not None:
+            self._store(self.make_key(market, ticker), value)
+
+    def is_fresh(self, market: str, ticker: str) -> bool:
+        entry = self._entries.get(self.make_key(market, ticker))
+        if entry is None:
+            return False
+        return time.monotonic() - entry[1] < self.ttl_for(market)
+
+    def invalidate(self, market: Optional[str] = None, ticker: Optional[str] = None) -> None:
+        if market is None or ticker is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self.make_key(market, ticker), None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "refresh_errors": self.refresh_errors,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0,
+        }
+
+    @staticmethod
+    def _leader_cancelled(future: asyncio.Future) -> bool:
+        """기다리던 조회가 (자기 자신이 아니라) 조회를 시작한 요청의 취소로 끝났는지"""
+        task = asyncio.current_task()
+        return future.cancelled() and not (task is not None and task.cancelling())
+
+    async def _collect(
+        self,
+        waiting: Dict[Tuple[str, str], asyncio.Future],
+        results: Dict[Tuple[str, str], Any]
+    ) -> None:
+        """다른 요청이 진행 중인 조회 결과 수집 (실패/취소된 종목은 None)"""
+        for pair, future in waiting.items():
+            try:
+                results[pair] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not self._leader_cancelled(future):
+                    raise
+                results[pair] = None
+            except Exception:
+                results[pair] = None
+
+    async def _load(self, key: str, fetcher: Fetcher) -> Optional[Any]:
+        """upstream 조회 (같은 key의 동시 요청은 하나로 합침)"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not self._leader_cancelled(pending):
+                    raise
+            # 조회를 시작한 요청이 취소됨 → 직접 다시 조회
+            return await self._load(key, fetcher)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetcher()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 경고가 남지 않도록 소비
+            raise
+        else:
+            if value is not None:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            # 취소(CancelledError) 등으로 결과 없이 끝나면 대기자가 멈추지 않도록 취소 전달
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    async def _load_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        batch_fetcher: BatchFetcher
+    ) -> Dict[Tuple[str, str], Any]:
+        """여러 종목을 한 번에 upstream 조회 (각 key는 inflight로 등록되어 단건 조회와 합쳐짐)"""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for market, ticker in pairs:
+            key = self.make_key(market, ticker)
+            futures[key] = self._inflight[key] = loop.create_future()
+
+        try:
+            values = await batch_fetcher(pairs) or {}
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+                future.exception()
+            raise
+        else:
+            results = {}
+            for market, ticker in pairs:
+                key = self.make_key(market, ticker)
+                value = values.get((market, ticker))
+                if value is not None:
+                    self._store(key, value)
+                futures[key].set_result(value)
+                results[(market, ticker)] = value
+            return results
+        finally:
+            for key, future in futures.items():
+                if not future.done():
+                    future.cancel()
+                self._inflight.pop(key, None)
+
+    async def _refresh_many(self, pairs: List[Tuple[str, str]], batch_fetcher: BatchFetcher) -> None:
+        pairs = [p for p in pairs if self.make_key(*p) not in self._inflight]
+        if not pairs:
+            return
+        try:
+            await self._load_many(pairs, batch_fetcher)
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"시세 캐시 일괄 갱신 오류 ({len(pairs)}건): {e}")
+
+    def _schedule_refresh(self, key: str, fetcher: Fetcher) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, fetcher))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _refresh(self, key: str, fetcher: Fetcher) -> None:
+        try:
+            await self._load(key, fetcher)
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"시세 캐시 갱신 오류 ({key}): {e}")
+
+    def _store(self, key: str, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# 싱글톤 인스턴스 (PriceService 인스턴스 간 공유)
+quote_cache = QuoteCache()
@@ -7,7 +7,10 @@ import logging
 from app.database import SessionLocal
 from app.services.news_crawler import NewsCrawler
 from app.services.newsdesk_ai import NewsDeskAI
-from app.services.asset_service import create_daily_snapshot
+from app.services.asset_service import create_daily_snapshot_async
+from app.services.stock_search_service import stock_search_service
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.config import settings
 from app.models.newsdesk import NewsDesk
 
 logger = logging.getLogger(__name__)
@@ -53,7 +56,7 @@ async def generate_newsdesk_job():
 
         # 1. 뉴스 크롤링
         crawler = NewsCrawler(db)
-        collected = crawler.collect_for_morning_briefing(target_date)
+        collected = await crawler.collect_for_morning_briefing(target_date)
         logger.info(f"Collected {collected} news articles")
 
         # 2. AI 분석
@@ -84,7 +87,7 @@ async def create_asset_snapshot_job():
     logger.info("Starting daily asset snapshot creation...")
     db = SessionLocal()
     try:
-        snapshot = create_daily_snapshot(db)
+        snapshot = await create_daily_snapshot_async(db)
         logger.info(f"Asset snapshot created for {snapshot.snapshot_date}")
     except Exception as e:
         logger.error(f"Failed to create asset snapshot: {e}")
@@ -92,6 +95,28 @@ async def create_asset_snapshot_job():
         db.close()
 
 
+async def refresh_korean_listing_job():
+    """한국 종목 목록 갱신 작업 (스냅샷 저장 + 검색 인덱스 교체)"""
+    logger.info("Refreshing Korean stock listing...")
+    try:
+        await stock_search_service.refresh_korean_stocks()
+        logger.info(f"Korean stock listing refreshed ({len(stock_search_service._korean_stocks_list)} stocks)")
+    except Exception as e:
+        logger.error(f"Failed to refresh Korean stock listing: {e}")
+
+
+async def purge_notification_outbox_job():
+    """보관 기간이 지난 알림 전송 행 정리"""
+    db = SessionLocal()
+    try:
+        deleted = NotificationDispatcher.purge(db, settings.notification_outbox_retention_days)
+        logger.info(f"Purged {deleted} notification deliveries")
+    except Exception as e:
+        logger.error(f"Failed to purge notification deliveries: {e}")
+    finally:
+        db.close()
+
+
 def init_scheduler():
     """스케줄러 초기화"""
     kst = ZoneInfo("Asia/Seoul")
@@ -112,8 +137,24 @@ def init_scheduler():
         replace_existing=True
     )
 
+    # 한국 종목 목록 갱신 (KST 08:00 - 장 시작 전)
+    scheduler.add_job(
+        refresh_korean_listing_job,
+        CronTrigger(hour=8, minute=0, timezone=kst),
+        id="korean_listing_daily",
+        replace_existing=True
+    )
+
+    # 알림 전송 outbox 정리 (KST 04:00)
+    scheduler.add_job(
+        purge_notification_outbox_job,
+        CronTrigger(hour=4, minute=0, timezone=kst),
+        id="notification_outbox_purge",
+        replace_existing=True
+    )
+
     scheduler.start()
-    logger.info("Scheduler initialized: NewsDesk (05:30), AssetSnapshot (09:00)")
+    logger.info("Scheduler initialized: OutboxPurge (04:00), NewsDesk (05:30), KoreanListing (08:00), AssetSnapshot (09:00)")
 
 
 def shutdown_scheduler():
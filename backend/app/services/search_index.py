@@ -0,0 +1,306 @@
+"""
+종목 검색 인덱스
+- 목록 로드 시 한 번 생성하고 이후에는 읽기만 함 (교체는 새 인덱스를 만들어 참조를 바꿔치기)
+- 티커 접두어 트라이 / 종목명 접두어 트라이
+- 종목명 문자 n-gram 역색인 (부분 일치 후보 + 퍼지 매칭 후보)
+- 한글 초성 키 (초성 접두어 트라이 + 초성 n-gram)
+- 퍼지 점수는 n-gram 후보에 대해서만 process.extract로 일괄 계산
+- 검색어별 매칭 집합을 캐시하여 타이핑 중 늘어나는 검색어는 이전 집합에서 걸러냄
+
+점수 기준 - 위에서부터 처음 맞는 조건의 점수 (기존 선형 탐색과 같은 검사 순서, 초성 단계만 추가):
+    티커 정확 100 → 티커 접두어 90 → 종목명 정확 95 → 종목명 접두어 85
+    → 초성 접두어 80 → 종목명 포함 70 → 초성 포함 65 → 퍼지 (partial_ratio × 0.6)
+    티커가 검색어로 시작하는 종목은 종목명이 검색어와 같아도 90점
+"""
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from rapidfuzz import fuzz, process
+
+from app.utils.hangul import is_choseong_query, to_choseong
+
+# 퍼지 매칭 대상 후보 최대 개수 (n-gram 공유 개수 상위)
+FUZZY_CANDIDATES = 200
+FUZZY_CUTOFF = 60
+# 매칭 집합이 이 크기 이하면 전부 점수 계산, 넘으면 점수 구간별로 limit개씩만 조회
+LINEAR_SCORE_MAX = 500
+MATCH_CACHE_SIZE = 256
+NARROW_MAX = 2000
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화 (소문자, 공백 제거)"""
+    return "".join(text.lower().split())
+
+
+def ngrams(text: str) -> Set[str]:
+    """검색어/종목명의 색인 단위 (1글자는 unigram, 그 외 bigram)"""
+    if len(text) <= 1:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[int] = []
+
+
+class PrefixTrie:
+    """접두어 → 항목 id 목록 (삽입 순서 유지)"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def insert(self, key: str, item_id: int) -> None:
+        node = self._root
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.ids.append(item_id)
+
+    def find(self, prefix: str) -> List[int]:
+        node = self._root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+
+class NGramIndex:
+    """n-gram → 항목 id 집합"""
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+
+    def add(self, text: str, item_id: int) -> None:
+        for gram in ngrams(text):
+            self._postings.setdefault(gram, []).append(item_id)
+        # 1글자 검색어용 unigram
+        if len(text) > 1:
+            for ch in set(text):
+                self._postings.setdefault(ch, []).append(item_id)
+
+    def containing(self, query: str) -> List[int]:
+        """query의 모든 n-gram을 가진 항목 (부분 일치 후보, id 오름차순)"""
+        grams = ngrams(query)
+        postings = [self._postings.get(g) for g in grams]
+        if not postings or any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        result = set(postings[0])
+        for p in postings[1:]:
+            result.intersection_update(p)
+            if not result:
+                return []
+        return sorted(result)
+
+    def similar(self, query: str, top: int = FUZZY_CANDIDATES) -> List[int]:
+        """query와 n-gram을 많이 공유하는 항목 상위 top개"""
+        counts: Counter = Counter()
+        for gram in ngrams(query):
+            counts.update(self._postings.get(gram, ()))
+        return [item_id for item_id, _ in counts.most_common(top)]
+
+
+class SearchIndex:
+    """[{ticker, name, market}, ...] 목록에 대한 읽기 전용 검색 인덱스"""
+
+    def __init__(self, entries: Iterable[Dict[str, str]]):
+        self.entries: List[Dict[str, str]] = []
+        self._tickers: List[str] = []
+        self._names: List[str] = []
+        self._choseong: List[str] = []
+        self._by_ticker: Dict[str, int] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._ticker_trie = PrefixTrie()
+        self._name_trie = PrefixTrie()
+        self._choseong_trie = PrefixTrie()
+        self._name_grams = NGramIndex()
+        self._choseong_grams = NGramIndex()
+        # 검색어별 매칭 집합 캐시 (접두어 축소용, 인덱스 교체 시 함께 폐기)
+        self._match_cache: "OrderedDict[str, Set[int]]" = OrderedDict()
+
+        for entry in entries:
+            item_id = len(self.entries)
+            ticker = entry["ticker"].upper()
+            name = normalize(entry["name"])
+            choseong = to_choseong(name)
+
+            self.entries.append(entry)
+            self._tickers.append(ticker)
+            self._names.append(name)
+            self._choseong.append(choseong)
+            self._by_ticker.setdefault(ticker, item_id)
+            self._by_name.setdefault(name, []).append(item_id)
+            self._ticker_trie.insert(ticker, item_id)
+            self._name_trie.insert(name, item_id)
+            self._name_grams.add(name, item_id)
+            if choseong != name:
+                self._choseong_trie.insert(choseong, item_id)
+                self._choseong_grams.add(choseong, item_id)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def matches(self, query: str) -> Set[int]:
+        """결정적 매칭(티커 접두어, 종목명 포함, 초성 포함) id 집합
+
+        검색어가 길어지면 결과는 항상 이전 검색어 결과의 부분집합이므로,
+        캐시된 접두어 결과가 있으면 인덱스 대신 그 집합만 걸러서 계산한다 (타이핑 중 점진 축소).
+        """
+        q = normalize(query)
+        if not q:
+            return set()
+        cached = self._match_cache.get(q)
+        if cached is not None:
+            self._match_cache.move_to_end(q)
+            return cached
+
+        q_ticker = q.upper()
+        choseong_query = is_choseong_query(q)
+
+        base = None
+        for end in range(len(q) - 1, 0, -1):
+            base = self._match_cache.get(q[:end])
+            if base is not None:
+                break
+
+        # 접두어 집합이 크면 (1~2글자) 걸러내는 것보다 인덱스 조회가 빠름
+        if base is not None and len(base) <= NARROW_MAX:
+            matched = {
+                i for i in base
+                if self._tickers[i].startswith(q_ticker)
+                or q in self._names[i]
+                or (choseong_query and q in self._choseong[i])
+            }
+        else:
+            matched = set(self._ticker_trie.find(q_ticker))
+            matched.update(i for i in self._name_grams.containing(q) if q in self._names[i])
+            if choseong_query:
+                matched.update(i for i in self._choseong_grams.containing(q) if q in self._choseong[i])
+
+        self._match_cache[q] = matched
+        while len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return matched
+
+    def search(
+        self,
+        query: str,
+        market: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """점수순 검색 결과 [{ticker, name, market, score}, ...]"""
+        q = normalize(query)
+        if not q or not self.entries:
+            return []
+        q_ticker = q.upper()
+        choseong_query = is_choseong_query(q)
+
+        matched = self.matches(q)
+        if len(matched) <= LINEAR_SCORE_MAX:
+            scores = self._score_matched(matched, q, q_ticker, choseong_query, market)
+        else:
+            scores = self._score_tiers(q, q_ticker, choseong_query, market, limit)
+
+        # 퍼지 점수는 최대 60이므로 앞 단계에서 limit개가 차면 생략
+        if len(scores) < limit:
+            candidates = {
+                item_id: self._names[item_id]
+                for item_id in self._name_grams.similar(q)
+                if item_id not in scores
+                and (not market or self.entries[item_id]["market"] == market)
+            }
+            if candidates:
+                for _, fuzzy_score, item_id in process.extract(
+                    q,
+                    candidates,
+                    scorer=fuzz.partial_ratio,
+                    score_cutoff=FUZZY_CUTOFF,
+                    limit=limit - len(scores)
+                ):
+                    scores[item_id] = fuzzy_score * 0.6
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            {
+                "ticker": self.entries[item_id]["ticker"],
+                "name": self.entries[item_id]["name"],
+                "market": self.entries[item_id]["market"],
+                "score": score
+            }
+            for item_id, score in ranked
+        ]
+
+    def _score_matched(
+        self,
+        matched: Set[int],
+        q: str,
+        q_ticker: str,
+        choseong_query: bool,
+        market: Optional[str]
+    ) -> Dict[int, float]:
+        """매칭 집합이 작을 때 - 항목별로 점수 계산"""
+        scores: Dict[int, float] = {}
+        for item_id in matched:
+            if market and self.entries[item_id]["market"] != market:
+                continue
+            ticker, name, choseong = self._tickers[item_id], self._names[item_id], self._choseong[item_id]
+            if ticker == q_ticker:
+                score = 100
+            elif ticker.startswith(q_ticker):
+                score = 90
+            elif name == q:
+                score = 95
+            elif name.startswith(q):
+                score = 85
+            elif choseong_query and choseong.startswith(q):
+                score = 80
+            elif q in name:
+                score = 70
+            else:
+                score = 65
+            scores[item_id] = score
+        return scores
+
+    def _score_tiers(
+        self,
+        q: str,
+        q_ticker: str,
+        choseong_query: bool,
+        market: Optional[str],
+        limit: int
+    ) -> Dict[int, float]:
+        """매칭 집합이 클 때 (짧은 검색어) - 점수 구간별로 인덱스에서 limit개씩만 조회"""
+        scores: Dict[int, float] = {}
+
+        def collect(ids: Iterable[int], score: float, predicate=None) -> None:
+            """market 필터를 통과한 id를 limit개까지 점수 기록 (이미 더 높은 점수면 유지)"""
+            added = 0
+            for item_id in ids:
+                if added >= limit:
+                    break
+                if item_id in scores:
+                    continue
+                if market and self.entries[item_id]["market"] != market:
+                    continue
+                if predicate and not predicate(item_id):
+                    continue
+                scores[item_id] = score
+                added += 1
+
+        if q_ticker in self._by_ticker:
+            collect([self._by_ticker[q_ticker]], 100)
+        collect(self._ticker_trie.find(q_ticker), 90)
+        # 티커 접두어 구간이 limit개에서 잘렸어도 티커 접두어 종목은 95점을 받지 않음
+        collect(self._by_name.get(q, ()), 95, lambda i: not self._tickers[i].startswith(q_ticker))
+        collect(self._name_trie.find(q), 85)
+        if choseong_query:
+            collect(self._choseong_trie.find(q), 80)
+        collect(self._name_grams.containing(q), 70, lambda i: q in self._names[i])
+        if choseong_query:
+            collect(self._choseong_grams.containing(q), 65, lambda i: q in self._choseong[i])
+        return scores
@@ -1,16 +1,22 @@
 from datetime import datetime, date, timezone, timedelta
 from decimal import Decimal
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case, select, union, cast, literal, Integer, Date
 
 from app.models.position import Position, PositionStatus
 from app.models.request import Request, RequestStatus, RequestType
 from app.models.user import User
 from app.models.attendance import Attendance
+from app.models.performance_rollup import UserPerformance, TickerPerformance
+from app.services.performance_service import PerformanceService
 from app.utils.constants import KST
 
 
+# 출석으로 인정하는 상태
+PRESENT_STATUSES = ('present', 'recovered')
+
+
 def get_kst_today():
     """한국 시간 기준 오늘 날짜 반환"""
     return datetime.now(KST).date()
@@ -25,31 +31,28 @@ class StatsService:
         if not user:
             return {}
 
-        # Get all closed positions where user was the opener
-        closed_positions = self.db.query(Position).filter(
-            Position.opened_by == user_id,
-            Position.status == PositionStatus.CLOSED.value
-        ).all()
+        # 종료 포지션 누적 성과 (롤업 행 1개)
+        rollup = PerformanceService(self.db).get_user(user_id)
+        total_trades = rollup.closed_trades if rollup else 0
+        winning_trades = rollup.winning_trades if rollup else 0
+        losing_trades = rollup.losing_trades if rollup else 0
 
-        total_trades = len(closed_positions)
-        winning_trades = len([p for p in closed_positions if p.profit_loss and p.profit_loss > 0])
-        losing_trades = len([p for p in closed_positions if p.profit_loss and p.profit_loss < 0])
-
-        total_profit_loss = sum([p.profit_loss or Decimal(0) for p in closed_positions])
-        avg_profit_rate = (
-            sum([p.profit_rate or Decimal(0) for p in closed_positions]) / total_trades
-            if total_trades > 0 else Decimal(0)
-        )
-        avg_holding_hours = (
-            sum([p.holding_period_hours or 0 for p in closed_positions]) / total_trades
-            if total_trades > 0 else 0
-        )
+        total_profit_loss = rollup.realized_pl if rollup else Decimal(0)
+        avg_profit_rate = rollup.profit_rate_sum / total_trades if total_trades > 0 else Decimal(0)
+        avg_holding_hours = rollup.holding_hours_sum / total_trades if total_trades > 0 else 0
 
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
 
         # Best and worst trades
-        best_trade = max(closed_positions, key=lambda p: p.profit_rate or Decimal(0)) if closed_positions else None
-        worst_trade = min(closed_positions, key=lambda p: p.profit_rate or Decimal(0)) if closed_positions else None
+        best_trade = worst_trade = None
+        if total_trades > 0:
+            closed_query = self.db.query(Position).filter(
+                Position.opened_by == user_id,
+                Position.status == PositionStatus.CLOSED.value
+            )
+            profit_rate = func.coalesce(Position.profit_rate, 0)
+            best_trade = closed_query.order_by(profit_rate.desc(), Position.id).first()
+            worst_trade = closed_query.order_by(profit_rate.asc(), Position.id).first()
 
         return {
             "user": {
@@ -64,7 +67,9 @@ class StatsService:
                 "win_rate": win_rate,
                 "total_profit_loss": float(total_profit_loss),
                 "avg_profit_rate": float(avg_profit_rate),
-                "avg_holding_hours": int(avg_holding_hours)
+                "avg_holding_hours": int(avg_holding_hours),
+                "partial_executions": rollup.executions if rollup else 0,
+                "partial_realized_pl": float(rollup.execution_pl) if rollup else 0.0
             },
             "best_trade": {
                 "ticker": best_trade.ticker,
@@ -81,58 +86,126 @@ class StatsService:
 
     def _get_user_attendance_stats(self, user_id: int) -> dict:
         """사용자 출석률 통계"""
-        today = get_kst_today()
-
-        # 전체 출석
-        total_records = self.db.query(Attendance).filter(
-            Attendance.user_id == user_id
-        ).count()
-
-        total_present = self.db.query(Attendance).filter(
-            Attendance.user_id == user_id,
-            Attendance.status.in_(['present', 'recovered'])
-        ).count()
-
-        # 이번 달 출석
-        month_start = date(today.year, today.month, 1)
-        month_records = self.db.query(Attendance).filter(
-            Attendance.user_id == user_id,
-            Attendance.date >= month_start,
-            Attendance.date <= today
-        ).count()
-
-        month_present = self.db.query(Attendance).filter(
-            Attendance.user_id == user_id,
-            Attendance.date >= month_start,
-            Attendance.date <= today,
-            Attendance.status.in_(['present', 'recovered'])
-        ).count()
-
-        # 연속 출석 일수
-        streak = 0
-        current_date = today
-        while True:
-            att = self.db.query(Attendance).filter(
-                Attendance.user_id == user_id,
-                Attendance.date == current_date,
-                Attendance.status.in_(['present', 'recovered'])
-            ).first()
-            if att:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        summary = self.get_attendance_summary(user_id, get_kst_today())
+        total_records, total_present = summary["all_total"], summary["all_present"]
+        month_records, month_present = summary["month_total"], summary["month_present"]
 
         return {
             "total_rate": round((total_present / total_records * 100), 1) if total_records > 0 else 0,
             "month_rate": round((month_present / month_records * 100), 1) if month_records > 0 else 0,
-            "streak": streak,
+            "streak": summary["streak"],
             "total_present": total_present,
             "total_records": total_records,
             "month_present": month_present,
             "month_days": month_records
         }
 
+    def _user_position_links(self):
+        """(user_id, position_id) - 포지션 개설자 또는 해당 포지션 요청자 (중복 제거)"""
+        return union(
+            select(Position.opened_by.label("user_id"), Position.id.label("position_id")).where(
+                Position.opened_by.isnot(None)
+            ),
+            select(Request.requester_id.label("user_id"), Request.position_id.label("position_id")).where(
+                Request.requester_id.isnot(None),
+                Request.position_id.isnot(None)
+            )
+        ).subquery()
+
+    def get_ranking_position_stats(self) -> Tuple[Dict[int, dict], List[Tuple[int, int]]]:
+        """팀원 랭킹용 포지션 집계 (쿼리 2회, 인원/이력 수와 무관)
+
+        반환: ({user_id: 종료 포지션 집계 + 열린 포지션 수}, [(user_id, 열린 position_id), ...])
+        열린 포지션의 미실현 손익은 시세가 필요하므로 호출자가 한 번에 합산한다.
+        """
+        links = self._user_position_links()
+        is_open = Position.status == PositionStatus.OPEN.value
+        closed_counted = and_(~is_open, Position.profit_loss.isnot(None))
+        has_investment = and_(
+            Position.average_buy_price.isnot(None), Position.average_buy_price != 0,
+            Position.total_quantity.isnot(None), Position.total_quantity != 0
+        )
+
+        rows = self.db.query(
+            links.c.user_id,
+            func.count(case((is_open, 1))).label("open_positions"),
+            func.count(case((~is_open, 1))).label("closed_positions"),
+            func.count(case((closed_counted, 1))).label("closed_counted"),
+            func.coalesce(func.sum(case((closed_counted, Position.profit_loss))), 0).label("closed_profit"),
+            func.coalesce(func.sum(case(
+                (and_(closed_counted, has_investment), Position.average_buy_price * Position.total_quantity)
+            )), 0).label("closed_investment"),
+            func.count(case((and_(closed_counted, Position.profit_loss > 0), 1))).label("winning_trades"),
+            func.count(case((and_(closed_counted, Position.profit_loss < 0), 1))).label("losing_trades"),
+        ).join(
+            Position, Position.id == links.c.position_id
+        ).group_by(links.c.user_id).all()
+
+        open_links = self.db.query(links.c.user_id, links.c.position_id).join(
+            Position, Position.id == links.c.position_id
+        ).filter(is_open).all()
+
+        return {row.user_id: row._asdict() for row in rows}, [tuple(link) for link in open_links]
+
+    def _attendance_counts(self, today: date) -> list:
+        """주간/월간/전체 출석 조건부 집계 컬럼"""
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
+        present = Attendance.status.in_(PRESENT_STATUSES)
+        in_week = and_(Attendance.date >= week_start, Attendance.date <= today)
+        in_month = and_(Attendance.date >= month_start, Attendance.date <= today)
+
+        return [
+            func.count(case((in_week, 1))).label("week_total"),
+            func.count(case((and_(in_week, present), 1))).label("week_present"),
+            func.count(case((in_month, 1))).label("month_total"),
+            func.count(case((and_(in_month, present), 1))).label("month_present"),
+            func.count(Attendance.id).label("all_total"),
+            func.count(case((present, 1))).label("all_present"),
+        ]
+
+    def get_attendance_rates(self, today: date) -> Dict[int, dict]:
+        """사용자별 주간/월간/전체 출석 집계 (조건부 집계 1회)"""
+        rows = self.db.query(
+            Attendance.user_id,
+            *self._attendance_counts(today)
+        ).group_by(Attendance.user_id).all()
+
+        return {row.user_id: row._asdict() for row in rows}
+
+    def _days_before(self, today: date, column):
+        """today - column (일수, 정수)"""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return cast(func.julianday(today.isoformat()) - func.julianday(column), Integer)
+        return literal(today, Date) - column
+
+    def get_attendance_summary(self, user_id: int, today: date) -> dict:
+        """한 사용자의 주간/월간/전체 출석 집계 + 연속 출석 일수 (쿼리 1회)
+
+        연속 출석은 gaps-and-islands로 계산한다. 오늘 이전 출석일을 최근 순으로 번호(seq, 0부터)를
+        매기면, 오늘부터 빈 날 없이 이어진 구간에서는 경과 일수(days_ago)와 seq가 같고
+        첫 빈 날 이후로는 days_ago > seq가 된다. 오늘 출석이 없으면 0.
+        """
+        present_days = select(
+            self._days_before(today, Attendance.date).label("days_ago"),
+            (func.row_number().over(order_by=Attendance.date.desc()) - 1).label("seq")
+        ).where(
+            Attendance.user_id == user_id,
+            Attendance.status.in_(PRESENT_STATUSES),
+            Attendance.date <= today
+        ).subquery()
+
+        streak = select(func.count()).select_from(present_days).where(
+            present_days.c.days_ago == present_days.c.seq
+        ).scalar_subquery()
+
+        row = self.db.query(
+            *self._attendance_counts(today),
+            streak.label("streak")
+        ).filter(Attendance.user_id == user_id).one()
+
+        return row._asdict()
+
     def get_team_stats(
         self,
         start_date: Optional[date] = None,
@@ -144,13 +217,11 @@ class StatsService:
             Position.status == PositionStatus.OPEN.value
         ).all()
 
-        # 종료된 포지션
-        closed_query = self.db.query(Position).filter(Position.status == PositionStatus.CLOSED.value)
-        if start_date:
-            closed_query = closed_query.filter(Position.closed_at >= datetime.combine(start_date, datetime.min.time()))
-        if end_date:
-            closed_query = closed_query.filter(Position.closed_at <= datetime.combine(end_date, datetime.max.time()))
-        closed_positions = closed_query.all()
+        # 종료된 포지션: 기간 지정이 없으면 성과 롤업, 있으면 SQL 집계
+        if start_date or end_date:
+            closed, closed_by_user, closed_by_ticker = self._closed_aggregates(start_date, end_date)
+        else:
+            closed, closed_by_user, closed_by_ticker = self._rollup_aggregates()
 
         # 통화별 열린 포지션 통계 (KRW / USD / USDT)
         currency_stats = {}
@@ -179,16 +250,15 @@ class StatsService:
         open_invested = sum([p.total_buy_amount or Decimal(0) for p in open_positions])
 
         # 종료된 포지션 통계
-        closed_count = len(closed_positions)
-        realized_profit_loss = sum([p.profit_loss or Decimal(0) for p in closed_positions])
-        total_volume = sum([p.total_buy_amount or Decimal(0) for p in closed_positions])
-        winning_trades = len([p for p in closed_positions if p.profit_loss and p.profit_loss > 0])
-        losing_trades = len([p for p in closed_positions if p.profit_loss and p.profit_loss < 0])
+        closed_count = closed.count
+        realized_profit_loss = Decimal(closed.realized_profit_loss)
+        total_volume = Decimal(closed.total_volume)
+        winning_trades = closed.winning_trades
+        losing_trades = closed.losing_trades
         win_rate = winning_trades / closed_count if closed_count > 0 else 0
 
         # 평균 보유 시간, 평균 수익률 (진행중 + 종료 포지션 모두 포함)
-        all_for_avg = open_positions + closed_positions
-        total_for_avg = len(all_for_avg)
+        total_for_avg = open_count + closed_count
 
         # 진행중 포지션의 보유 시간 계산
         open_holding_hours = 0
@@ -203,62 +273,53 @@ class StatsService:
             if price_data and p.id in price_data and price_data[p.id].get("profit_rate") is not None:
                 open_profit_rates.append(float(price_data[p.id]["profit_rate"]))
 
-        closed_holding_hours = sum([p.holding_period_hours or 0 for p in closed_positions])
-        closed_profit_rates = [float(p.profit_rate or 0) for p in closed_positions]
-
         avg_holding_hours = (
-            (closed_holding_hours + open_holding_hours) / total_for_avg
+            (closed.holding_hours + open_holding_hours) / total_for_avg
             if total_for_avg > 0 else 0
         )
 
-        all_profit_rates = closed_profit_rates + open_profit_rates
+        profit_rate_count = closed_count + len(open_profit_rates)
         avg_profit_rate = (
-            sum(all_profit_rates) / len(all_profit_rates)
-            if len(all_profit_rates) > 0 else 0
+            (float(closed.profit_rate_sum) + sum(open_profit_rates)) / profit_rate_count
+            if profit_rate_count > 0 else 0
         )
 
         # Leaderboard by user (종료 + 진행중 포지션 모두 포함)
-        user_stats = {}
-        for position in closed_positions:
-            user_id = position.opened_by
-            if user_id not in user_stats:
-                user = self.db.query(User).filter(User.id == user_id).first()
-                user_stats[user_id] = {
-                    "user": {"id": user.id, "username": user.username, "full_name": user.full_name} if user else {"id": user_id, "username": "Unknown", "full_name": "Unknown"},
-                    "realized_pl": Decimal(0),
-                    "unrealized_pl": Decimal(0),
-                    "win_count": 0,
-                    "closed_trades": 0,
-                    "open_trades": 0
-                }
+        def empty_user_stats():
+            return {
+                "realized_pl": Decimal(0),
+                "unrealized_pl": Decimal(0),
+                "win_count": 0,
+                "closed_trades": 0,
+                "open_trades": 0
+            }
 
-            user_stats[user_id]["realized_pl"] += position.profit_loss or Decimal(0)
-            user_stats[user_id]["closed_trades"] += 1
-            if position.profit_loss and position.profit_loss > 0:
-                user_stats[user_id]["win_count"] += 1
+        user_stats = {}
+        for row in closed_by_user:
+            stats = user_stats[row.opened_by or None] = empty_user_stats()
+            stats["realized_pl"] = Decimal(row.realized_pl)
+            stats["closed_trades"] = row.closed_trades
+            stats["win_count"] = row.win_count
 
         # 진행중 포지션의 미실현 손익 추가
         for position in open_positions:
-            user_id = position.opened_by
-            if user_id not in user_stats:
-                user = self.db.query(User).filter(User.id == user_id).first()
-                user_stats[user_id] = {
-                    "user": {"id": user.id, "username": user.username, "full_name": user.full_name} if user else {"id": user_id, "username": "Unknown", "full_name": "Unknown"},
-                    "realized_pl": Decimal(0),
-                    "unrealized_pl": Decimal(0),
-                    "win_count": 0,
-                    "closed_trades": 0,
-                    "open_trades": 0
-                }
-
-            user_stats[user_id]["open_trades"] += 1
+            stats = user_stats.setdefault(position.opened_by, empty_user_stats())
+            stats["open_trades"] += 1
             if price_data and position.id in price_data and price_data[position.id].get("profit_loss") is not None:
-                user_stats[user_id]["unrealized_pl"] += Decimal(str(price_data[position.id]["profit_loss"]))
+                stats["unrealized_pl"] += Decimal(str(price_data[position.id]["profit_loss"]))
+
+        # 리더보드 사용자 정보 (한 번에 조회)
+        users = {
+            u.id: {"id": u.id, "username": u.username, "full_name": u.full_name}
+            for u in self.db.query(User.id, User.username, User.full_name).filter(
+                User.id.in_([user_id for user_id in user_stats if user_id is not None])
+            ).all()
+        }
 
         leaderboard = sorted(
             [
                 {
-                    "user": s["user"],
+                    "user": users.get(user_id) or {"id": user_id, "username": "Unknown", "full_name": "Unknown"},
                     "realized_pl": float(s["realized_pl"]),
                     "unrealized_pl": float(s["unrealized_pl"]),
                     "total_profit_loss": float(s["realized_pl"] + s["unrealized_pl"]),
@@ -266,7 +327,7 @@ class StatsService:
                     "closed_trades": s["closed_trades"],
                     "open_trades": s["open_trades"]
                 }
-                for s in user_stats.values()
+                for user_id, s in user_stats.items()
             ],
             key=lambda x: x["total_profit_loss"],
             reverse=True
@@ -276,50 +337,57 @@ class StatsService:
             entry["rank"] = i + 1
 
         # 모든 포지션 (open + closed) 종목별 통계
-        all_positions = open_positions + closed_positions
+        def empty_ticker_stats(ticker, ticker_name, market):
+            return {
+                "ticker": ticker,
+                "ticker_name": ticker_name,
+                "market": market,
+                "open_count": 0,
+                "closed_count": 0,
+                "invested": Decimal(0),
+                "evaluation": Decimal(0),
+                "unrealized_pl": Decimal(0),
+                "profit_loss": Decimal(0),
+                "total_holding_hours": 0,
+                "closed_volume": Decimal(0),
+                "profit_rate_sum": 0.0,
+                "profit_rate_count": 0
+            }
+
         ticker_stats = {}
-        for position in all_positions:
+        for position in open_positions:
             ticker = position.ticker
             if ticker not in ticker_stats:
-                ticker_stats[ticker] = {
-                    "ticker": ticker,
-                    "ticker_name": position.ticker_name,
-                    "market": position.market,
-                    "open_count": 0,
-                    "closed_count": 0,
-                    "invested": Decimal(0),
-                    "evaluation": Decimal(0),
-                    "unrealized_pl": Decimal(0),
-                    "profit_loss": Decimal(0),
-                    "total_holding_hours": 0,
-                    "closed_volume": Decimal(0),
-                    "profit_rates": []
-                }
-
-            if position.status == PositionStatus.OPEN.value:
-                ticker_stats[ticker]["open_count"] += 1
-                invested = position.total_buy_amount or Decimal(0)
-                ticker_stats[ticker]["invested"] += invested
-                # 시세 데이터로 평가금액/미실현손익 계산
-                if price_data and position.id in price_data:
-                    pd = price_data[position.id]
-                    if pd.get("evaluation_amount"):
-                        eval_amt = Decimal(str(pd["evaluation_amount"]))
-                        ticker_stats[ticker]["evaluation"] += eval_amt
-                        ticker_stats[ticker]["unrealized_pl"] += eval_amt - invested
-                    else:
-                        ticker_stats[ticker]["evaluation"] += invested
-                    if pd.get("profit_rate") is not None:
-                        ticker_stats[ticker]["profit_rates"].append(float(pd["profit_rate"]))
+                ticker_stats[ticker] = empty_ticker_stats(ticker, position.ticker_name, position.market)
+
+            ticker_stats[ticker]["open_count"] += 1
+            invested = position.total_buy_amount or Decimal(0)
+            ticker_stats[ticker]["invested"] += invested
+            # 시세 데이터로 평가금액/미실현손익 계산
+            if price_data and position.id in price_data:
+                pd = price_data[position.id]
+                if pd.get("evaluation_amount"):
+                    eval_amt = Decimal(str(pd["evaluation_amount"]))
+                    ticker_stats[ticker]["evaluation"] += eval_amt
+                    ticker_stats[ticker]["unrealized_pl"] += eval_amt - invested
                 else:
                     ticker_stats[ticker]["evaluation"] += invested
+                if pd.get("profit_rate") is not None:
+                    ticker_stats[ticker]["profit_rate_sum"] += float(pd["profit_rate"])
+                    ticker_stats[ticker]["profit_rate_count"] += 1
             else:
-                ticker_stats[ticker]["closed_count"] += 1
-                ticker_stats[ticker]["profit_loss"] += position.profit_loss or Decimal(0)
-                ticker_stats[ticker]["closed_volume"] += position.total_buy_amount or Decimal(0)
-                ticker_stats[ticker]["total_holding_hours"] += position.holding_period_hours or 0
-                if position.profit_rate is not None:
-                    ticker_stats[ticker]["profit_rates"].append(float(position.profit_rate))
+                ticker_stats[ticker]["evaluation"] += invested
+
+        for row in closed_by_ticker:
+            if row.ticker not in ticker_stats:
+                ticker_stats[row.ticker] = empty_ticker_stats(row.ticker, row.ticker_name, row.market)
+            stats = ticker_stats[row.ticker]
+            stats["closed_count"] = row.closed_count
+            stats["profit_loss"] = Decimal(row.profit_loss)
+            stats["closed_volume"] = Decimal(row.closed_volume)
+            stats["total_holding_hours"] = row.total_holding_hours
+            stats["profit_rate_sum"] += float(row.profit_rate_sum)
+            stats["profit_rate_count"] += row.profit_rate_count
 
         by_ticker = sorted(
             [
@@ -336,7 +404,7 @@ class StatsService:
                     "profit_loss": float(s["profit_loss"]),
                     "closed_volume": float(s["closed_volume"]),
                     "profit_rate": float(s["profit_loss"] / s["closed_volume"]) if s["closed_volume"] > 0 else 0,
-                    "avg_profit_rate": sum(s["profit_rates"]) / len(s["profit_rates"]) if s["profit_rates"] else 0,
+                    "avg_profit_rate": s["profit_rate_sum"] / s["profit_rate_count"] if s["profit_rate_count"] else 0,
                     "avg_holding_hours": s["total_holding_hours"] // s["closed_count"] if s["closed_count"] > 0 else 0
                 }
                 for s in ticker_stats.values()
@@ -388,6 +456,83 @@ class StatsService:
             "by_ticker": by_ticker
         }
 
+    def _closed_aggregates(self, start_date: Optional[date], end_date: Optional[date]):
+        """기간 내 종료 포지션 집계 → (전체, 사용자별, 종목별)"""
+        closed_filters = [Position.status == PositionStatus.CLOSED.value]
+        if start_date:
+            closed_filters.append(Position.closed_at >= datetime.combine(start_date, datetime.min.time()))
+        if end_date:
+            closed_filters.append(Position.closed_at <= datetime.combine(end_date, datetime.max.time()))
+
+        profit_loss = func.coalesce(Position.profit_loss, 0)
+        buy_amount = func.coalesce(Position.total_buy_amount, 0)
+        holding_hours = func.coalesce(Position.holding_period_hours, 0)
+        wins = func.count(case((Position.profit_loss > 0, 1)))
+
+        totals = self.db.query(
+            func.count(Position.id).label("count"),
+            wins.label("winning_trades"),
+            func.count(case((Position.profit_loss < 0, 1))).label("losing_trades"),
+            func.coalesce(func.sum(profit_loss), 0).label("realized_profit_loss"),
+            func.coalesce(func.sum(buy_amount), 0).label("total_volume"),
+            func.coalesce(func.sum(holding_hours), 0).label("holding_hours"),
+            func.coalesce(func.sum(func.coalesce(Position.profit_rate, 0)), 0).label("profit_rate_sum"),
+        ).filter(*closed_filters).one()
+
+        by_user = self.db.query(
+            Position.opened_by,
+            func.coalesce(func.sum(profit_loss), 0).label("realized_pl"),
+            func.count(Position.id).label("closed_trades"),
+            wins.label("win_count"),
+        ).filter(*closed_filters).group_by(Position.opened_by).order_by(func.min(Position.id)).all()
+
+        by_ticker = self.db.query(
+            Position.ticker,
+            func.max(Position.ticker_name).label("ticker_name"),
+            func.max(Position.market).label("market"),
+            func.count(Position.id).label("closed_count"),
+            func.coalesce(func.sum(profit_loss), 0).label("profit_loss"),
+            func.coalesce(func.sum(buy_amount), 0).label("closed_volume"),
+            func.coalesce(func.sum(holding_hours), 0).label("total_holding_hours"),
+            func.coalesce(func.sum(Position.profit_rate), 0).label("profit_rate_sum"),
+            func.count(Position.profit_rate).label("profit_rate_count"),
+        ).filter(*closed_filters).group_by(Position.ticker).order_by(func.min(Position.id)).all()
+
+        return totals, by_user, by_ticker
+
+    def _rollup_aggregates(self):
+        """전체 기간 종료 포지션 집계를 성과 롤업 테이블에서 읽음 (_closed_aggregates와 같은 형태)"""
+        totals = self.db.query(
+            func.coalesce(func.sum(UserPerformance.closed_trades), 0).label("count"),
+            func.coalesce(func.sum(UserPerformance.winning_trades), 0).label("winning_trades"),
+            func.coalesce(func.sum(UserPerformance.losing_trades), 0).label("losing_trades"),
+            func.coalesce(func.sum(UserPerformance.realized_pl), 0).label("realized_profit_loss"),
+            func.coalesce(func.sum(UserPerformance.total_volume), 0).label("total_volume"),
+            func.coalesce(func.sum(UserPerformance.holding_hours_sum), 0).label("holding_hours"),
+            func.coalesce(func.sum(UserPerformance.profit_rate_sum), 0).label("profit_rate_sum"),
+        ).one()
+
+        by_user = self.db.query(
+            UserPerformance.user_id.label("opened_by"),
+            UserPerformance.realized_pl,
+            UserPerformance.closed_trades,
+            UserPerformance.winning_trades.label("win_count"),
+        ).filter(UserPerformance.closed_trades > 0).order_by(UserPerformance.user_id).all()
+
+        by_ticker = self.db.query(
+            TickerPerformance.ticker,
+            TickerPerformance.ticker_name,
+            TickerPerformance.market,
+            TickerPerformance.closed_trades.label("closed_count"),
+            TickerPerformance.realized_pl.label("profit_loss"),
+            TickerPerformance.total_volume.label("closed_volume"),
+            TickerPerformance.holding_hours_sum.label("total_holding_hours"),
+            TickerPerformance.profit_rate_sum,
+            TickerPerformance.profit_rate_count,
+        ).filter(TickerPerformance.closed_trades > 0).order_by(TickerPerformance.ticker).all()
+
+        return totals, by_user, by_ticker
+
     def _get_currency(self, market: str) -> str:
         """시장으로부터 통화를 결정"""
         if market in ('KOSPI', 'KOSDAQ', 'KRX'):
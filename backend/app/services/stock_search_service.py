@@ -1,14 +1,23 @@
 """
 종목 검색 서비스
-- 한국 주식: PyKRX를 사용하여 종목명 검색
-- 미국 주식: yfinance Search 사용
+- 한국 주식: PyKRX 종목 목록 (디스크 스냅샷으로 즉시 로드, 백그라운드 갱신)
+- 미국 주식: NASDAQ/NYSE/AMEX 종목 디렉터리 인덱스 (부족할 때만 yfinance Search, TTL 캐시)
 - 암호화폐: 정적 리스트 사용
 """
 import asyncio
-from typing import List, Dict, Any, Optional
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from rapidfuzz import fuzz, process
-import threading
+
+from app.config import settings
+from app.services.http_client import http_client
+from app.services.krx_symbol_registry import krx_symbol_registry
+from app.services.search_index import SearchIndex, normalize
 
 # PyKRX는 동기 라이브러리
 try:
@@ -18,6 +27,35 @@ except ImportError:
     PYKRX_AVAILABLE = False
     print("Warning: pykrx not installed. Korean stock search will be limited.")
 
+# 시장별 티커+종목명 일괄 조회 (pykrx 내부 API, 없으면 종목별 조회)
+try:
+    from pykrx.website.krx.market.wrap import get_market_ticker_and_name
+except ImportError:
+    get_market_ticker_and_name = None
+
+# 종목 목록 스냅샷 (형식이 바뀌면 SNAPSHOT_VERSION 증가 → 이전 파일 무시)
+SNAPSHOT_VERSION = 2
+KOREAN_SNAPSHOT_FILE = "korean_stocks.json"
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+
+# 미국 종목 디렉터리 (NASDAQ Trader 심볼 디렉터리)
+US_SNAPSHOT_FILE = "us_stocks.json"
+BUNDLED_US_LISTING = os.path.join(os.path.dirname(__file__), "..", "..", "seed_data", US_SNAPSHOT_FILE)
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+# otherlisted.txt Exchange 코드 → 시장
+# NYSE Arca(P), NYSE American(A, 구 AMEX) 상장 종목도 NYSE로 분류 (시세/통화/프론트가 NASDAQ/NYSE만 사용)
+US_EXCHANGE_MARKETS = {"N": "NYSE", "P": "NYSE", "A": "NYSE"}
+YF_SEARCH_CACHE_SIZE = 512
+
+SEARCH_RESULT_CACHE_SIZE = 1024
+
+# yfinance Search 전용 스레드 (대기열의 작업은 취소 가능, 공용 executor를 점유하지 않음)
+_yf_search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yf-search")
+
+# 갱신 실패 후 검색 요청으로 다시 시도하기까지 대기 시간
+REFRESH_RETRY_INTERVAL = timedelta(minutes=30)
+
 try:
     import yfinance as yf
     YFINANCE_AVAILABLE = True
@@ -33,9 +71,12 @@ class StockSearchService:
         self._korean_stocks: Dict[str, str] = {}
         self._korean_stocks_list: List[Dict[str, str]] = []  # [{ticker, name, market}, ...]
         self._korean_cache_time: Optional[datetime] = None
-        self._korean_cache_lock = threading.Lock()
+        self._korean_refresh_task: Optional[asyncio.Task] = None
+        self._korean_refresh_failed_at: Optional[datetime] = None
+        # 한국 주식 검색 인덱스 (티커/종목명 트라이, n-gram, 초성)
+        self._korean_index = SearchIndex([])
 
-        # 미국 주식 인기 종목 (빠른 검색용)
+        # 미국 주식 인기 종목 (종목 디렉터리가 없을 때 기본 인덱스)
         self._us_popular_stocks = [
             {"ticker": "AAPL", "name": "Apple Inc.", "market": "NASDAQ"},
             {"ticker": "MSFT", "name": "Microsoft Corporation", "market": "NASDAQ"},
@@ -64,6 +105,23 @@ class StockSearchService:
             {"ticker": "ORCL", "name": "Oracle Corporation", "market": "NYSE"},
         ]
 
+        # 미국 종목 디렉터리 인덱스 (로드 전에는 인기 종목만)
+        self._us_index = SearchIndex(self._us_popular_stocks)
+        self._us_stocks_count = len(self._us_popular_stocks)
+        self._us_cache_time: Optional[datetime] = None
+        self._us_refresh_task: Optional[asyncio.Task] = None
+        self._us_refresh_failed_at: Optional[datetime] = None
+        # yfinance Search 결과 캐시: {정규화 검색어: (monotonic 시각, 결과)}
+        self._yf_search_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # 진행 중인 yfinance Search: {정규화 검색어: Future}, 기다리는 요청 수
+        self._yf_inflight: Dict[str, asyncio.Future] = {}
+        self._yf_waiters: Dict[str, int] = {}
+
+        # 검색 결과 캐시: {(정규화 검색어, market, limit): (만료 monotonic 시각, 결과)}
+        self._result_cache: "OrderedDict[Tuple[str, Optional[str], int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # 클라이언트별 진행 중인 검색 (새 검색이 오면 취소)
+        self._client_searches: Dict[Any, asyncio.Task] = {}
+
         # 암호화폐 리스트
         self._crypto_list = [
             {"ticker": "BTC", "name": "비트코인 (Bitcoin)", "market": "CRYPTO"},
@@ -88,77 +146,283 @@ class StockSearchService:
             {"ticker": "SUI", "name": "수이 (Sui)", "market": "CRYPTO"},
         ]
 
-    def _load_korean_stocks_sync(self) -> None:
-        """한국 주식 목록 로드 (동기)"""
-        if not PYKRX_AVAILABLE:
-            return
+    # ========== 한국 종목 목록 (스냅샷 + 백그라운드 갱신) ==========
 
-        try:
-            # 오늘 날짜로 시도, 안되면 최근 영업일
-            today = datetime.now().strftime("%Y%m%d")
+    def _snapshot_path(self, filename: str) -> str:
+        return os.path.join(settings.listing_data_dir or DEFAULT_DATA_DIR, filename)
 
-            stocks = []
+    def _read_snapshot(self, path: str) -> Optional[Tuple[List[Dict[str, str]], datetime]]:
+        """종목 목록 스냅샷 읽기 → (stocks, created_at). 없거나 버전이 다르면 None"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"종목 스냅샷 읽기 실패 ({path}): {e}")
+            return None
+
+        if data.get("version") != SNAPSHOT_VERSION or not data.get("stocks"):
+            print(f"종목 스냅샷 버전 불일치 - 무시 ({path})")
+            return None
+        return data["stocks"], datetime.fromisoformat(data["created_at"])
+
+    def _write_snapshot(self, filename: str, stocks: List[Dict[str, str]], created_at: datetime) -> None:
+        """스냅샷 저장 (임시 파일에 쓴 뒤 교체하여 중간 상태가 남지 않도록)"""
+        path = self._snapshot_path(filename)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": SNAPSHOT_VERSION, "created_at": created_at.isoformat(), "stocks": stocks},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"종목 스냅샷 저장 실패 ({filename}): {e}")
+
+    def _read_korean_snapshot(self) -> Optional[Dict[str, Any]]:
+        """디스크 스냅샷 읽기 + 인덱스 생성 (동기, executor에서 호출)"""
+        snapshot = self._read_snapshot(self._snapshot_path(KOREAN_SNAPSHOT_FILE))
+        if not snapshot:
+            return None
+        return self._build_korean_listing(*snapshot)
+
+    def _build_korean_listing(self, stocks: List[Dict[str, str]], created_at: datetime) -> Dict[str, Any]:
+        """검색에 필요한 구조를 미리 생성 (교체는 _apply_korean_listing에서 한 번에)"""
+        return {
+            "stocks": stocks,
+            "names": {s["ticker"]: s["name"] for s in stocks},
+            "index": SearchIndex(stocks),
+            "created_at": created_at,
+        }
+
+    def _apply_korean_listing(self, listing: Dict[str, Any]) -> None:
+        """이벤트 루프에서 호출 - 중간에 await가 없으므로 검색 요청은 이전/새 목록 중 하나만 봄"""
+        self._korean_stocks = listing["names"]
+        self._korean_stocks_list = listing["stocks"]
+        self._korean_index = listing["index"]
+        self._korean_cache_time = listing["created_at"]
+        self._result_cache.clear()
+
+    def _fetch_korean_listing_sync(self) -> List[Dict[str, str]]:
+        """KRX에서 KOSPI/KOSDAQ 종목 목록 조회 (동기)
+
+        시장별로 티커+종목명을 한 번에 받는다. 일괄 조회를 지원하지 않는 pykrx 버전에서만
+        종목별 이름 조회로 대체.
+        """
+        today = datetime.now().strftime("%Y%m%d")
+        try:
+            date = pykrx_stock.get_nearest_business_day_in_a_week(today)
+        except Exception:
+            date = today
 
-            # KOSPI 종목 조회
+        stocks = []
+        for market in ("KOSPI", "KOSDAQ"):
             try:
-                kospi_tickers = pykrx_stock.get_market_ticker_list(today, market="KOSPI")
-                for ticker in kospi_tickers:
-                    name = pykrx_stock.get_market_ticker_name(ticker)
-                    if name:
-                        stocks.append({
-                            "ticker": ticker,
-                            "name": name,
-                            "market": "KOSPI"
-                        })
-                        self._korean_stocks[ticker] = name
+                if get_market_ticker_and_name is not None:
+                    names = get_market_ticker_and_name(date, market=market).to_dict()
+                else:
+                    names = {
+                        ticker: pykrx_stock.get_market_ticker_name(ticker)
+                        for ticker in pykrx_stock.get_market_ticker_list(date, market=market)
+                    }
+                stocks.extend(
+                    {"ticker": ticker, "name": name, "market": market}
+                    for ticker, name in names.items()
+                    if name
+                )
             except Exception as e:
-                print(f"KOSPI 종목 로드 오류: {e}")
+                print(f"{market} 종목 로드 오류: {e}")
+        return stocks
 
-            # KOSDAQ 종목 조회
-            try:
-                kosdaq_tickers = pykrx_stock.get_market_ticker_list(today, market="KOSDAQ")
-                for ticker in kosdaq_tickers:
-                    name = pykrx_stock.get_market_ticker_name(ticker)
-                    if name:
-                        stocks.append({
-                            "ticker": ticker,
-                            "name": name,
-                            "market": "KOSDAQ"
-                        })
-                        self._korean_stocks[ticker] = name
-            except Exception as e:
-                print(f"KOSDAQ 종목 로드 오류: {e}")
+    def _refresh_korean_sync(self) -> Optional[Dict[str, Any]]:
+        """목록 조회 → 스냅샷 저장 → 심볼 레지스트리 갱신 → 인덱스 생성 (동기)"""
+        stocks = self._fetch_korean_listing_sync()
+        if not stocks:
+            return None
 
-            self._korean_stocks_list = stocks
-            self._korean_cache_time = datetime.now()
-            print(f"한국 주식 {len(stocks)}개 로드 완료")
+        created_at = datetime.now()
+        self._write_snapshot(KOREAN_SNAPSHOT_FILE, stocks, created_at)
 
-        except Exception as e:
-            print(f"한국 주식 목록 로드 실패: {e}")
+        # 시세 조회용 Yahoo 심볼(.KS/.KQ) 레지스트리 갱신
+        changed = krx_symbol_registry.sync_from_listing(stocks)
+        if changed:
+            print(f"KRX 심볼 레지스트리 {changed}건 갱신")
+
+        return self._build_korean_listing(stocks, created_at)
+
+    def is_korean_listing_stale(self) -> bool:
+        if not self._korean_cache_time:
+            return True
+        age = datetime.now() - self._korean_cache_time
+        return age >= timedelta(hours=settings.korean_listing_refresh_hours)
 
     async def load_korean_stocks(self) -> None:
-        """한국 주식 목록 로드 (비동기 래퍼)"""
-        # 캐시가 유효하면 스킵 (24시간)
-        if self._korean_cache_time:
-            if datetime.now() - self._korean_cache_time < timedelta(hours=24):
+        """디스크 스냅샷으로 즉시 로드하고, 오래되었으면 백그라운드 갱신 시작 (KRX 대기 없음)"""
+        if not self._korean_stocks_list:
+            loop = asyncio.get_running_loop()
+            listing = await loop.run_in_executor(None, self._read_korean_snapshot)
+            if listing:
+                self._apply_korean_listing(listing)
+        self.schedule_korean_refresh()
+
+    def schedule_korean_refresh(self, force: bool = False) -> Optional[asyncio.Task]:
+        """백그라운드 갱신 시작 (이미 진행 중이면 그 작업을 반환)"""
+        if not PYKRX_AVAILABLE:
+            return None
+        if self._korean_refresh_task and not self._korean_refresh_task.done():
+            return self._korean_refresh_task
+        if not force and not self.is_korean_listing_stale():
+            return None
+        if not force and self._korean_refresh_failed_at and \
+                datetime.now() - self._korean_refresh_failed_at < REFRESH_RETRY_INTERVAL:
+            return None
+        self._korean_refresh_task = asyncio.get_running_loop().create_task(self._refresh_korean())
+        return self._korean_refresh_task
+
+    async def refresh_korean_stocks(self) -> None:
+        """한국 종목 목록 강제 갱신 (스케줄러용, 완료까지 대기)"""
+        task = self.schedule_korean_refresh(force=True)
+        if task:
+            await asyncio.shield(task)
+
+    async def _refresh_korean(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            listing = await loop.run_in_executor(None, self._refresh_korean_sync)
+        except Exception as e:
+            print(f"한국 주식 목록 갱신 실패: {e}")
+            listing = None
+        if not listing:
+            self._korean_refresh_failed_at = datetime.now()
+            return
+
+        self._korean_refresh_failed_at = None
+        self._apply_korean_listing(listing)
+        print(f"한국 주식 {len(listing['stocks'])}개 갱신 완료")
+
+    # ========== 미국 종목 디렉터리 (NASDAQ/NYSE/AMEX) ==========
+
+    def _read_us_listing(self) -> Optional[Dict[str, Any]]:
+        """저장된 스냅샷 → 번들 파일(seed_data) 순으로 읽고 인덱스 생성 (동기)"""
+        for path in (self._snapshot_path(US_SNAPSHOT_FILE), BUNDLED_US_LISTING):
+            snapshot = self._read_snapshot(path)
+            if snapshot:
+                stocks, created_at = snapshot
+                return {"stocks": stocks, "index": SearchIndex(stocks), "created_at": created_at}
+        return None
+
+    def _apply_us_listing(self, listing: Dict[str, Any]) -> None:
+        self._us_stocks_count = len(listing["stocks"])
+        self._us_index = listing["index"]
+        self._us_cache_time = listing["created_at"]
+        self._result_cache.clear()
+
+    @staticmethod
+    def _parse_us_directory(nasdaq_text: str, other_text: str) -> List[Dict[str, str]]:
+        """NASDAQ Trader 심볼 디렉터리(파이프 구분) 파싱
+
+        - nasdaqlisted.txt: Symbol|Security Name|Market Category|Test Issue|...
+        - otherlisted.txt: ACT Symbol|Security Name|Exchange|CIK Symbol|ETF|Round Lot Size|Test Issue|...
+        """
+        stocks: Dict[str, Dict[str, str]] = {}
+
+        def rows(text: str):
+            lines = text.splitlines()
+            if not lines:
                 return
+            header = lines[0].split("|")
+            for line in lines[1:]:
+                if line.startswith("File Creation Time"):
+                    continue
+                values = line.split("|")
+                if len(values) == len(header):
+                    yield dict(zip(header, values))
 
-        with self._korean_cache_lock:
-            # 다른 스레드가 이미 로드했는지 다시 확인
-            if self._korean_cache_time:
-                if datetime.now() - self._korean_cache_time < timedelta(hours=24):
-                    return
+        def add(symbol: str, name: str, market: str) -> None:
+            # 우선주/워런트 등 특수 심볼 제외, 클래스 주식은 Yahoo 표기(BRK.B → BRK-B)
+            if not symbol or "$" in symbol or symbol in stocks:
+                return
+            symbol = symbol.replace(".", "-")
+            name = name.split(" - ")[0].strip() or symbol
+            stocks[symbol] = {"ticker": symbol, "name": name, "market": market}
+
+        for row in rows(nasdaq_text):
+            if row.get("Test Issue") == "N":
+                add(row.get("Symbol", ""), row.get("Security Name", ""), "NASDAQ")
+
+        for row in rows(other_text):
+            market = US_EXCHANGE_MARKETS.get(row.get("Exchange"))
+            if market and row.get("Test Issue") == "N":
+                add(row.get("ACT Symbol", ""), row.get("Security Name", ""), market)
+
+        return list(stocks.values())
+
+    def is_us_listing_stale(self) -> bool:
+        if not self._us_cache_time:
+            return True
+        age = datetime.now() - self._us_cache_time
+        return age >= timedelta(hours=settings.us_listing_refresh_hours)
+
+    async def load_us_stocks(self) -> None:
+        """디스크에서 미국 종목 디렉터리 로드 후, 오래되었으면 백그라운드 갱신"""
+        if not self._us_cache_time:
+            loop = asyncio.get_running_loop()
+            listing = await loop.run_in_executor(None, self._read_us_listing)
+            if listing:
+                self._apply_us_listing(listing)
+        self.schedule_us_refresh()
+
+    def schedule_us_refresh(self, force: bool = False) -> Optional[asyncio.Task]:
+        """백그라운드 갱신 시작 (이미 진행 중이면 그 작업을 반환)"""
+        if self._us_refresh_task and not self._us_refresh_task.done():
+            return self._us_refresh_task
+        if not force and not self.is_us_listing_stale():
+            return None
+        if not force and self._us_refresh_failed_at and \
+                datetime.now() - self._us_refresh_failed_at < REFRESH_RETRY_INTERVAL:
+            return None
+        self._us_refresh_task = asyncio.get_running_loop().create_task(self._refresh_us())
+        return self._us_refresh_task
+
+    async def refresh_us_stocks(self) -> None:
+        """미국 종목 디렉터리 강제 갱신 (스케줄러용, 완료까지 대기)"""
+        task = self.schedule_us_refresh(force=True)
+        if task:
+            await asyncio.shield(task)
+
+    async def _refresh_us(self) -> None:
+        try:
+            nasdaq, other = await asyncio.gather(
+                http_client.get(NASDAQ_LISTED_URL),
+                http_client.get(OTHER_LISTED_URL)
+            )
+            nasdaq.raise_for_status()
+            other.raise_for_status()
+
+            loop = asyncio.get_running_loop()
+            stocks = await loop.run_in_executor(
+                None, self._parse_us_directory, nasdaq.text, other.text
+            )
+            if not stocks:
+                raise ValueError("빈 심볼 디렉터리")
+
+            created_at = datetime.now()
+            listing = await loop.run_in_executor(None, lambda: {
+                "stocks": stocks, "index": SearchIndex(stocks), "created_at": created_at
+            })
+            await loop.run_in_executor(None, self._write_snapshot, US_SNAPSHOT_FILE, stocks, created_at)
+        except Exception as e:
+            self._us_refresh_failed_at = datetime.now()
+            print(f"미국 종목 디렉터리 갱신 실패: {e}")
+            return
 
-            loop = asyncio.get_event_loop()
-            try:
-                await asyncio.wait_for(
-                    loop.run_in_executor(None, self._load_korean_stocks_sync),
-                    timeout=30.0
-                )
-            except asyncio.TimeoutError:
-                print("한국 주식 목록 로드 타임아웃 (30초)")
-            except Exception as e:
-                print(f"한국 주식 목록 로드 오류: {e}")
+        self._us_refresh_failed_at = None
+        self._apply_us_listing(listing)
+        print(f"미국 종목 {len(stocks)}개 갱신 완료")
 
     async def search_stocks(
         self,
@@ -166,26 +430,76 @@ class StockSearchService:
         market: Optional[str] = None,
         limit: int = 20
     ) -> List[Dict[str, Any]]:
-        """종목 검색 (이름 또는 티커)"""
+        """종목 검색 (이름 또는 티커)
+
+        결과는 (정규화 검색어, 시장, limit) 단위로 LRU 캐시. 캐시에 없을 때도
+        검색 인덱스가 이전(접두어) 검색어의 매칭 집합을 재사용하여 범위를 좁힌다.
+        yfinance Search가 실패/타임아웃된 결과는 search_degraded_cache_ttl 동안만 캐시한다.
+        """
         if not query or len(query) < 1:
             return []
 
         query = query.strip()
+        key = (normalize(query), market, limit)
+        now = time.monotonic()
+        cached = self._result_cache.get(key)
+        if cached and now < cached[0]:
+            self._result_cache.move_to_end(key)
+            return cached[1]
+
         results = []
+        complete = True
 
         # 시장별 검색
         if market in ["KOSPI", "KOSDAQ", None]:
             results.extend(await self._search_korean(query, market, limit))
 
         if market in ["NASDAQ", "NYSE", None]:
-            results.extend(await self._search_us(query, market, limit))
+            us_results, complete = await self._search_us(query, market, limit)
+            results.extend(us_results)
 
         if market in ["CRYPTO", None]:
             results.extend(self._search_crypto(query, limit))
 
         # 점수순 정렬 후 limit 적용
         results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        return results[:limit]
+        results = results[:limit]
+
+        ttl = settings.search_result_cache_ttl if complete else settings.search_degraded_cache_ttl
+        self._result_cache[key] = (now + ttl, results)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > SEARCH_RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return results
+
+    async def search_stocks_for_client(
+        self,
+        client_id: Any,
+        query: str,
+        market: Optional[str] = None,
+        limit: int = 20
+    ) -> Optional[List[Dict[str, Any]]]:
+        """클라이언트별 검색 - 같은 클라이언트의 새 검색이 오면 진행 중인 이전 검색을 취소
+
+        이전 검색은 None을 반환 (응답은 폐기 대상). 대기 중인 yfinance 작업도 함께 취소된다.
+        """
+        previous = self._client_searches.get(client_id)
+        if previous and not previous.done():
+            previous.cancel()
+
+        task = asyncio.ensure_future(self.search_stocks(query, market, limit))
+        self._client_searches[client_id] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # 요청 자체가 취소된 경우
+                task.cancel()
+                raise
+            return None
+        finally:
+            if self._client_searches.get(client_id) is task:
+                del self._client_searches[client_id]
 
     async def _search_korean(
         self,
@@ -194,164 +508,120 @@ class StockSearchService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """한국 주식 검색"""
-        # 캐시 로드 확인
-        await self.load_korean_stocks()
-
-        if not self._korean_stocks_list:
-            return []
-
-        results = []
-        query_upper = query.upper()
-        query_lower = query.lower()
-
-        for stock in self._korean_stocks_list:
-            # 시장 필터
-            if market and stock["market"] != market:
-                continue
-
-            ticker = stock["ticker"]
-            name = stock["name"]
-
-            score = 0
-
-            # 티커 정확 매칭
-            if ticker == query_upper:
-                score = 100
-            # 티커 시작 매칭
-            elif ticker.startswith(query_upper):
-                score = 90
-            # 이름 정확 매칭
-            elif name == query:
-                score = 95
-            # 이름 시작 매칭
-            elif name.startswith(query):
-                score = 85
-            # 이름에 포함
-            elif query in name:
-                score = 70
-            # 퍼지 매칭
-            else:
-                fuzzy_score = fuzz.partial_ratio(query_lower, name.lower())
-                if fuzzy_score >= 60:
-                    score = fuzzy_score * 0.6
-
-            if score > 0:
-                results.append({
-                    "ticker": ticker,
-                    "name": name,
-                    "market": stock["market"],
-                    "score": score
-                })
+        # 목록이 오래되었으면 백그라운드 갱신만 걸고 현재 인덱스로 바로 응답
+        self.schedule_korean_refresh()
 
-        # 점수순 정렬
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        # 미리 만든 인덱스로 후보만 조회 (전체 목록 순회 없음)
+        return self._korean_index.search(query, market, limit)
 
     async def _search_us(
         self,
         query: str,
         market: Optional[str],
         limit: int
-    ) -> List[Dict[str, Any]]:
-        """미국 주식 검색"""
-        results = []
-        query_upper = query.upper()
-        query_lower = query.lower()
-
-        # 먼저 인기 종목에서 검색
-        for stock in self._us_popular_stocks:
-            if market and stock["market"] != market:
-                continue
-
-            ticker = stock["ticker"]
-            name = stock["name"]
-
-            score = 0
-
-            if ticker == query_upper:
-                score = 100
-            elif ticker.startswith(query_upper):
-                score = 90
-            elif name.lower().startswith(query_lower):
-                score = 85
-            elif query_lower in name.lower():
-                score = 70
-            else:
-                fuzzy_score = fuzz.partial_ratio(query_lower, name.lower())
-                if fuzzy_score >= 60:
-                    score = fuzzy_score * 0.6
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """미국 주식 검색 (로컬 종목 디렉터리 인덱스, 부족할 때만 yfinance Search)
 
-            if score > 0:
-                results.append({
-                    "ticker": ticker,
-                    "name": name,
-                    "market": stock["market"],
-                    "score": score
-                })
+        Returns:
+            (결과, yfinance Search 실패 없이 만든 결과인지)
+        """
+        self.schedule_us_refresh()
+        results = self._us_index.search(query, market, limit)
+        complete = True
 
-        # yfinance Search 사용 (캐시된 인기 종목에서 못 찾은 경우)
+        # 로컬 디렉터리에서 충분히 못 찾은 경우에만 원격 검색 (검색어별 TTL 캐시)
         if len(results) < 5 and YFINANCE_AVAILABLE and len(query) >= 2:
-            try:
-                loop = asyncio.get_event_loop()
-                yf_results = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        self._yfinance_search,
-                        query
-                    ),
-                    timeout=10.0
-                )
-
-                # 이미 있는 종목 제외하고 추가
-                existing_tickers = {r["ticker"] for r in results}
-                for stock in yf_results:
-                    if stock["ticker"] not in existing_tickers:
-                        if not market or stock["market"] == market:
-                            results.append(stock)
-
-            except asyncio.TimeoutError:
-                print(f"yfinance 검색 타임아웃 (10초): {query}")
-            except Exception as e:
-                print(f"yfinance 검색 오류: {e}")
+            yf_results = await self._cached_yfinance_search(query)
+            if yf_results is None:
+                complete = False
+                yf_results = []
+
+            # 이미 있는 종목 제외하고 추가
+            existing_tickers = {r["ticker"] for r in results}
+            for stock in yf_results:
+                if stock["ticker"] not in existing_tickers:
+                    if not market or stock["market"] == market:
+                        results.append(stock)
 
         results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        return results[:limit], complete
+
+    async def _cached_yfinance_search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """yfinance Search 결과를 정규화한 검색어 기준으로 TTL 캐시 (빈 결과도 캐시)
+
+        조회 실패/타임아웃이면 None (캐시하지 않음).
+
+        같은 검색어의 동시 요청은 하나의 작업을 공유하고, 기다리는 요청이 모두 취소되면
+        아직 시작 전인 작업은 전용 executor 대기열에서 빠진다.
+        """
+        key = " ".join(query.lower().split())
+        now = time.monotonic()
+        entry = self._yf_search_cache.get(key)
+        if entry and now - entry[0] < settings.us_search_cache_ttl:
+            self._yf_search_cache.move_to_end(key)
+            return entry[1]
+
+        future = self._yf_inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(_yf_search_executor, self._yfinance_search, query)
+            self._yf_inflight[key] = future
+            future.add_done_callback(lambda _: self._yf_inflight.pop(key, None))
+        self._yf_waiters[key] = self._yf_waiters.get(key, 0) + 1
+
+        try:
+            yf_results = await asyncio.wait_for(asyncio.shield(future), timeout=10.0)
+        except asyncio.TimeoutError:
+            print(f"yfinance 검색 타임아웃 (10초): {query}")
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"yfinance 검색 오류: {e}")
+            return None
+        finally:
+            self._yf_waiters[key] -= 1
+            if self._yf_waiters[key] <= 0:
+                del self._yf_waiters[key]
+                if not future.done():
+                    future.cancel()
+
+        self._yf_search_cache[key] = (now, yf_results)
+        self._yf_search_cache.move_to_end(key)
+        while len(self._yf_search_cache) > YF_SEARCH_CACHE_SIZE:
+            self._yf_search_cache.popitem(last=False)
+        return yf_results
 
     def _yfinance_search(self, query: str) -> List[Dict[str, Any]]:
-        """yfinance를 사용한 검색 (동기)"""
+        """yfinance를 사용한 검색 (동기, 조회 오류는 호출한 쪽에서 처리)"""
         results = []
-        try:
-            search = yf.Search(query, max_results=10)
-            quotes = search.quotes
+        search = yf.Search(query, max_results=10)
 
-            for quote in quotes:
-                symbol = quote.get("symbol", "")
-                name = quote.get("shortname") or quote.get("longname") or symbol
-                exchange = quote.get("exchange", "")
-                quote_type = quote.get("quoteType", "")
+        for quote in search.quotes:
+            symbol = quote.get("symbol", "")
+            name = quote.get("shortname") or quote.get("longname") or symbol
+            exchange = quote.get("exchange", "")
+            quote_type = quote.get("quoteType", "")
 
-                # 주식만 필터
-                if quote_type != "EQUITY":
-                    continue
+            # 주식만 필터
+            if quote_type != "EQUITY":
+                continue
 
-                # 시장 판별
+            # 시장 판별
+            market = "NASDAQ"
+            if exchange in ["NYQ", "NYSE", "ASE", "AMEX", "PCX"]:
+                market = "NYSE"
+            elif exchange in ["NMS", "NGM", "NCM", "NASDAQ"]:
                 market = "NASDAQ"
-                if exchange in ["NYQ", "NYSE"]:
-                    market = "NYSE"
-                elif exchange in ["NMS", "NGM", "NASDAQ"]:
-                    market = "NASDAQ"
-                else:
-                    continue  # 미국 외 거래소는 스킵
-
-                results.append({
-                    "ticker": symbol,
-                    "name": name,
-                    "market": market,
-                    "score": 60
-                })
-
-        except Exception as e:
-            print(f"yfinance search error: {e}")
+            else:
+                continue  # 미국 외 거래소는 스킵
+
+            results.append({
+                "ticker": symbol,
+                "name": name,
+                "market": market,
+                "score": 60
+            })
 
         return results
 
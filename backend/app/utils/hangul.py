@@ -0,0 +1,30 @@
+"""
+한글 초성 처리 (종목 초성 검색용)
+- "삼성전자" → "ㅅㅅㅈㅈ"
+- 한글 음절이 아닌 문자는 그대로 둔다 ("LG에너지솔루션" → "LGㅇㄴㅈㅅㄹㅅ")
+"""
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+# 중성(21) × 종성(28)
+CHOSEONG_STEP = 588
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // CHOSEONG_STEP])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def is_choseong_query(text: str) -> bool:
+    """초성(ㄱ~ㅎ)만으로 이루어진 검색어인지"""
+    text = text.replace(" ", "")
+    return bool(text) and all(ch in CHOSEONG for ch in text)
@@ -0,0 +1,46 @@
+"""
+시장별 정규장 운영 시간 판별
+- 한국 주식: KST 09:00 ~ 15:30 (평일)
+- 미국 주식: ET 09:30 ~ 16:00 (평일)
+- 암호화폐: 24시간
+"""
+from datetime import datetime, time
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.utils.constants import KST
+
+ET = ZoneInfo("America/New_York")
+
+KOREAN_MARKETS = ("KOSPI", "KOSDAQ", "KRX")
+US_MARKETS = ("NASDAQ", "NYSE", "AMEX")
+CRYPTO_MARKETS = ("CRYPTO", "BINANCE")
+
+
+def normalize_market(market: Optional[str], default: str = "KOSPI") -> str:
+    """클라이언트/포지션의 시장 표기를 시세 조회용 시장으로 변환 (KRX → KOSPI, BINANCE → CRYPTO)"""
+    market = (market or default).upper()
+    if market == "KRX":
+        return "KOSPI"
+    if market == "BINANCE":
+        return "CRYPTO"
+    return market
+
+
+def is_market_open(market: str, now: Optional[datetime] = None) -> bool:
+    """해당 시장이 현재 정규장 시간인지 여부 (공휴일은 고려하지 않음)"""
+    market = (market or "").upper()
+    if market in CRYPTO_MARKETS:
+        return True
+
+    if market in KOREAN_MARKETS:
+        tz, open_at, close_at = KST, time(9, 0), time(15, 30)
+    elif market in US_MARKETS:
+        tz, open_at, close_at = ET, time(9, 30), time(16, 0)
+    else:
+        return False
+
+    local = (now or datetime.now(tz)).astimezone(tz)
+    if local.weekday() >= 5:
+        return False
+    return open_at <= local.time() <= close_at
@@ -1,5 +1,5 @@
-from app.websocket.connection_manager import ConnectionManager
+from app.websocket.connection_manager import Connection, ConnectionManager
 
 manager = ConnectionManager()
 
-__all__ = ["manager", "ConnectionManager"]
+__all__ = ["manager", "Connection", "ConnectionManager"]
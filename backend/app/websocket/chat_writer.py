@@ -0,0 +1,161 @@
+"""
+WebSocket 경로의 DB 작업
+- 동기 ORM 호출은 전용 스레드 풀(settings.ws_db_workers)에서 실행 → 이벤트 루프가 막히지 않음
+- 작성자 정보는 연결별로 한 번만 조회하여 Connection.user에 캐시
+- send_message 프레임은 짧은 구간(ws_chat_batch_window) 동안 모아 한 트랜잭션으로 저장한 뒤
+  받은 순서대로 브로드캐스트
+- 배치 저장이 실패하면 (롤백된) 메시지를 한 건씩 다시 저장하고, 그래도 실패한 메시지는
+  보낸 연결에 message_error로 알림
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+from app.schemas.discussion import MessageCreate
+from app.services.discussion_service import DiscussionService
+from app.websocket import manager
+from app.websocket.connection_manager import Connection
+
+PendingMessage = Tuple[Connection, int, MessageCreate]
+
+# 한 건씩 재시도해도 저장하지 못한 메시지 (None은 토론 없음/종료)
+WRITE_FAILED = object()
+
+
+class ChatWriter:
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.ws_db_workers,
+            thread_name_prefix="ws-db"
+        )
+        self._pending: List[PendingMessage] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """fn(db, *args)를 스레드 풀에서 새 세션으로 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._with_session, fn, *args)
+
+    @staticmethod
+    def _with_session(fn: Callable, *args) -> Any:
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    async def get_user(self, connection: Connection) -> Optional[dict]:
+        if connection.user is None:
+            connection.user = await self.run(self._load_user, connection.user_id)
+        return connection.user
+
+    @staticmethod
+    def _load_user(db, user_id: int) -> Optional[dict]:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return None
+        return {"id": user.id, "username": user.username, "full_name": user.full_name}
+
+    # Chat message batching
+    def submit(self, connection: Connection, discussion_id: int, message_data: MessageCreate):
+        self._pending.append((connection, discussion_id, message_data))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(settings.ws_chat_batch_window)
+        while self._pending:
+            batch = self._pending[:settings.ws_chat_batch_max]
+            del self._pending[:len(batch)]
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                print(f"채팅 메시지 저장 오류 ({len(batch)}건): {e}")
+
+    async def _flush(self, batch: List[PendingMessage]):
+        items = [
+            (discussion_id, message_data, connection.user_id)
+            for connection, discussion_id, message_data in batch
+        ]
+        try:
+            results = await self.run(self._write_batch, items)
+        except Exception as e:
+            print(f"채팅 메시지 일괄 저장 오류 ({len(batch)}건), 한 건씩 재시도: {e}")
+            results = [await self._write_one(item) for item in items]
+
+        for (connection, discussion_id, _), message in zip(batch, results):
+            if message is WRITE_FAILED:
+                await manager.send_to_connection(connection, {
+                    "type": "message_error",
+                    "data": {
+                        "discussion_id": discussion_id,
+                        "detail": "Failed to save message"
+                    }
+                })
+                continue
+
+            if message is None:
+                await manager.send_to_connection(connection, {
+                    "type": "message_error",
+                    "data": {
+                        "discussion_id": discussion_id,
+                        "detail": "Discussion not found or closed"
+                    }
+                })
+                continue
+
+            message_data = {**message, "user": connection.user}
+
+            # Broadcast to others (exclude sender)
+            await manager.broadcast_to_discussion(
+                discussion_id,
+                {
+                    "type": "message_received",
+                    "data": message_data
+                },
+                exclude_user=connection.user_id
+            )
+
+            # Send confirmation to sender with message ID
+            await manager.send_personal_message(
+                {
+                    "type": "message_sent",
+                    "data": message_data
+                },
+                connection.user_id
+            )
+
+    async def _write_one(self, item) -> Any:
+        try:
+            return (await self.run(self._write_batch, [item]))[0]
+        except Exception as e:
+            print(f"채팅 메시지 저장 오류 (discussion {item[0]}): {e}")
+            return WRITE_FAILED
+
+    @staticmethod
+    def _write_batch(db, items) -> List[Optional[Dict[str, Any]]]:
+        messages = DiscussionService(db).create_messages(items)
+        return [
+            {
+                "id": message.id,
+                "discussion_id": message.discussion_id,
+                "content": message.content,
+                "message_type": message.message_type,
+                "chart_data": message.chart_data,
+                "created_at": message.created_at.isoformat() if message.created_at else None
+            } if message is not None else None
+            for message in messages
+        ]
+
+    async def stop(self):
+        """남은 메시지 저장 후 스레드 풀 종료"""
+        if self._flusher is not None and not self._flusher.done():
+            await self._flusher
+        self._executor.shutdown(wait=False)
+
+
+# 싱글톤 인스턴스
+chat_writer = ChatWriter()
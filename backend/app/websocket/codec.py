@@ -0,0 +1,129 @@
+"""
+WebSocket 전송 프레임 인코딩
+- json (기본): 기존 {"type", "data"} 형식 그대로 (구버전 클라이언트 호환)
+- compact: 짧은 키 스키마 + price_update 델타, JSON 텍스트 프레임
+- msgpack: compact와 같은 스키마를 MessagePack 바이너리 프레임으로 (msgpack 패키지 필요)
+
+클라이언트는 Sec-WebSocket-Protocol로 원하는 인코딩을 제안하고 (예: "fund.msgpack.v1"),
+서버가 지원하는 첫 번째 것을 골라 accept 시 응답한다. 제안이 없으면 json.
+수신 프레임은 모든 인코딩에서 JSON 텍스트를 그대로 사용한다.
+
+compact 스키마:
+    envelope     {"t": type, "d": data}
+    data/user    아래 KEY_MAP의 키만 짧은 키로 (차트 데이터 등 안쪽 값은 그대로)
+    price_update {"t": "pd", "d": [ticker, price, timestamp(epoch ms)]}
+                 (market/previous_price는 클라이언트가 직전 값으로 유지)
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+Frame = Union[str, bytes]
+
+JSON = "json"
+COMPACT = "compact"
+MSGPACK = "msgpack"
+
+# 서버 선호 순서
+SUBPROTOCOLS = {
+    "fund.msgpack.v1": MSGPACK,
+    "fund.compact.v1": COMPACT,
+}
+
+KEY_MAP = {
+    "id": "i",
+    "ticker": "s",
+    "market": "m",
+    "price": "p",
+    "previous_price": "pp",
+    "timestamp": "ts",
+    "discussion_id": "di",
+    "user_id": "ui",
+    "user": "u",
+    "username": "un",
+    "full_name": "fn",
+    "content": "c",
+    "message": "ms",
+    "message_type": "mt",
+    "chart_data": "cd",
+    "created_at": "ca",
+    "title": "ti",
+    "notification_type": "nt",
+    "related_id": "ri",
+    "related_type": "rt",
+    "is_read": "r",
+}
+
+PRICE_DELTA_TYPE = "pd"
+
+
+def available_encodings() -> Tuple[str, ...]:
+    if msgpack is not None:
+        return (JSON, COMPACT, MSGPACK)
+    return (JSON, COMPACT)
+
+
+def negotiate(offered: Iterable[str]) -> Tuple[str, Optional[str]]:
+    """클라이언트가 제안한 subprotocol 중 지원하는 것 선택 → (encoding, 응답할 subprotocol)"""
+    offered = [p.strip() for p in offered if p]
+    supported = available_encodings()
+    for subprotocol, encoding in SUBPROTOCOLS.items():
+        if subprotocol in offered and encoding in supported:
+            return encoding, subprotocol
+    return JSON, None
+
+
+def dumps(obj: Any) -> str:
+    """기본 JSON 직렬화 (Starlette send_json과 같은 형식, orjson 사용 가능 시 orjson)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _shorten(data: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {}
+    for key, value in data.items():
+        if key == "user" and isinstance(value, dict):
+            value = {KEY_MAP.get(k, k): v for k, v in value.items()}
+        compact[KEY_MAP.get(key, key)] = value
+    return compact
+
+
+def _epoch_ms(timestamp: Any) -> Optional[int]:
+    if not timestamp:
+        return None
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_compact(message: Dict[str, Any]) -> Dict[str, Any]:
+    message_type = message.get("type")
+    data = message.get("data")
+    if message_type == "price_update" and isinstance(data, dict):
+        return {
+            "t": PRICE_DELTA_TYPE,
+            "d": [data.get("ticker"), data.get("price"), _epoch_ms(data.get("timestamp"))]
+        }
+    if isinstance(data, dict):
+        data = _shorten(data)
+    return {"t": message_type, "d": data}
+
+
+def encode(message: Dict[str, Any], encoding: str = JSON) -> Frame:
+    if encoding == MSGPACK:
+        return msgpack.packb(to_compact(message), use_bin_type=True)
+    if encoding == COMPACT:
+        return dumps(to_compact(message))
+    return dumps(message)
@@ -1,102 +1,239 @@
-from typing import Dict, List, Set, Optional
+import asyncio
+from typing import Dict, Iterable, List, Set, Optional
 from fastapi import WebSocket
-import json
+
+from app.config import settings
+from app.websocket import codec
+from app.websocket.pubsub import PubSubBus, create_bus
+
+
+class Connection:
+    """WebSocket 연결 1개와 이 연결이 참여한 토론방/구독 종목 (탭마다 별도)
+
+    전송은 연결별 제한 크기 큐에 넣고, 연결마다 하나의 writer 태스크가 순서대로 보낸다.
+    """
+
+    __slots__ = (
+        "websocket", "user_id", "user", "encoding", "rooms", "tickers", "queue", "writer", "closed", "dropped"
+    )
+
+    def __init__(self, websocket: WebSocket, user_id: int, encoding: str = codec.JSON):
+        self.websocket = websocket
+        self.user_id = user_id
+        # 협상된 전송 인코딩 (json | compact | msgpack)
+        self.encoding = encoding
+        # 작성자 정보 캐시 {id, username, full_name} (첫 메시지 전송 시 1회 조회)
+        self.user: Optional[dict] = None
+        # Reverse indexes: 연결 종료 시 이 연결이 들어간 곳만 정리
+        self.rooms: Set[int] = set()
+        self.tickers: Set[str] = set()
+        # 직렬화된 전송 대기 프레임
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ws_send_queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.closed = False
+        # 느린 클라이언트로 버린 프레임 수 (drop_oldest 정책)
+        self.dropped = 0
 
 
 class ConnectionManager:
     def __init__(self):
-        # Active connections: {user_id: [websocket, ...]}
-        self.active_connections: Dict[int, List[WebSocket]] = {}
-        # Discussion rooms: {discussion_id: {user_id, ...}}
-        self.discussion_rooms: Dict[int, Set[int]] = {}
-        # Price subscriptions: {ticker: {user_id, ...}}
-        self.price_subscriptions: Dict[str, Set[int]] = {}
-
-    async def connect(self, websocket: WebSocket, user_id: int):
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, user_id: int):
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
-
-        # Remove from all discussion rooms
-        for discussion_id, users in list(self.discussion_rooms.items()):
-            if user_id in users:
-                users.remove(user_id)
-                if not users:
-                    del self.discussion_rooms[discussion_id]
-
-        # Remove from all price subscriptions
-        for ticker, users in list(self.price_subscriptions.items()):
-            if user_id in users:
-                users.remove(user_id)
-                if not users:
-                    del self.price_subscriptions[ticker]
+        # Active connections: {user_id: {connection, ...}}
+        self.active_connections: Dict[int, Set[Connection]] = {}
+        # Discussion rooms: {discussion_id: {connection, ...}}
+        self.discussion_rooms: Dict[int, Set[Connection]] = {}
+        # Price subscriptions: {ticker: {connection, ...}}
+        self.price_subscriptions: Dict[str, Set[Connection]] = {}
+        # Market of subscribed tickers: {ticker: market}
+        self.price_markets: Dict[str, str] = {}
+        self.evicted = 0
+        # 워커 간 전달 버스 (기본: 프로세스 내부만)
+        self.bus: PubSubBus = PubSubBus()
+
+    async def start_bus(self, bus: Optional[PubSubBus] = None):
+        """pub/sub 버스 시작 (main.startup_event)"""
+        bus = bus or create_bus()
+        await bus.start(self._deliver)
+        self.bus = bus
+
+    async def stop_bus(self):
+        await self.bus.stop()
+        self.bus = PubSubBus()
+
+    async def connect(self, websocket: WebSocket, user_id: int) -> Connection:
+        # 클라이언트가 제안한 subprotocol로 인코딩 협상 (없으면 기존 JSON)
+        encoding, subprotocol = codec.negotiate(websocket.scope.get("subprotocols", ()))
+        await websocket.accept(subprotocol=subprotocol)
+        connection = Connection(websocket, user_id, encoding)
+        connection.writer = asyncio.get_running_loop().create_task(self._writer(connection))
+        self.active_connections.setdefault(user_id, set()).add(connection)
+        return connection
+
+    def disconnect(self, connection: Connection):
+        if connection.closed:
+            return
+        connection.closed = True
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+        connections = self.active_connections.get(connection.user_id)
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del self.active_connections[connection.user_id]
+
+        # 이 연결이 참여한 방/종목만 정리
+        for discussion_id in list(connection.rooms):
+            self.leave_discussion(discussion_id, connection)
+        for ticker in list(connection.tickers):
+            self.unsubscribe_price(ticker, connection)
+
+    # Outbound queue / writer
+    async def _writer(self, connection: Connection):
+        websocket = connection.websocket
+        try:
+            while True:
+                frame = await connection.queue.get()
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 첫 전송 실패 시 죽은 연결로 보고 즉시 제거
+            self._evict(connection)
+
+    def _enqueue(self, connection: Connection, frame: codec.Frame):
+        if connection.closed:
+            return
+        try:
+            connection.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            if settings.ws_slow_client_policy == "disconnect":
+                self._evict(connection, code=1013)
+                return
+            # drop_oldest: 가장 오래된 프레임을 버리고 최신 프레임 유지
+            connection.queue.get_nowait()
+            connection.dropped += 1
+            connection.queue.put_nowait(frame)
+
+    def _evict(self, connection: Connection, code: int = 1011):
+        if connection.closed:
+            return
+        self.disconnect(connection)
+        self.evicted += 1
+        asyncio.get_running_loop().create_task(self._close_quietly(connection.websocket, code))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    def _fan_out(self, connections: Iterable[Connection], message: dict):
+        # 인코딩별로 한 번만 직렬화
+        frames: Dict[str, codec.Frame] = {}
+        for connection in list(connections):
+            frame = frames.get(connection.encoding)
+            if frame is None:
+                frame = frames[connection.encoding] = codec.encode(message, connection.encoding)
+            self._enqueue(connection, frame)
+
+    # Local delivery / pub/sub
+    def _deliver(self, envelope: dict):
+        """이 프로세스에 연결된 소켓으로 전달 (발행 직후 로컬 전달 + 다른 워커에서 수신한 envelope)"""
+        op = envelope.get("op")
+        message = envelope.get("message")
+        if op == "user":
+            self._fan_out(self.active_connections.get(envelope["user_id"], ()), message)
+        elif op == "users":
+            self._fan_out(
+                (c for user_id in set(envelope["user_ids"]) for c in self.active_connections.get(user_id, ())),
+                message
+            )
+        elif op == "broadcast":
+            self._fan_out((c for cs in self.active_connections.values() for c in cs), message)
+        elif op == "discussion":
+            room = self.discussion_rooms.get(envelope["discussion_id"])
+            if room:
+                exclude_user = envelope.get("exclude_user")
+                self._fan_out(
+                    (c for c in room if not (exclude_user and c.user_id == exclude_user)),
+                    message
+                )
+
+    async def _publish(self, envelope: dict):
+        self._deliver(envelope)
+        if self.bus.distributed:
+            try:
+                await self.bus.publish(envelope)
+            except Exception as e:
+                print(f"pub/sub 발행 오류 ({envelope.get('op')}): {e}")
+
+    async def send_to_connection(self, connection: Connection, message: dict):
+        self._enqueue(connection, codec.encode(message, connection.encoding))
 
     async def send_personal_message(self, message: dict, user_id: int):
-        if user_id in self.active_connections:
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.send_json(message)
-                except Exception:
-                    pass
+        await self._publish({"op": "user", "user_id": user_id, "message": message})
 
     async def send_to_users(self, user_ids: List[int], message: dict):
-        for user_id in user_ids:
-            await self.send_personal_message(message, user_id)
+        await self._publish({"op": "users", "user_ids": list(user_ids), "message": message})
 
     async def broadcast(self, message: dict):
-        for user_id in self.active_connections:
-            await self.send_personal_message(message, user_id)
+        await self._publish({"op": "broadcast", "message": message})
 
     # Discussion room methods
-    def join_discussion(self, discussion_id: int, user_id: int):
-        if discussion_id not in self.discussion_rooms:
-            self.discussion_rooms[discussion_id] = set()
-        self.discussion_rooms[discussion_id].add(user_id)
-
-    def leave_discussion(self, discussion_id: int, user_id: int):
-        if discussion_id in self.discussion_rooms:
-            self.discussion_rooms[discussion_id].discard(user_id)
-            if not self.discussion_rooms[discussion_id]:
+    def join_discussion(self, discussion_id: int, connection: Connection):
+        self.discussion_rooms.setdefault(discussion_id, set()).add(connection)
+        connection.rooms.add(discussion_id)
+
+    def leave_discussion(self, discussion_id: int, connection: Connection):
+        connection.rooms.discard(discussion_id)
+        room = self.discussion_rooms.get(discussion_id)
+        if room is not None:
+            room.discard(connection)
+            if not room:
                 del self.discussion_rooms[discussion_id]
 
     async def broadcast_to_discussion(self, discussion_id: int, message: dict, exclude_user: Optional[int] = None):
-        if discussion_id in self.discussion_rooms:
-            for user_id in self.discussion_rooms[discussion_id]:
-                if exclude_user and user_id == exclude_user:
-                    continue
-                await self.send_personal_message(message, user_id)
+        await self._publish({
+            "op": "discussion",
+            "discussion_id": discussion_id,
+            "exclude_user": exclude_user,
+            "message": message
+        })
 
     def get_discussion_participants(self, discussion_id: int) -> Set[int]:
-        return self.discussion_rooms.get(discussion_id, set())
+        return {c.user_id for c in self.discussion_rooms.get(discussion_id, ())}
 
     # Price subscription methods
-    def subscribe_price(self, ticker: str, user_id: int):
-        if ticker not in self.price_subscriptions:
-            self.price_subscriptions[ticker] = set()
-        self.price_subscriptions[ticker].add(user_id)
-
-    def unsubscribe_price(self, ticker: str, user_id: int):
-        if ticker in self.price_subscriptions:
-            self.price_subscriptions[ticker].discard(user_id)
-            if not self.price_subscriptions[ticker]:
+    def subscribe_price(self, ticker: str, connection: Connection, market: Optional[str] = None):
+        self.price_subscriptions.setdefault(ticker, set()).add(connection)
+        connection.tickers.add(ticker)
+        if market:
+            self.price_markets[ticker] = market
+
+    def unsubscribe_price(self, ticker: str, connection: Connection):
+        connection.tickers.discard(ticker)
+        subscribers = self.price_subscriptions.get(ticker)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
                 del self.price_subscriptions[ticker]
+                self.price_markets.pop(ticker, None)
 
     async def broadcast_price_update(self, ticker: str, price_data: dict):
-        if ticker in self.price_subscriptions:
+        subscribers = self.price_subscriptions.get(ticker)
+        if subscribers:
             message = {
                 "type": "price_update",
                 "data": price_data
             }
-            for user_id in self.price_subscriptions[ticker]:
-                await self.send_personal_message(message, user_id)
+            self._fan_out(subscribers, message)
 
     def get_subscribed_tickers(self) -> List[str]:
         return list(self.price_subscriptions.keys())
+
+    def get_price_market(self, ticker: str) -> Optional[str]:
+        return self.price_markets.get(ticker)
@@ -1,26 +1,22 @@
-from fastapi import WebSocket, Depends
-from sqlalchemy.orm import Session
-
-from app.database import get_db
-from app.websocket.connection_manager import ConnectionManager
-from app.services.discussion_service import DiscussionService
+from app.websocket.connection_manager import Connection, ConnectionManager
+from app.websocket.chat_writer import chat_writer
+from app.services.price_stream import price_stream
 from app.schemas.discussion import MessageCreate
 
 
 async def handle_websocket_message(
-    websocket: WebSocket,
+    connection: Connection,
     data: dict,
-    user_id: int,
-    manager: ConnectionManager,
-    db: Session
+    manager: ConnectionManager
 ):
+    user_id = connection.user_id
     message_type = data.get("type")
     payload = data.get("data", {})
 
     if message_type == "join_discussion":
         discussion_id = payload.get("discussion_id")
         if discussion_id:
-            manager.join_discussion(discussion_id, user_id)
+            manager.join_discussion(discussion_id, connection)
             await manager.broadcast_to_discussion(
                 discussion_id,
                 {
@@ -36,7 +32,7 @@ async def handle_websocket_message(
     elif message_type == "leave_discussion":
         discussion_id = payload.get("discussion_id")
         if discussion_id:
-            manager.leave_discussion(discussion_id, user_id)
+            manager.leave_discussion(discussion_id, connection)
             await manager.broadcast_to_discussion(
                 discussion_id,
                 {
@@ -55,52 +51,25 @@ async def handle_websocket_message(
         chart_data = payload.get("chart_data")
 
         if discussion_id and content:
-            discussion_service = DiscussionService(db)
-            message = discussion_service.create_message(
-                discussion_id,
-                MessageCreate(content=content, message_type=msg_type, chart_data=chart_data),
-                user_id
-            )
-
-            message_data = {
-                "id": message.id,
-                "discussion_id": message.discussion_id,
-                "user": {
-                    "id": message.user.id,
-                    "username": message.user.username,
-                    "full_name": message.user.full_name
-                },
-                "content": message.content,
-                "message_type": message.message_type,
-                "chart_data": message.chart_data,
-                "created_at": message.created_at.isoformat() if message.created_at else None
-            }
-
-            # Broadcast to others (exclude sender)
-            await manager.broadcast_to_discussion(
+            # 작성자 정보는 연결별 캐시, 저장은 배치로 모아 스레드 풀에서 (브로드캐스트는 저장 후)
+            if await chat_writer.get_user(connection) is None:
+                return
+            chat_writer.submit(
+                connection,
                 discussion_id,
-                {
-                    "type": "message_received",
-                    "data": message_data
-                },
-                exclude_user=user_id
-            )
-
-            # Send confirmation to sender with message ID
-            await manager.send_personal_message(
-                {
-                    "type": "message_sent",
-                    "data": message_data
-                },
-                user_id
+                MessageCreate(content=content, message_type=msg_type, chart_data=chart_data)
             )
 
     elif message_type == "subscribe_price":
         ticker = payload.get("ticker")
         if ticker:
-            manager.subscribe_price(ticker, user_id)
+            manager.subscribe_price(ticker, connection, payload.get("market"))
+            # 이미 추적 중인 종목이면 마지막 시세를 바로 전달 (다음 변경까지 기다리지 않도록)
+            last = price_stream.last_price(ticker)
+            if last:
+                await manager.send_to_connection(connection, {"type": "price_update", "data": last})
 
     elif message_type == "unsubscribe_price":
         ticker = payload.get("ticker")
         if ticker:
-            manager.unsubscribe_price(ticker, user_id)
+            manager.unsubscribe_price(ticker, connection)
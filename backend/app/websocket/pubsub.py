@@ -0,0 +1,278 @@
+"""
+WebSocket 메시지 pub/sub 버스 (여러 워커/컨테이너 간 전달)
+- memory: 프로세스 내부 전달만 (기본값, 단일 워커)
+- postgres: LISTEN/NOTIFY (기존 PostgreSQL 사용, 추가 인프라 없음)
+- redis: Redis Pub/Sub (redis 패키지 필요)
+
+ConnectionManager가 보내는 메시지를 envelope로 감싸 발행하고, 각 워커는 수신한 envelope를
+자기 프로세스에 연결된 소켓에만 전달한다. 발행한 워커는 즉시 로컬 전달하므로
+자기 자신이 발행한 envelope(origin이 같은 것)는 무시한다.
+
+postgres: NOTIFY payload 한도(8000 bytes)를 넘는 envelope는 ws_pubsub_payloads 테이블에 저장하고
+NOTIFY에는 {"origin", "ref": id} 포인터만 보낸다. 수신 워커는 id로 본문을 읽어 전달한다.
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.websocket.codec import dumps
+
+Handler = Callable[[Dict[str, Any]], None]
+
+# NOTIFY payload 최대 크기 (8000 bytes) 여유분
+PG_NOTIFY_MAX_BYTES = 7900
+
+
+class PubSubBus:
+    """in-process 버스 (다른 프로세스로 전달하지 않음)"""
+
+    distributed = False
+
+    def __init__(self):
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[Handler] = None
+
+    async def start(self, handler: Handler) -> None:
+        self._handler = handler
+
+    async def stop(self) -> None:
+        self._handler = None
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        """다른 워커로 발행 (로컬 전달은 ConnectionManager가 직접 수행)"""
+        return None
+
+    def _dispatch(self, raw: str) -> None:
+        try:
+            envelope = json.loads(raw)
+        except ValueError:
+            return
+        if envelope.get("origin") == self.origin or self._handler is None:
+            return
+        try:
+            self._handler(envelope)
+        except Exception as e:
+            print(f"pub/sub 메시지 처리 오류: {e}")
+
+    def _encode(self, envelope: Dict[str, Any]) -> str:
+        return dumps({**envelope, "origin": self.origin})
+
+
+class PostgresBus(PubSubBus):
+    """PostgreSQL LISTEN/NOTIFY
+
+    수신은 전용 psycopg2 연결의 소켓을 이벤트 루프 reader로 감시하고,
+    발행은 SQLAlchemy 커넥션 풀로 pg_notify를 실행한다 (executor).
+    수신한 payload는 큐에 넣어 순서대로 처리한다 (포인터 본문 조회 중에도 뒤 메시지가 앞지르지 않음).
+    """
+
+    distributed = True
+
+    def __init__(self, channel: str):
+        super().__init__()
+        self.channel = channel
+        self._listen_conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._received: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self, handler: Handler) -> None:
+        await super().start(handler)
+        self._loop = asyncio.get_running_loop()
+        self._received = asyncio.Queue()
+        self._consumer = self._loop.create_task(self._consume())
+        await self._loop.run_in_executor(None, self._open_listener)
+        self._loop.add_reader(self._listen_conn.fileno(), self._on_readable)
+
+    async def stop(self) -> None:
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._consumer:
+            self._consumer.cancel()
+        self._close_listener()
+        await super().stop()
+
+    def _open_listener(self) -> None:
+        import psycopg2
+        from app.database import engine
+
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(dsn)
+        conn.set_session(autocommit=True)
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN "{self.channel}"')
+        self._listen_conn = conn
+
+    def _close_listener(self) -> None:
+        if self._listen_conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._listen_conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._listen_conn.close()
+        except Exception:
+            pass
+        self._listen_conn = None
+
+    def _on_readable(self) -> None:
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            print(f"Postgres LISTEN 연결 오류: {e}")
+            self._close_listener()
+            if not self._reconnect_task or self._reconnect_task.done():
+                self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+        while conn.notifies:
+            self._received.put_nowait(conn.notifies.pop(0).payload)
+
+    async def _consume(self) -> None:
+        while True:
+            raw = await self._received.get()
+            try:
+                raw = await self._resolve(raw)
+            except Exception as e:
+                print(f"pub/sub 메시지 본문 조회 오류: {e}")
+                continue
+            if raw is not None:
+                self._dispatch(raw)
+
+    async def _resolve(self, raw: str) -> Optional[str]:
+        """포인터 payload면 저장된 envelope 본문을 읽어 반환 (자기 발행분은 조회하지 않음)"""
+        try:
+            pointer = json.loads(raw)
+        except ValueError:
+            return None
+        if "ref" not in pointer or pointer.get("origin") == self.origin:
+            return raw
+        payload = await self._loop.run_in_executor(None, self._load_payload, pointer["ref"])
+        if payload is None:
+            print(f"pub/sub 메시지 본문이 없음 (ref={pointer['ref']}, 보관 기간 초과)")
+        return payload
+
+    def _load_payload(self, ref: int) -> Optional[str]:
+        from sqlalchemy import select
+        from app.database import engine
+        from app.models.ws_pubsub_payload import WsPubSubPayload
+
+        with engine.connect() as conn:
+            return conn.execute(
+                select(WsPubSubPayload.payload).where(WsPubSubPayload.id == ref)
+            ).scalar_one_or_none()
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while self._handler is not None:
+            await asyncio.sleep(delay)
+            try:
+                await self._loop.run_in_executor(None, self._open_listener)
+                self._loop.add_reader(self._listen_conn.fileno(), self._on_readable)
+                print("Postgres LISTEN 재연결 완료")
+                return
+            except Exception as e:
+                print(f"Postgres LISTEN 재연결 실패: {e}")
+                delay = min(delay * 2, 30.0)
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        payload = self._encode(envelope)
+        loop = asyncio.get_running_loop()
+        if len(payload.encode("utf-8")) > PG_NOTIFY_MAX_BYTES:
+            await loop.run_in_executor(None, self._notify_pointer, payload)
+        else:
+            await loop.run_in_executor(None, self._notify, payload)
+
+    def _notify(self, payload: str) -> None:
+        from sqlalchemy import text
+        from app.database import engine
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            conn.commit()
+
+    def _notify_pointer(self, payload: str) -> None:
+        """본문을 테이블에 저장하고 id만 NOTIFY (NOTIFY는 커밋 시 전달되므로 수신 측에서 행이 보임)"""
+        from sqlalchemy import delete, insert, text
+        from app.database import engine
+        from app.models.ws_pubsub_payload import WsPubSubPayload
+
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.ws_pubsub_payload_retention_seconds)
+        with engine.begin() as conn:
+            conn.execute(delete(WsPubSubPayload).where(WsPubSubPayload.created_at < cutoff))
+            ref = conn.execute(
+                insert(WsPubSubPayload)
+                .values(channel=self.channel, payload=payload, created_at=now)
+                .returning(WsPubSubPayload.id)
+            ).scalar_one()
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": dumps({"origin": self.origin, "ref": ref})}
+            )
+
+
+class RedisBus(PubSubBus):
+    """Redis Pub/Sub (redis>=5, redis.asyncio)"""
+
+    distributed = True
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: Handler) -> None:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("WS_PUBSUB_BACKEND=redis 사용 시 redis 패키지가 필요합니다")
+        await super().start(handler)
+        self._redis = aioredis.from_url(self.url)
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        await super().stop()
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                delay = 1.0
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        data = item["data"]
+                        self._dispatch(data.decode("utf-8") if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis 구독 오류: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        await self._redis.publish(self.channel, self._encode(envelope))
+
+
+def create_bus() -> PubSubBus:
+    backend = settings.ws_pubsub_backend.lower()
+    if backend == "postgres":
+        return PostgresBus(settings.ws_pubsub_channel)
+    if backend == "redis":
+        return RedisBus(settings.redis_url, settings.ws_pubsub_channel)
+    return PubSubBus()
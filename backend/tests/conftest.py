@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# 테스트는 외부 DB/키 없이 임시 SQLite 파일로 실행 (app.config 로드 전에 설정)
+_db_file = os.path.join(tempfile.mkdtemp(prefix="fund-tests-"), "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_file}")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db():
+    """테이블을 새로 만든 세션 (테스트 끝나면 모두 삭제)"""
+    import app.models  # noqa: F401
+    from app.models.push_subscription import PushSubscription  # noqa: F401
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,88 @@
+import pandas as pd
+from yfinance import utils
+
+from app.services.price_service import price_service
+
+
+def test_empty_yfinance_frame_yields_no_candles():
+    assert price_service._frame_to_candles(utils.empty_df()) == []
+    columns = price_service._frame_to_columns(utils.empty_df())
+    assert all(len(values) == 0 for values in columns.values())
+
+
+def test_frame_rows_become_candles():
+    index = pd.DatetimeIndex(["2026-01-02", "2026-01-05"], tz="America/New_York")
+    hist = pd.DataFrame(
+        {"Open": [10, 11], "High": [12, 13], "Low": [9, 10], "Close": [11, 12], "Volume": [100, None]},
+        index=index
+    )
+    candles = price_service._frame_to_candles(hist)
+    assert [c["time"] for c in candles] == [int(t.timestamp()) for t in index]
+    assert candles[1]["volume"] == 0
+
+
+class FailingTicker:
+    """history 호출마다 rate limit 오류 (또는 빈 결과)"""
+
+    calls = 0
+    result = None
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        FailingTicker.calls += 1
+        if FailingTicker.result is None:
+            raise RuntimeError("Too Many Requests. Rate limited.")
+        return FailingTicker.result
+
+
+def _seed_series(db):
+    from datetime import datetime, timedelta
+    from app.services.candle_store import candle_store
+
+    candles = [
+        {"time": 1_700_000_000 + i * 86400, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}
+        for i in range(3)
+    ]
+    series = candle_store.save(db, "AAPL", "1d", candles, name="Apple")
+    series.fetched_at = datetime.utcnow() - timedelta(days=1)
+    db.commit()
+    return candles
+
+
+def _use_ticker(monkeypatch, result):
+    from app.services import price_service as price_service_module
+    from app.services.candle_store import candle_store
+
+    FailingTicker.calls = 0
+    FailingTicker.result = result
+    monkeypatch.setattr(price_service_module.yf, "Ticker", FailingTicker)
+    monkeypatch.setattr(candle_store, "_backfill_retry_at", {})
+
+
+def test_upstream_failure_serves_local_candles_and_backs_off(db, monkeypatch):
+    candles = _seed_series(db)
+    _use_ticker(monkeypatch, None)
+    before = candles[-1]["time"] + 1
+
+    first = price_service._fetch_yfinance_candles("AAPL", "1d", 10, before=before)
+    assert [c["time"] for c in first["candles"]] == [c["time"] for c in candles]
+    assert first["name"] == "Apple"
+    assert FailingTicker.calls == 2  # 최근 구간 갱신 + 과거 구간 채우기
+
+    # 실패한 과거 구간 채우기는 바로 다시 받지 않음 (최근 구간 갱신만 재시도)
+    second = price_service._fetch_yfinance_candles("AAPL", "1d", 10, before=before)
+    assert len(second["candles"]) == 3
+    assert FailingTicker.calls == 3
+
+
+def test_empty_backfill_is_deferred(db, monkeypatch):
+    from app.services.candle_store import candle_store
+
+    candles = _seed_series(db)
+    _use_ticker(monkeypatch, utils.empty_df())
+
+    result = price_service._fetch_yfinance_candles("AAPL", "1d", 10, before=candles[-1]["time"] + 1)
+    assert len(result["candles"]) == 3
+    assert not candle_store.backfill_due("AAPL", "1d")
@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.schemas.discussion import MessageCreate
+from app.websocket import chat_writer as chat_writer_module
+from app.websocket.chat_writer import ChatWriter
+
+
+class FakeManager:
+    def __init__(self):
+        self.errors = []
+        self.sent = []
+
+    async def send_to_connection(self, connection, message):
+        self.errors.append((connection.user_id, message))
+
+    async def broadcast_to_discussion(self, discussion_id, message, exclude_user=None):
+        pass
+
+    async def send_personal_message(self, message, user_id):
+        self.sent.append((user_id, message["data"]["content"]))
+
+
+def test_failed_batch_is_retried_per_message_and_failures_reported(monkeypatch):
+    calls = []
+
+    def write_batch(db, items):
+        calls.append(len(items))
+        if any(message.content == "bad" for _, message, _ in items):
+            raise RuntimeError("db error")
+        return [{"id": i, "content": message.content} for i, (_, message, _) in enumerate(items)]
+
+    fake = FakeManager()
+    monkeypatch.setattr(chat_writer_module, "manager", fake)
+    monkeypatch.setattr(ChatWriter, "_write_batch", staticmethod(write_batch))
+    monkeypatch.setattr(ChatWriter, "_with_session", staticmethod(lambda fn, *args: fn(None, *args)))
+
+    async def scenario():
+        writer = ChatWriter()
+        for user_id, content in ((1, "hello"), (2, "bad"), (3, "world")):
+            connection = SimpleNamespace(user_id=user_id, user={"id": user_id})
+            writer.submit(connection, 10, MessageCreate(content=content))
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert calls == [3, 1, 1, 1]
+    assert fake.sent == [(1, "hello"), (3, "world")]
+    assert [(user_id, m["type"]) for user_id, m in fake.errors] == [(2, "message_error")]
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+from app.config import settings
+from app.models.notification_delivery import NotificationDelivery, DeliveryChannel, DeliveryStatus
+from app.models.push_subscription import PushSubscription
+from app.models.user import User
+from app.services import notification_dispatcher as dispatcher_module
+from app.services.notification_dispatcher import NotificationDispatcher, batch_size
+from app.services.notification_service import NotificationService
+from app.services.push_service import PushService
+
+
+def _seed(db, devices: int) -> int:
+    user = User(email="u@test", username="u", password_hash="x", full_name="U", role="member")
+    db.add(user)
+    db.flush()
+    for i in range(devices):
+        db.add(PushSubscription(user_id=user.id, endpoint=f"https://push/{i}", p256dh="k", auth="a"))
+    db.commit()
+    NotificationService(db).create_notification(user.id, "test", "title", "message")
+    return user.id
+
+
+def _statuses(db):
+    db.expire_all()
+    return {
+        (row.channel, row.id): row.status
+        for row in db.query(NotificationDelivery).all()
+    }
+
+
+def test_push_batch_fits_within_lease():
+    rounds = settings.notification_lease_seconds // settings.push_timeout - 1
+    assert batch_size(DeliveryChannel.PUSH.value) == min(
+        settings.notification_dispatch_batch, settings.notification_dispatch_workers * rounds
+    )
+    assert batch_size(DeliveryChannel.WEBSOCKET.value) == settings.notification_dispatch_batch
+
+
+def test_slow_push_does_not_delay_websocket_and_is_recorded_per_row(db, monkeypatch):
+    monkeypatch.setattr(settings, "vapid_public_key", "pub")
+    monkeypatch.setattr(settings, "vapid_private_key", "priv")
+    _seed(db, devices=3)
+    monkeypatch.setattr(settings, "notification_dispatch_workers", 1)
+
+    push_threads = set()
+
+    def slow_deliver(subscription, payload):
+        push_threads.add(threading.current_thread().name)
+        time.sleep(0.3)
+        return True
+
+    sent_ws = []
+
+    class FakeManager:
+        async def send_personal_message(self, message, user_id):
+            sent_ws.append(user_id)
+
+    monkeypatch.setattr(PushService, "deliver", staticmethod(slow_deliver))
+    import app.websocket
+    monkeypatch.setattr(app.websocket, "manager", FakeManager())
+
+    def count(statuses, channel):
+        return [s for (c, _), s in statuses.items() if c == channel].count(DeliveryStatus.SENT.value)
+
+    async def wait_for(condition, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            statuses = _statuses(db)
+            if condition(statuses):
+                return statuses
+            await asyncio.sleep(0.02)
+        raise AssertionError("timeout")
+
+    async def scenario():
+        dispatcher = NotificationDispatcher()
+        dispatcher.start()
+        try:
+            dispatcher.wake()
+            # WebSocket 행은 Push 전송(3건 × 0.3초, 스레드 1개)과 무관하게 먼저 기록됨
+            early = await wait_for(lambda s: count(s, DeliveryChannel.WEBSOCKET.value) == 1)
+            # 끝난 Push 행은 배치 전체를 기다리지 않고 기록됨
+            middle = await wait_for(lambda s: count(s, DeliveryChannel.PUSH.value) >= 1)
+            final = await wait_for(lambda s: set(s.values()) == {DeliveryStatus.SENT.value})
+            return early, middle, final
+        finally:
+            await dispatcher.stop()
+
+    early, middle, final = asyncio.run(scenario())
+
+    assert count(early, DeliveryChannel.PUSH.value) < 3
+    assert sent_ws
+    assert count(middle, DeliveryChannel.PUSH.value) < 3
+
+    assert set(final.values()) == {DeliveryStatus.SENT.value}
+    assert push_threads and all(name.startswith("notify-push") for name in push_threads)
+    assert dispatcher_module.CHANNELS == (DeliveryChannel.WEBSOCKET.value, DeliveryChannel.PUSH.value)
@@ -0,0 +1,36 @@
+import asyncio
+
+from app.models.position import Position
+from app.services.price_service import price_service
+from app.services.price_stream import PriceStream
+from app.websocket import manager
+
+
+class FakeConnection:
+    def __init__(self):
+        self.tickers = set()
+
+
+def test_unknown_market_uses_position_record_or_is_skipped(db, monkeypatch):
+    db.add(Position(ticker="BTC", market="BINANCE"))
+    db.commit()
+
+    requested = []
+
+    async def refresh_prices(pairs):
+        requested.extend(pairs)
+        return {}
+
+    monkeypatch.setattr(price_service, "refresh_prices", refresh_prices)
+    monkeypatch.setattr(manager, "price_subscriptions", {})
+    monkeypatch.setattr(manager, "price_markets", {})
+    connection = FakeConnection()
+    for ticker in ("BTC", "ZZZ"):
+        manager.subscribe_price(ticker, connection)
+    manager.subscribe_price("AAPL", connection, "NASDAQ")
+
+    asyncio.run(PriceStream().poll_once())
+
+    assert sorted(requested) == [("AAPL", "NASDAQ"), ("BTC", "CRYPTO")]
+    assert manager.get_price_market("BTC") == "BINANCE"
+    assert manager.get_price_market("ZZZ") is None
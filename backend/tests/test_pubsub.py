@@ -0,0 +1,133 @@
+import asyncio
+import socket
+from collections import namedtuple
+
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.models.ws_pubsub_payload import WsPubSubPayload
+from app.websocket.pubsub import PG_NOTIFY_MAX_BYTES, PostgresBus
+
+Notify = namedtuple("Notify", "payload")
+
+
+class FakeListener:
+    """psycopg2 LISTEN 연결 대역 (소켓으로 이벤트 루프 reader를 깨움)"""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self.notifies = []
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def poll(self):
+        try:
+            self._reader.recv(4096)
+        except BlockingIOError:
+            pass
+
+    def push(self, payload):
+        self.notifies.append(Notify(payload))
+        self._writer.send(b"x")
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+@pytest.fixture
+def fake_postgres(db, monkeypatch):
+    """SQLite에 pg_notify()를 등록하고 LISTEN 연결을 FakeListener로 대체
+
+    PostgreSQL처럼 NOTIFY는 트랜잭션이 커밋될 때 전달하고, 롤백되면 버린다.
+    """
+    listeners = []
+    sent = []
+    pending = {}
+    dialect = engine.dialect
+    do_commit, do_rollback = dialect.do_commit, dialect.do_rollback
+
+    def register(dbapi_conn, _):
+        queued = pending.setdefault(dbapi_conn, [])
+
+        def pg_notify(channel, payload):
+            sent.append(payload)
+            queued.append(payload)
+
+        dbapi_conn.create_function("pg_notify", 2, pg_notify)
+
+    def commit(dbapi_conn):
+        do_commit(dbapi_conn)
+        queued = pending.get(dbapi_conn.dbapi_connection, [])
+        for payload in queued:
+            for listener in listeners:
+                listener.push(payload)
+        queued.clear()
+
+    def rollback(dbapi_conn):
+        do_rollback(dbapi_conn)
+        pending.get(dbapi_conn.dbapi_connection, []).clear()
+
+    def open_listener(self):
+        self._listen_conn = FakeListener()
+        listeners.append(self._listen_conn)
+
+    engine.dispose()
+    event.listen(engine, "connect", register)
+    monkeypatch.setattr(dialect, "do_commit", commit)
+    monkeypatch.setattr(dialect, "do_rollback", rollback)
+    monkeypatch.setattr(PostgresBus, "_open_listener", open_listener)
+    try:
+        yield sent
+    finally:
+        event.remove(engine, "connect", register)
+        engine.dispose()
+
+
+async def _deliver_between_workers(envelopes):
+    received = []
+    publisher, subscriber = PostgresBus("fund_ws"), PostgresBus("fund_ws")
+    await publisher.start(lambda envelope: None)
+    await subscriber.start(received.append)
+    try:
+        for envelope in envelopes:
+            await publisher.publish(envelope)
+        for _ in range(200):
+            if len(received) == len(envelopes):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await publisher.stop()
+        await subscriber.stop()
+    return received
+
+
+def _envelopes():
+    big = {"op": "broadcast", "message": {"type": "snapshot", "data": "가" * PG_NOTIFY_MAX_BYTES}}
+    small = {"op": "user", "user_id": 1, "message": {"type": "ping"}}
+    return [big, small]
+
+
+def test_oversized_envelope_reaches_other_worker_in_order(fake_postgres, db):
+    envelopes = _envelopes()
+    received = asyncio.run(_deliver_between_workers(envelopes))
+
+    assert [{k: v for k, v in r.items() if k != "origin"} for r in received] == envelopes
+    # 큰 envelope는 NOTIFY에 포인터만 실림
+    assert all(len(p.encode("utf-8")) <= PG_NOTIFY_MAX_BYTES for p in fake_postgres)
+    assert '"ref"' in fake_postgres[0]
+    assert db.query(WsPubSubPayload).count() == 1
+
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="DATABASE_URL이 PostgreSQL일 때만 실행 (실제 LISTEN/NOTIFY)"
+)
+def test_oversized_envelope_reaches_other_worker_on_postgres(db):
+    envelopes = _envelopes()
+    received = asyncio.run(_deliver_between_workers(envelopes))
+
+    assert [{k: v for k, v in r.items() if k != "origin"} for r in received] == envelopes
@@ -0,0 +1,73 @@
+import asyncio
+
+from app.services.quote_cache import QuoteCache
+
+
+def test_waiter_retries_when_leader_is_cancelled():
+    async def scenario():
+        cache = QuoteCache()
+        calls = []
+
+        async def slow_fetch():
+            calls.append("slow")
+            await asyncio.sleep(10)
+            return 1.0
+
+        async def fast_fetch():
+            calls.append("fast")
+            return 2.0
+
+        leader = asyncio.create_task(cache.get("CRYPTO", "BTC", slow_fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get("CRYPTO", "BTC", fast_fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        value = await asyncio.wait_for(waiter, timeout=1)
+        assert value == 2.0
+        assert calls == ["slow", "fast"]
+        assert leader.cancelled()
+        assert cache._inflight == {}
+
+    asyncio.run(scenario())
+
+
+def test_batch_waiter_gets_none_when_leader_is_cancelled():
+    async def scenario():
+        cache = QuoteCache()
+
+        async def slow_batch(pairs):
+            await asyncio.sleep(10)
+            return {pair: 1.0 for pair in pairs}
+
+        leader = asyncio.create_task(cache.get_many([("CRYPTO", "BTC")], slow_batch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_many([("CRYPTO", "BTC")], slow_batch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert result == {("CRYPTO", "BTC"): None}
+        assert cache._inflight == {}
+
+    asyncio.run(scenario())
+
+
+def test_waiter_cancellation_does_not_cancel_leader():
+    async def scenario():
+        cache = QuoteCache()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return 3.0
+
+        leader = asyncio.create_task(cache.get("CRYPTO", "ETH", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get("CRYPTO", "ETH", fetch))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        assert await leader == 3.0
+        assert waiter.cancelled()
+
+    asyncio.run(scenario())
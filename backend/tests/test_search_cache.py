@@ -0,0 +1,40 @@
+import asyncio
+
+from app.config import settings
+from app.services import stock_search_service as search_module
+from app.services.search_index import SearchIndex
+from app.services.stock_search_service import StockSearchService
+
+
+def _service(monkeypatch, yf_search):
+    service = StockSearchService()
+    service._us_index = SearchIndex([])
+    monkeypatch.setattr(service, "schedule_us_refresh", lambda: None)
+    monkeypatch.setattr(service, "_yfinance_search", yf_search)
+    monkeypatch.setattr(search_module, "YFINANCE_AVAILABLE", True)
+    return service
+
+
+def test_failed_upstream_search_is_cached_briefly(monkeypatch):
+    calls = []
+
+    def flaky(query):
+        calls.append(query)
+        if len(calls) == 1:
+            raise RuntimeError("timeout")
+        return [{"ticker": "ZETA", "name": "Zeta", "market": "NYSE", "score": 60}]
+
+    service = _service(monkeypatch, flaky)
+    clock = [1000.0]
+    monkeypatch.setattr(search_module.time, "monotonic", lambda: clock[0])
+
+    async def search():
+        return await service.search_stocks("zeta", "NYSE", 20)
+
+    assert asyncio.run(search()) == []
+    clock[0] += settings.search_degraded_cache_ttl + 1
+    assert [r["ticker"] for r in asyncio.run(search())] == ["ZETA"]
+    # 성공한 결과는 전체 TTL 동안 캐시
+    clock[0] += settings.search_degraded_cache_ttl + 1
+    asyncio.run(search())
+    assert len(calls) == 2
@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.api.prices import search_stocks
+from app.services.stock_search_service import stock_search_service
+
+USER = SimpleNamespace(id=1)
+
+
+def _run_pair(monkeypatch, first_client, second_client):
+    async def slow_search(query, market=None, limit=20):
+        await asyncio.sleep(0.05)
+        return [{"ticker": query}]
+
+    monkeypatch.setattr(stock_search_service, "search_stocks", slow_search)
+
+    async def scenario():
+        first = asyncio.ensure_future(search_stocks("AAA", None, 20, first_client, USER))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(search_stocks("BBB", None, 20, second_client, USER))
+        return [r.data for r in await asyncio.gather(first, second)]
+
+    return asyncio.run(scenario())
+
+
+def test_same_input_supersedes_previous_search(monkeypatch):
+    first, second = _run_pair(monkeypatch, "tab-a", "tab-a")
+    assert first["superseded"] is True
+    assert second["results"] == [{"ticker": "BBB"}]
+
+
+def test_other_tab_of_same_user_is_not_cancelled(monkeypatch):
+    first, second = _run_pair(monkeypatch, "tab-a", "tab-b")
+    assert "superseded" not in first and first["results"] == [{"ticker": "AAA"}]
+    assert second["results"] == [{"ticker": "BBB"}]
+
+
+def test_without_client_id_nothing_is_cancelled(monkeypatch):
+    first, second = _run_pair(monkeypatch, None, None)
+    assert first["results"] == [{"ticker": "AAA"}]
+    assert second["results"] == [{"ticker": "BBB"}]
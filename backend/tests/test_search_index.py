@@ -0,0 +1,25 @@
+import pytest
+
+from app.services import search_index as search_index_module
+from app.services.search_index import SearchIndex
+
+
+def _entries():
+    # 티커 접두어 종목이 limit보다 많고, 종목명 정확 일치 종목 중 하나는 티커도 접두어 일치
+    entries = [{"ticker": f"SAM{i}", "name": f"Other {i}", "market": "NASDAQ"} for i in range(5)]
+    entries.append({"ticker": "SAMX", "name": "Sam", "market": "NASDAQ"})
+    entries.append({"ticker": "ZZZ", "name": "Sam", "market": "NASDAQ"})
+    return entries
+
+
+@pytest.mark.parametrize("linear_max", [500, 0])
+def test_ticker_prefix_is_checked_before_exact_name(monkeypatch, linear_max):
+    monkeypatch.setattr(search_index_module, "LINEAR_SCORE_MAX", linear_max)
+    index = SearchIndex(_entries())
+
+    scores = {r["ticker"]: r["score"] for r in index.search("sam", limit=50)}
+    assert scores["ZZZ"] == 95
+    assert scores["SAMX"] == 90
+
+    top = index.search("sam", limit=2)
+    assert [r["ticker"] for r in top] == ["ZZZ", "SAM0"]
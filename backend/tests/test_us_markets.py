@@ -0,0 +1,47 @@
+import asyncio
+from decimal import Decimal
+
+from app.services.price_service import PriceService
+from app.services.quote_cache import QuoteCache
+from app.services.stats_service import StatsService
+from app.services.stock_search_service import StockSearchService
+
+NASDAQ_LISTED = "Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares\n"
+OTHER_LISTED = (
+    "ACT Symbol|Security Name|Exchange|CIK Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol\n"
+    "IMO|Imperial Oil Limited Common Stock|A|IMO|N|100|N|IMO\n"
+    "File Creation Time: 0101202600:00||||||| \n"
+)
+
+
+def test_amex_listing_is_classified_as_nyse():
+    stocks = StockSearchService._parse_us_directory(NASDAQ_LISTED, OTHER_LISTED)
+    assert stocks == [{"ticker": "IMO", "name": "Imperial Oil Limited Common Stock", "market": "NYSE"}]
+
+
+def test_amex_ticker_returns_price(monkeypatch):
+    stock = StockSearchService._parse_us_directory(NASDAQ_LISTED, OTHER_LISTED)[0]
+    requested = []
+
+    async def fake_us_price(self, ticker):
+        requested.append(ticker)
+        return Decimal("71.25")
+
+    async def fake_us_batch(self, tickers):
+        return {ticker: Decimal("71.25") for ticker in tickers}
+
+    monkeypatch.setattr(PriceService, "_cache", QuoteCache())
+    monkeypatch.setattr(PriceService, "get_us_price", fake_us_price)
+    monkeypatch.setattr(PriceService, "_get_us_prices_batch", fake_us_batch)
+
+    async def scenario():
+        service = PriceService()
+        price = await service.get_price(stock["ticker"], stock["market"])
+        prices = await service.get_prices([(stock["ticker"], stock["market"])])
+        return price, prices
+
+    price, prices = asyncio.run(scenario())
+    assert price == Decimal("71.25")
+    assert requested == ["IMO"]
+    assert prices == {("IMO", "NYSE"): Decimal("71.25")}
+    assert StatsService(None)._get_currency(stock["market"]) == "USD"
@@ -5,12 +5,50 @@ const WS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000';
 
 const WebSocketContext = createContext(null);
 
+// 서버와 협상하는 compact 인코딩 (짧은 키 + price_update 델타, backend/app/websocket/codec.py)
+const COMPACT_PROTOCOL = 'fund.compact.v1';
+const COMPACT_KEYS = {
+  i: 'id', s: 'ticker', m: 'market', p: 'price', pp: 'previous_price', ts: 'timestamp',
+  di: 'discussion_id', ui: 'user_id', u: 'user', un: 'username', fn: 'full_name',
+  c: 'content', ms: 'message', mt: 'message_type', cd: 'chart_data', ca: 'created_at',
+  ti: 'title', nt: 'notification_type', ri: 'related_id', rt: 'related_type', r: 'is_read',
+};
+
+const expandKeys = (obj) => {
+  const expanded = {};
+  Object.entries(obj).forEach(([key, value]) => {
+    const name = COMPACT_KEYS[key] || key;
+    expanded[name] = name === 'user' && value && typeof value === 'object' ? expandKeys(value) : value;
+  });
+  return expanded;
+};
+
 export function WebSocketProvider({ children }) {
   const [isConnected, setIsConnected] = useState(false);
   const wsRef = useRef(null);
   const handlersRef = useRef({});
   const shouldReconnectRef = useRef(true);
   const currentTokenRef = useRef(null);
+  // compact price_update 델타 복원용 종목별 직전 시세
+  const lastPricesRef = useRef({});
+
+  // compact 프레임을 기존 {type, data} 형식으로 복원
+  const decodeCompact = useCallback(({ t, d }) => {
+    if (t !== 'pd') {
+      return { type: t, data: d && typeof d === 'object' && !Array.isArray(d) ? expandKeys(d) : d };
+    }
+    const [ticker, price, timestamp] = d;
+    const last = lastPricesRef.current[ticker];
+    const data = {
+      ticker,
+      market: last?.market ?? null,
+      price,
+      previous_price: last?.price ?? null,
+      timestamp: timestamp != null ? new Date(timestamp).toISOString() : null,
+    };
+    lastPricesRef.current[ticker] = data;
+    return { type: 'price_update', data };
+  }, []);
 
   const connect = useCallback(() => {
     const token = authService.getToken();
@@ -30,7 +68,7 @@ export function WebSocketProvider({ children }) {
     shouldReconnectRef.current = true;
     currentTokenRef.current = token;
 
-    const ws = new WebSocket(`${WS_URL}/ws?token=${token}`);
+    const ws = new WebSocket(`${WS_URL}/ws?token=${token}`, [COMPACT_PROTOCOL]);
 
     ws.onopen = () => {
       setIsConnected(true);
@@ -52,8 +90,13 @@ export function WebSocketProvider({ children }) {
 
     ws.onmessage = (event) => {
       try {
-        const message = JSON.parse(event.data);
+        const parsed = JSON.parse(event.data);
+        // 서버가 compact를 수락하지 않았으면 (구버전 서버) 기존 형식 그대로
+        const message = ws.protocol === COMPACT_PROTOCOL ? decodeCompact(parsed) : parsed;
         const { type, data } = message;
+        if (type === 'price_update' && data?.ticker) {
+          lastPricesRef.current[data.ticker] = data;
+        }
 
         // Call registered handlers
         if (handlersRef.current[type]) {
@@ -65,7 +108,7 @@ export function WebSocketProvider({ children }) {
     };
 
     wsRef.current = ws;
-  }, []);
+  }, [decodeCompact]);
 
   const disconnect = useCallback(() => {
     shouldReconnectRef.current = false;
@@ -7,6 +7,8 @@ export function useStockSearch(market, debounceMs = 300) {
   const [searchLoading, setSearchLoading] = useState(false);
   const [showDropdown, setShowDropdown] = useState(false);
   const dropdownRef = useRef(null);
+  // 이 검색 입력창의 ID (서버는 같은 ID의 진행 중인 검색만 취소 - 다른 탭/입력창과 무관)
+  const clientIdRef = useRef(`search_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`);
 
   useEffect(() => {
     if (!searchQuery || searchQuery.length < 1) {
@@ -16,6 +18,8 @@ export function useStockSearch(market, debounceMs = 300) {
     }
 
     setSearchLoading(true);
+    // 새 검색어가 입력되면 이전 요청 취소 (서버도 같은 입력창의 이전 검색을 중단)
+    const controller = new AbortController();
     const debounce = setTimeout(async () => {
       try {
         // 시장 필터: KOSPI/KOSDAQ는 합쳐서, 나머지는 개별
@@ -24,8 +28,10 @@ export function useStockSearch(market, debounceMs = 300) {
           marketFilter = market;
         }
 
-        const result = await priceService.searchStocks(searchQuery, marketFilter, 15);
-        if (result.success) {
+        const result = await priceService.searchStocks(
+          searchQuery, marketFilter, 15, controller.signal, clientIdRef.current
+        );
+        if (result.success && !result.data.superseded) {
           // 시장 필터 적용 (KOSPI/KOSDAQ 중 선택된 것만)
           let filtered = result.data.results;
           if (market === 'KOSPI' || market === 'KOSDAQ') {
@@ -35,14 +41,18 @@ export function useStockSearch(market, debounceMs = 300) {
           setShowDropdown(filtered.length > 0);
         }
       } catch (err) {
+        if (controller.signal.aborted) return;
         console.error('Stock search failed:', err);
         setSearchResults([]);
       } finally {
-        setSearchLoading(false);
+        if (!controller.signal.aborted) setSearchLoading(false);
       }
     }, debounceMs);
 
-    return () => clearTimeout(debounce);
+    return () => {
+      clearTimeout(debounce);
+      controller.abort();
+    };
   }, [searchQuery, market, debounceMs]);
 
   const clearSearch = () => {
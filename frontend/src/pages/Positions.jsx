@@ -14,6 +14,7 @@ import { priceService } from '../services/priceService';
 import { positionService } from '../services/positionService';
 import { requestService } from '../services/requestService';
 import { useAuth } from '../hooks/useAuth';
+import { useWebSocket } from '../hooks/useWebSocket';
 import { useToast } from '../context/ToastContext';
 import {
   formatNumber,
@@ -33,6 +34,7 @@ import { MARKETS, SEARCH_DEBOUNCE_MS, PRICE_REFRESH_INTERVAL_MS, CHART_CANDLE_LI
 export function Positions() {
   const { adminMode, canWrite } = useAuth();
   const toast = useToast();
+  const { subscribe, subscribePrice, unsubscribePrice, isConnected } = useWebSocket();
   const [statusFilter, setStatusFilter] = useState('open');
   const { positions, total, loading, error, updateFilters, setPage, filters } = usePositions({ status: 'open' });
   const [priceData, setPriceData] = useState({});
@@ -75,10 +77,26 @@ export function Positions() {
   useEffect(() => {
     if (statusFilter === 'open' && positions.length > 0) {
       fetchPrices();
+      // WebSocket 연결 중에는 price_update 푸시로 갱신하므로 폴링 생략
+      if (isConnected) return;
       const interval = setInterval(fetchPrices, PRICE_REFRESH_INTERVAL_MS);
       return () => clearInterval(interval);
     }
-  }, [positions, statusFilter]);
+  }, [positions, statusFilter, isConnected]);
+
+  // 열린 포지션 종목 실시간 시세 구독
+  useEffect(() => {
+    if (statusFilter !== 'open' || positions.length === 0 || !isConnected) return;
+
+    const tickers = new Map(positions.map(p => [p.ticker, p.market]));
+    tickers.forEach((market, ticker) => subscribePrice(ticker, market));
+    const unsubscribeUpdates = subscribe('price_update', applyPriceUpdate);
+
+    return () => {
+      unsubscribeUpdates();
+      tickers.forEach((_, ticker) => unsubscribePrice(ticker));
+    };
+  }, [positions, statusFilter, isConnected]);
 
   // 외부 클릭 시 드롭다운 닫기
   useClickOutside(searchRef, () => setShowDropdown(false));
@@ -99,6 +117,28 @@ export function Positions() {
     }
   };
 
+  // price_update 수신 시 해당 종목 포지션의 평가 정보 재계산
+  // (실현 손익은 변하지 않으므로 직전 값 기준으로 가격 변동분만 반영)
+  const applyPriceUpdate = ({ ticker, price }) => {
+    setPriceData(prev => {
+      let changed = false;
+      const next = { ...prev };
+      Object.values(prev).forEach(p => {
+        if (p.ticker !== ticker || p.current_price == null || !(p.quantity > 0)) return;
+        const profitLoss = p.profit_loss + (price - p.current_price) * p.quantity;
+        next[p.id] = {
+          ...p,
+          current_price: price,
+          evaluation_amount: price * p.quantity,
+          profit_loss: profitLoss,
+          profit_rate: p.total_buy_amount > 0 ? profitLoss / p.total_buy_amount : 0,
+        };
+        changed = true;
+      });
+      return changed ? next : prev;
+    });
+  };
+
   const handleDelete = (e, position) => {
     e.preventDefault();
     e.stopPropagation();
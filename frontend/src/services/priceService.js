@@ -2,11 +2,13 @@ import api from './api';
 
 export const priceService = {
   // 종목 검색 (종목명 또는 티커로 검색)
-  async searchStocks(query, market = null, limit = 20) {
+  // clientId: 같은 입력창의 이전 검색을 서버에서도 취소하기 위한 ID (없으면 취소하지 않음)
+  async searchStocks(query, market = null, limit = 20, signal = undefined, clientId = null) {
     const params = { q: query, limit };
     if (market) params.market = market;
+    if (clientId) params.client_id = clientId;
 
-    const response = await api.get('/prices/search', { params });
+    const response = await api.get('/prices/search', { params, signal });
     return response.data;
   },
 